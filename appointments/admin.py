@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import Appointment
+from .models import Appointment, ArchivedAppointment
 
 admin.site.register(Appointment)
+admin.site.register(ArchivedAppointment)
@@ -1,27 +1,34 @@
 import django_filters
 from django import forms
-from django.db.models import Q
 
-from users.models import Doctor, Specialization
+from users.models import Doctor
+from users.services.doctor_search import search_doctors
 
-
-def get_doctor_title_choices():
-    choices = []
-    for title in Doctor.objects.values_list("title", flat=True).distinct():
-        choices.append((title, title))
-    return choices
+from .services.filter_choices import (
+    get_department_choices,
+    get_doctor_title_choices,
+    get_specialization_choices,
+)
 
 
 class DoctorFilter(django_filters.FilterSet):
     doctor_id = django_filters.NumberFilter(
         field_name="id", label="", widget=forms.HiddenInput()
     )
-    specialization = django_filters.ModelMultipleChoiceFilter(
-        queryset=Specialization.objects.all().order_by("name"), label="Specialization"
+    # choices are read from a per-worker cache, so the form is built without queries
+    specialization = django_filters.MultipleChoiceFilter(
+        field_name="specialization",
+        choices=get_specialization_choices,
+        label="Specialization",
+    )
+    department = django_filters.MultipleChoiceFilter(
+        field_name="specialization__department",
+        choices=get_department_choices,
+        label="Department",
     )
 
     doctor_name = django_filters.CharFilter(
-        method="filter_doctor_name", label="First name and second name"
+        method="filter_doctor_name", label="Name, title or specialization"
     )
 
     doctor_title = django_filters.ChoiceFilter(
@@ -32,16 +39,8 @@ class DoctorFilter(django_filters.FilterSet):
     # doctor_title = django_filters.ChoiceFilter(choices=get_doctor_title_choices)
 
     def filter_doctor_name(self, queryset, name, value):
-        parts = value.split()
-
-        query = Q()
-        for part in parts:
-            query |= Q(user__first_name__icontains=part) | Q(
-                user__last_name__icontains=part
-            )
-
-        return queryset.filter(query)
+        return search_doctors(queryset, value)
 
     class Meta:
         model = Doctor
-        fields = ["doctor_title", "doctor_name", "specialization"]
+        fields = ["doctor_title", "doctor_name", "specialization", "department"]
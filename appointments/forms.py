@@ -1,8 +1,16 @@
+from datetime import timedelta
+
 from django import forms
+from django.conf import settings
+from django.core.exceptions import NON_FIELD_ERRORS
 
 from schedules.models import ScheduleDay
+from users.models import Department, Doctor, Specialization
 
 from .models import Appointment
+from .services.appointment_export import EXPORT_FORMATS
+
+SLOT_TAKEN_MESSAGE = "The specified appointment overlaps with an existing one. Please choose another one."
 
 
 class AppointmentForm(forms.ModelForm):
@@ -14,15 +22,20 @@ class AppointmentForm(forms.ModelForm):
             "date": forms.HiddenInput(),
             "time": forms.HiddenInput(),
         }
+        error_messages = {
+            NON_FIELD_ERRORS: {
+                "unique_together": SLOT_TAKEN_MESSAGE,
+            }
+        }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def clean(self):
         cleaned_data = super().clean()
-        self._validate_no_overlap(cleaned_data)
+        self._validate_doctor_available(cleaned_data)
 
-    def _validate_no_overlap(self, cleaned_data):
+    def _validate_doctor_available(self, cleaned_data):
         work_date = cleaned_data.get("date")
         start_time = cleaned_data.get("time")
         doctor = cleaned_data.get("doctor")
@@ -41,21 +54,6 @@ class AppointmentForm(forms.ModelForm):
                 "The doctor is not available at the selected date and time."
             )
 
-        overlapping_appointments = Appointment.objects.filter(
-            doctor=doctor,
-            date=work_date,
-            time=start_time,
-        )
-        if self.instance.pk:
-            overlapping_appointments = overlapping_appointments.exclude(
-                pk=self.instance.pk
-            )
-
-        if overlapping_appointments.exists():
-            raise forms.ValidationError(
-                "The specified appointment overlaps with an existing one. Please choose another one."
-            )
-
 
 class AppointmentNoteForm(forms.ModelForm):
     class Meta:
@@ -64,3 +62,96 @@ class AppointmentNoteForm(forms.ModelForm):
         widgets = {
             "notes": forms.Textarea(attrs={"rows": 10, "class": "form-control"}),
         }
+
+
+class AvailabilityQueryForm(forms.Form):
+    doctor = forms.ModelMultipleChoiceField(
+        queryset=Doctor.objects.select_related("user")
+    )
+    date_from = forms.DateField()
+    date_to = forms.DateField()
+
+    def clean_doctor(self):
+        doctors = self.cleaned_data["doctor"]
+        if len(doctors) > settings.AVAILABILITY_MAX_DOCTORS:
+            raise forms.ValidationError(
+                f"At most {settings.AVAILABILITY_MAX_DOCTORS} doctors can be requested at once."
+            )
+        return doctors
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+
+        if date_from and date_to:
+            if date_from > date_to:
+                raise forms.ValidationError("date_to is before date_from.")
+            if date_to - date_from >= timedelta(days=settings.AVAILABILITY_MAX_DAYS):
+                raise forms.ValidationError(
+                    f"Date range can not be longer than {settings.AVAILABILITY_MAX_DAYS} days."
+                )
+        return cleaned_data
+
+
+class AutocompleteQueryForm(forms.Form):
+    q = forms.CharField(max_length=100, required=False, strip=True)
+    limit = forms.IntegerField(
+        min_value=1, max_value=settings.AUTOCOMPLETE_MAX_LIMIT, required=False
+    )
+
+
+class NextFreeSlotsQueryForm(forms.Form):
+    doctor = forms.ModelChoiceField(queryset=Doctor.objects.all(), required=False)
+    specialization = forms.ModelChoiceField(
+        queryset=Specialization.objects.all(), required=False
+    )
+    department = forms.ModelChoiceField(
+        queryset=Department.objects.all(), required=False
+    )
+    date_from = forms.DateField(required=False)
+    limit = forms.IntegerField(
+        min_value=1, max_value=settings.NEXT_FREE_SLOTS_MAX_LIMIT, required=False
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not any(
+            cleaned_data.get(field)
+            for field in ("doctor", "specialization", "department")
+        ):
+            raise forms.ValidationError(
+                "Choose a doctor, a specialization or a department."
+            )
+        return cleaned_data
+
+    def get_doctors(self):
+        doctors = Doctor.objects.all()
+        if self.cleaned_data["doctor"]:
+            doctors = doctors.filter(pk=self.cleaned_data["doctor"].pk)
+        if self.cleaned_data["specialization"]:
+            doctors = doctors.filter(specialization=self.cleaned_data["specialization"])
+        if self.cleaned_data["department"]:
+            doctors = doctors.filter(
+                specialization__department=self.cleaned_data["department"]
+            )
+        return doctors.values("id")
+
+
+class AppointmentExportForm(forms.Form):
+    format = forms.ChoiceField(
+        choices=[(export_format, export_format) for export_format in EXPORT_FORMATS],
+        required=False,
+    )
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+    doctor = forms.ModelMultipleChoiceField(
+        queryset=Doctor.objects.all(), required=False
+    )
+
+    def get_filters(self):
+        return {
+            "date_from": self.cleaned_data["date_from"],
+            "date_to": self.cleaned_data["date_to"],
+            "doctor_ids": [doctor.id for doctor in self.cleaned_data["doctor"]],
+        }
@@ -0,0 +1,38 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from appointments.services.appointment_export import (
+    EXPORT_FORMATS,
+    iter_appointment_export,
+)
+
+
+class Command(BaseCommand):
+    help = "Streams appointments joined with doctor, patient and specializations as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--date-from", type=date.fromisoformat)
+        parser.add_argument("--date-to", type=date.fromisoformat)
+        parser.add_argument(
+            "--doctor", type=int, action="append", help="Doctor id, can be repeated"
+        )
+        parser.add_argument("--output", help="File path, standard output by default")
+
+    def handle(self, *args, **options):
+        lines = iter_appointment_export(
+            options["format"],
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+            doctor_ids=options["doctor"],
+        )
+
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        with open(options["output"], "w", newline="") as output:
+            for line in lines:
+                output.write(line)
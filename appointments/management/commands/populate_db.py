@@ -1,22 +1,39 @@
-from datetime import datetime, timedelta
-from typing import List
+import random
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, List
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
 from django.utils import timezone
 from faker import Faker
 
 from appointments.factories import AppointmentFactory
+from appointments.models import Appointment, Slot
+from appointments.services.filter_choices import bump_filter_choices_version
+from appointments.services.slots import generate_slot_times
 from core.env import env
 from schedules.factories import ScheduleDayFactory
 from schedules.models import ScheduleDay
 from users.factories import DoctorFactory, PatientFactory
-from users.models import Doctor, User
+from users.models import Department, Doctor, Patient, Specialization, User
+from users.services.doctor_search import update_doctor_search
 
 from .create_permission_groups import create_permission_groups
 
 fake = Faker()
 
+DOCTOR_TITLES = ["Dr", "Prof.", "Dr hab.", "lek."]
+
+DEFAULT_SCHEDULE_DAY = {
+    "start_time": time(8, 0),
+    "end_time": time(16, 0),
+    "interval": timedelta(minutes=15),
+}
+
 SPECIALIZATIONS_BY_DEPARTMENT = {
     "Cardiology Department": ["Cardiology", "Pediatric Cardiology", "Cardiac Surgery"],
     "Surgery Department": [
@@ -90,9 +107,21 @@ SPECIALIZATIONS_BY_DEPARTMENT = {
 
 
 class Command(BaseCommand):
-    help = (
-        "Generuje losowe wizyty dla 20 lekarzy i 1000 pacjentów na najbliższy miesiąc."
-    )
+    help = "Generuje losowych lekarzy, pacjentów, grafiki i wizyty na najbliższe dni."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--doctors", type=int, default=20)
+        parser.add_argument("--patients", type=int, default=100)
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument(
+            "--fill", type=float, default=0.7, help="Part of slots to book, 0-1"
+        )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Build objects in memory and write them with batched bulk_create",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
 
     def handle(self, *args, **options):
         self.stdout.write("Creating superuser...")
@@ -101,14 +130,33 @@ class Command(BaseCommand):
         self.stdout.write("Creating permission groups...")
         create_permission_groups()
 
+        if options["bulk"]:
+            self.stdout.write("Bulk generating clinic...")
+            counts = bulk_generate_clinic(
+                doctors_count=options["doctors"],
+                patients_count=options["patients"],
+                days=options["days"],
+                fill_percent=options["fill"],
+                batch_size=options["batch_size"],
+                log=self.stdout.write,
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Created {counts['schedule_days']} schedule days, {counts['appointments']} appointments."
+                )
+            )
+            return
+
         self.stdout.write("Creating doctors...")
-        doctors = [DoctorFactory(confirmed=True) for _ in range(20)]
+        doctors = [DoctorFactory(confirmed=True) for _ in range(options["doctors"])]
 
         self.stdout.write("Creating patients...")
-        patients = [PatientFactory() for _ in range(100)]
+        patients = [PatientFactory() for _ in range(options["patients"])]
 
         self.stdout.write("Creating schedule days and appointments...")
-        schedule_days, appointments = generate_appointments_for_month(doctors, patients)
+        schedule_days, appointments = generate_appointments_for_month(
+            doctors, patients, options["fill"], options["days"]
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -168,14 +216,17 @@ def fill_schedule_day(
 
 
 def generate_appointments_for_month(
-    doctors: List[Doctor], patients: List[User], fill_percent: float = 0.7
+    doctors: List[Doctor],
+    patients: List[User],
+    fill_percent: float = 0.7,
+    days: int = 30,
 ):
     start_date = timezone.now().date()
     schedule_days = []
     all_appointments = []
 
     for doctor in doctors:
-        for day_offset in range(30):
+        for day_offset in range(days):
             work_date = start_date + timedelta(days=day_offset)
 
             schedule_day = ScheduleDayFactory(
@@ -191,3 +242,186 @@ def generate_appointments_for_month(
             all_appointments.extend(appointments)
 
     return schedule_days, all_appointments
+
+
+def ensure_specializations() -> List[Specialization]:
+    specializations = []
+    for department_name, specialization_names in SPECIALIZATIONS_BY_DEPARTMENT.items():
+        department, _ = Department.objects.get_or_create(name=department_name)
+        for specialization_name in specialization_names:
+            specialization, _ = Specialization.objects.get_or_create(
+                name=specialization_name, defaults={"department": department}
+            )
+            specializations.append(specialization)
+    return specializations
+
+
+def bulk_create_users(
+    role: str, count: int, offset: int, password: str, batch_size: int
+) -> List[User]:
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"bulk_{role}{offset + n}",
+                email=f"bulk_{role}{offset + n}@example.com",
+                first_name=fake.first_name(),
+                last_name=fake.last_name(),
+                password=password,
+                is_active=True,
+                role=role,
+                phone_number=f"9{offset + n:08d}",
+                pesel=f"9{offset + n:010d}",
+                street=fake.street_address(),
+                city=fake.city(),
+                state=fake.state(),
+                postal_code=fake.postcode()[:6],
+            )
+            for n in range(count)
+        ],
+        batch_size=batch_size,
+    )
+    group = Group.objects.get(name=f"{role.lower()}_group")
+    User.groups.through.objects.bulk_create(
+        [User.groups.through(user_id=user.id, group_id=group.id) for user in users],
+        batch_size=batch_size,
+    )
+    return users
+
+
+def bulk_create_schedule_days(
+    schedule_days: List[ScheduleDay],
+    patient_ids: List[int],
+    fill_percent: float,
+    batch_size: int,
+) -> int:
+    """
+    Writes schedule days together with their slots and appointments, signals are not sent by bulk_create,
+    so slots are built here
+    """
+    appointments = []
+    slots = []
+    with transaction.atomic():
+        ScheduleDay.objects.bulk_create(schedule_days, batch_size=batch_size)
+        for schedule_day in schedule_days:
+            slot_times = generate_slot_times(schedule_day)
+            taken_times = set(
+                random.sample(slot_times, int(len(slot_times) * fill_percent))
+            )
+            for slot_time in slot_times:
+                slots.append(
+                    Slot(
+                        schedule_day=schedule_day,
+                        doctor_id=schedule_day.doctor_id,
+                        date=schedule_day.work_date,
+                        time=slot_time,
+                        is_taken=slot_time in taken_times,
+                    )
+                )
+                if slot_time in taken_times:
+                    appointments.append(
+                        Appointment(
+                            doctor_id=schedule_day.doctor_id,
+                            user_id=random.choice(patient_ids),
+                            date=schedule_day.work_date,
+                            time=slot_time,
+                            is_confirmed=random.random() < 0.5,
+                        )
+                    )
+        Slot.objects.bulk_create(slots, batch_size=batch_size)
+        Appointment.objects.bulk_create(appointments, batch_size=batch_size)
+    return len(appointments)
+
+
+def bulk_generate_clinic(
+    doctors_count: int,
+    patients_count: int,
+    days: int,
+    fill_percent: float = 0.7,
+    batch_size: int = 5000,
+    log: Callable[[str], None] = lambda message: None,
+) -> Dict[str, int]:
+    specializations = ensure_specializations()
+    password = make_password("password123")
+    offset = (User.objects.aggregate(max_id=Max("id"))["max_id"] or 0) + 1
+
+    log("Creating doctors...")
+    doctor_users = bulk_create_users(
+        User.Role.DOCTOR, doctors_count, offset, password, batch_size
+    )
+    doctors = Doctor.objects.bulk_create(
+        [
+            Doctor(
+                user=user,
+                title=random.choice(DOCTOR_TITLES),
+                description=fake.paragraph(),
+                confirmed=True,
+            )
+            for user in doctor_users
+        ],
+        batch_size=batch_size,
+    )
+    Doctor.specialization.through.objects.bulk_create(
+        [
+            Doctor.specialization.through(
+                doctor_id=doctor.id, specialization_id=specialization.id
+            )
+            for doctor in doctors
+            for specialization in random.sample(specializations, random.randint(1, 3))
+        ],
+        batch_size=batch_size,
+    )
+    # bulk_create skips the signals which keep the search index and the filter choices up to date
+    for start in range(0, len(doctors), batch_size):
+        update_doctor_search(
+            [doctor.id for doctor in doctors[start : start + batch_size]]
+        )
+    bump_filter_choices_version()
+
+    log("Creating patients...")
+    patient_users = bulk_create_users(
+        User.Role.PATIENT, patients_count, offset + doctors_count, password, batch_size
+    )
+    patients = Patient.objects.bulk_create(
+        [Patient(user=user) for user in patient_users], batch_size=batch_size
+    )
+    patient_ids = [patient.id for patient in patients]
+
+    log("Creating schedule days and appointments...")
+    start_date = timezone.now().date()
+    slots_per_day = len(
+        generate_slot_times(ScheduleDay(**DEFAULT_SCHEDULE_DAY, work_date=start_date))
+    )
+    days_per_batch = max(1, batch_size // slots_per_day)
+    schedule_days_count, appointments_count = 0, 0
+    pending_schedule_days = []
+
+    for doctor in doctors:
+        for day_offset in range(days):
+            pending_schedule_days.append(
+                ScheduleDay(
+                    doctor=doctor,
+                    work_date=start_date + timedelta(days=day_offset),
+                    **DEFAULT_SCHEDULE_DAY,
+                )
+            )
+            if len(pending_schedule_days) >= days_per_batch:
+                appointments_count += bulk_create_schedule_days(
+                    pending_schedule_days, patient_ids, fill_percent, batch_size
+                )
+                schedule_days_count += len(pending_schedule_days)
+                pending_schedule_days = []
+                log(
+                    f"Created {schedule_days_count} schedule days, {appointments_count} appointments so far"
+                )
+
+    appointments_count += bulk_create_schedule_days(
+        pending_schedule_days, patient_ids, fill_percent, batch_size
+    )
+    schedule_days_count += len(pending_schedule_days)
+
+    return {
+        "doctors": len(doctors),
+        "patients": len(patients),
+        "schedule_days": schedule_days_count,
+        "appointments": appointments_count,
+    }
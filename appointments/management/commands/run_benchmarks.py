@@ -0,0 +1,232 @@
+import json
+import statistics
+import tracemalloc
+from datetime import time, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import HttpResponseBase
+from django.test import Client, override_settings
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from appointments.factories import AppointmentFactory
+from appointments.models import Slot
+from appointments.services.doctor_schedule import DoctorScheduleService
+from core.celery import app
+from schedules.factories import ScheduleDayFactory
+from users.factories import DoctorFactory, PatientFactory
+from users.models import Doctor, Patient
+
+fake = Faker()
+
+FAST_PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a clinic of given size in a separate test database and measures wall time, "
+        "query count and peak memory of schedule, booking and listing hot paths."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--doctors", type=int, default=20)
+        parser.add_argument("--patients", type=int, default=100)
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument("--fill", type=float, default=0.5)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--label", default="", help="e.g. commit hash")
+        parser.add_argument("--output", default="benchmark_results.json")
+        parser.add_argument(
+            "--compare", help="JSON file with earlier results to compare with"
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_config = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        app.conf.task_always_eager = True
+        try:
+            # factories save an avatar file per user, they are not left in the project's media
+            with TemporaryDirectory() as media_root, override_settings(
+                PASSWORD_HASHERS=FAST_PASSWORD_HASHERS, MEDIA_ROOT=media_root
+            ):
+                self.stdout.write("Seeding clinic...")
+                seed_clinic(
+                    options["doctors"],
+                    options["patients"],
+                    options["days"],
+                    options["fill"],
+                )
+                self.stdout.write("Running benchmarks...")
+                results = run_benchmarks(options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "label": options["label"],
+            "created_at": timezone.now().isoformat(),
+            "clinic": {
+                key: options[key] for key in ("doctors", "patients", "days", "fill")
+            },
+            "results": results,
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2))
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name}: {result['median_ms']:.1f} ms, {result['queries']} queries, "
+                f"{result['peak_memory_kb']:.0f} KiB"
+            )
+        if options["compare"]:
+            self.compare(results, json.loads(Path(options["compare"]).read_text()))
+
+        self.stdout.write(self.style.SUCCESS(f"Results saved in {options['output']}"))
+
+    def compare(self, results: Dict[str, dict], previous_report: dict):
+        self.stdout.write(
+            f"Compared with {previous_report.get('label') or 'previous'}:"
+        )
+        for name, result in results.items():
+            previous = previous_report["results"].get(name)
+            if previous is None:
+                continue
+            change = (result["median_ms"] - previous["median_ms"]) / previous[
+                "median_ms"
+            ]
+            line = (
+                f"{name}: {change:+.1%} time, "
+                f"{result['queries'] - previous['queries']:+d} queries"
+            )
+            self.stdout.write(
+                self.style.WARNING(line) if change > 0.1 else self.style.SUCCESS(line)
+            )
+
+
+def seed_clinic(doctors_count: int, patients_count: int, days: int, fill: float):
+    doctors = DoctorFactory.create_batch(doctors_count)
+    patients = PatientFactory.create_batch(patients_count)
+    start_date = timezone.now().date()
+
+    for doctor in doctors:
+        for day_offset in range(days):
+            schedule_day = ScheduleDayFactory(
+                doctor=doctor,
+                work_date=start_date + timedelta(days=day_offset),
+                start_time=time(8, 0),
+                end_time=time(16, 0),
+                interval=timedelta(minutes=15),
+            )
+            slots = list(schedule_day.slots.values_list("time", flat=True))
+            for slot_time in fake.random_elements(
+                slots, length=int(len(slots) * fill), unique=True
+            ):
+                AppointmentFactory(
+                    doctor=doctor,
+                    user=fake.random_element(patients),
+                    date=schedule_day.work_date,
+                    time=slot_time,
+                )
+
+
+def measure(
+    func: Callable, repeat: int, expected_status: int = 200
+) -> Dict[str, float | int]:
+    """
+    Responses returned by func must have expected_status, a redirect or 403 would otherwise be timed as a fast success
+    """
+    timings, queries, peak_memory = [], 0, 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as captured:
+            started_at = perf_counter()
+            response = func()
+            timings.append((perf_counter() - started_at) * 1000)
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        queries = max(queries, len(captured))
+        if (
+            isinstance(response, HttpResponseBase)
+            and response.status_code != expected_status
+        ):
+            raise CommandError(
+                f"Benchmarked request returned status {response.status_code}, expected {expected_status}"
+            )
+
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+        "queries": queries,
+        "peak_memory_kb": peak_memory / 1024,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(repeat: int) -> Dict[str, dict]:
+    start_of_week = timezone.now().date()
+    end_of_week = start_of_week + timedelta(days=6)
+    doctor = Doctor.objects.select_related("user").first()
+    patient = Patient.objects.select_related("user").first()
+    free_slots = list(
+        Slot.objects.filter(is_taken=False, date__gt=timezone.now().date()).values_list(
+            "doctor_id", "date", "time"
+        )[:repeat]
+    )
+
+    def schedule_week_cold():
+        cache.clear()
+        DoctorScheduleService.get_doctor_schedule_week(
+            start_of_week, end_of_week, Doctor.objects.select_related("user")
+        )
+
+    def schedule_week_warm():
+        DoctorScheduleService.get_doctor_schedule_week(
+            start_of_week, end_of_week, Doctor.objects.select_related("user")
+        )
+
+    anonymous_client = Client()
+    patient_client = Client()
+    patient_client.force_login(patient.user)
+    doctor_client = Client()
+    doctor_client.force_login(doctor.user)
+
+    def get(client: Client, url: str) -> Callable:
+        return lambda: client.get(url)
+
+    def book():
+        doctor_id, slot_date, slot_time = free_slots.pop()
+        return patient_client.post(
+            reverse("appointments:appointment-create"),
+            {"doctor": doctor_id, "date": slot_date, "time": slot_time},
+        )
+
+    benchmarks: Dict[str, Callable] = {
+        "schedule_week_cold": schedule_week_cold,
+        "schedule_week_warm": schedule_week_warm,
+        "appointments_list": get(
+            anonymous_client, reverse("appointments:appointments-list")
+        ),
+        "user_appointments": get(
+            patient_client, reverse("appointments:user-appointments")
+        ),
+        "doctor_appointments": get(
+            doctor_client, reverse("appointments:doctor-appointments")
+        ),
+    }
+    results = {name: measure(func, repeat) for name, func in benchmarks.items()}
+    if len(free_slots) >= repeat:
+        # a booked appointment redirects to its confirmation page
+        results["booking_post"] = measure(book, repeat, expected_status=302)
+    return results
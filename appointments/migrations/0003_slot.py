@@ -0,0 +1,63 @@
+# Generated by Django 5.1.3 on 2026-10-18 08:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("appointments", "0002_initial"),
+        ("schedules", "0002_initial"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Slot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("time", models.TimeField()),
+                (
+                    "is_taken",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether an appointment is booked for this slot",
+                    ),
+                ),
+                (
+                    "doctor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slots",
+                        to="users.doctor",
+                    ),
+                ),
+                (
+                    "schedule_day",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slots",
+                        to="schedules.scheduleday",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["doctor", "date", "time"],
+                "indexes": [
+                    models.Index(
+                        fields=["doctor", "date", "time"],
+                        name="appointment_doctor__710073_idx",
+                    )
+                ],
+            },
+        ),
+    ]
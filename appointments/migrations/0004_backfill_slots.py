@@ -0,0 +1,50 @@
+# Generated by Django 5.1.3 on 2026-10-18 08:04
+
+from datetime import datetime
+
+from django.db import migrations
+
+
+def backfill_slots(apps, schema_editor):
+    ScheduleDay = apps.get_model("schedules", "ScheduleDay")
+    Appointment = apps.get_model("appointments", "Appointment")
+    Slot = apps.get_model("appointments", "Slot")
+
+    taken_lookup = set(Appointment.objects.values_list("doctor_id", "date", "time"))
+
+    slots = []
+    for schedule_day in ScheduleDay.objects.iterator(chunk_size=1000):
+        current_time = datetime.combine(schedule_day.work_date, schedule_day.start_time)
+        end_time = datetime.combine(schedule_day.work_date, schedule_day.end_time)
+        while current_time < end_time:
+            slot_key = (
+                schedule_day.doctor_id,
+                schedule_day.work_date,
+                current_time.time(),
+            )
+            slots.append(
+                Slot(
+                    schedule_day_id=schedule_day.id,
+                    doctor_id=schedule_day.doctor_id,
+                    date=schedule_day.work_date,
+                    time=current_time.time(),
+                    is_taken=slot_key in taken_lookup,
+                )
+            )
+            current_time += schedule_day.interval
+
+        if len(slots) >= 1000:
+            Slot.objects.bulk_create(slots)
+            slots = []
+
+    Slot.objects.bulk_create(slots)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("appointments", "0003_slot"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slots, migrations.RunPython.noop),
+    ]
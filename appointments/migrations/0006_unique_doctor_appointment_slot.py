@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-18 08:34
+
+import logging
+
+from django.db import migrations, models
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+
+def remove_double_bookings(apps, schema_editor):
+    """
+    Slots booked twice before the constraint existed keep the confirmed or else the earliest appointment,
+    removed appointments are logged, so their patients can be contacted
+    """
+    Appointment = apps.get_model("appointments", "Appointment")
+
+    double_booked_slots = (
+        Appointment.objects.values("doctor_id", "date", "time")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for slot in double_booked_slots.iterator():
+        appointments = Appointment.objects.filter(
+            doctor_id=slot["doctor_id"], date=slot["date"], time=slot["time"]
+        ).order_by("-is_confirmed", "id")
+        kept, *removed = appointments
+        for appointment in removed:
+            logger.warning(
+                f"Removed appointment id ={appointment.id} of patient id ={appointment.user_id}, "
+                f"doctor id ={appointment.doctor_id} on {appointment.date} at {appointment.time} "
+                f"is booked already by appointment id ={kept.id}"
+            )
+        Appointment.objects.filter(pk__in=[a.id for a in removed]).delete()
+
+
+class Migration(migrations.Migration):
+    # rows are deleted in their own transaction, ALTER TABLE can not run with pending deferred FK checks
+    atomic = False
+
+    dependencies = [
+        ("appointments", "0005_appointment_notification"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_double_bookings, migrations.RunPython.noop, atomic=True
+        ),
+        migrations.AddConstraint(
+            model_name="appointment",
+            constraint=models.UniqueConstraint(
+                fields=("doctor", "date", "time"), name="unique_doctor_appointment_slot"
+            ),
+        ),
+    ]
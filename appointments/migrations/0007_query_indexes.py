@@ -0,0 +1,48 @@
+# Generated by Django 5.1.3 on 2026-10-18 08:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("appointments", "0006_unique_doctor_appointment_slot"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["user", "date", "time"], name="appointment_user_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(("is_confirmed", True)),
+                fields=["date", "id"],
+                name="appointment_confirmed_date_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="appointment",
+            name="doctor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="appointments",
+                to="users.doctor",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="appointment",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="appointments",
+                to="users.patient",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 08:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("appointments", "0007_query_indexes"),
+        ("schedules", "0003_query_indexes"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="slot",
+            name="doctor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="slots",
+                to="users.doctor",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="slot",
+            index=models.Index(
+                condition=models.Q(("is_taken", False)),
+                fields=["doctor", "date", "time"],
+                name="slot_free_doctor_date_idx",
+            ),
+        ),
+    ]
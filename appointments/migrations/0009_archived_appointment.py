@@ -0,0 +1,55 @@
+# Generated by Django 5.1.3 on 2026-10-18 09:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("appointments", "0008_slot_free_index"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedAppointment",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("date", models.DateField()),
+                ("time", models.TimeField()),
+                ("notes", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField()),
+                ("modified_at", models.DateTimeField()),
+                ("is_confirmed", models.BooleanField(default=False)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "doctor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_appointments",
+                        to="users.doctor",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_appointments",
+                        to="users.patient",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["doctor", "date", "time"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "date", "time"], name="archived_user_date_idx"
+                    ),
+                    models.Index(
+                        fields=["doctor", "date", "time"],
+                        name="archived_doctor_date_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -2,13 +2,18 @@ from django.db import models
 
 
 class Appointment(models.Model):
+    # doctor and user lookups are served by unique_doctor_appointment_slot and appointment_user_date_idx
     doctor = models.ForeignKey(
-        "users.Doctor", on_delete=models.CASCADE, related_name="appointments"
+        "users.Doctor",
+        on_delete=models.CASCADE,
+        related_name="appointments",
+        db_index=False,
     )
     user = models.ForeignKey(
         "users.Patient",
         on_delete=models.CASCADE,
         related_name="appointments",
+        db_index=False,
     )
     date = models.DateField()
     time = models.TimeField()
@@ -21,6 +26,126 @@ class Appointment(models.Model):
 
     class Meta:
         ordering = ["doctor", "date", "time"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["doctor", "date", "time"], name="unique_doctor_appointment_slot"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "date", "time"], name="appointment_user_date_idx"
+            ),
+            models.Index(
+                fields=["date", "id"],
+                condition=models.Q(is_confirmed=True),
+                name="appointment_confirmed_date_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Wizyta u {self.doctor} na {self.date} o {self.time}"
+
+
+class ArchivedAppointment(models.Model):
+    """
+    Appointment moved out of the hot table, keeps id of the original appointment
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    doctor = models.ForeignKey(
+        "users.Doctor", on_delete=models.CASCADE, related_name="archived_appointments"
+    )
+    user = models.ForeignKey(
+        "users.Patient",
+        on_delete=models.CASCADE,
+        related_name="archived_appointments",
+    )
+    date = models.DateField()
+    time = models.TimeField()
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    modified_at = models.DateTimeField()
+    is_confirmed = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["doctor", "date", "time"]
+        indexes = [
+            models.Index(
+                fields=["user", "date", "time"], name="archived_user_date_idx"
+            ),
+            models.Index(
+                fields=["doctor", "date", "time"], name="archived_doctor_date_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Wizyta u {self.doctor} na {self.date} o {self.time}"
+
+
+class Slot(models.Model):
+    schedule_day = models.ForeignKey(
+        "schedules.ScheduleDay", on_delete=models.CASCADE, related_name="slots"
+    )
+    doctor = models.ForeignKey(
+        "users.Doctor",
+        on_delete=models.CASCADE,
+        related_name="slots",
+        db_index=False,
+    )
+    date = models.DateField()
+    time = models.TimeField()
+    is_taken = models.BooleanField(
+        default=False, help_text="Whether an appointment is booked for this slot"
+    )
+
+    class Meta:
+        ordering = ["doctor", "date", "time"]
+        indexes = [
+            models.Index(fields=["doctor", "date", "time"]),
+            models.Index(
+                fields=["doctor", "date", "time"],
+                condition=models.Q(is_taken=False),
+                name="slot_free_doctor_date_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.doctor_id} {self.date} {self.time}"
+
+
+class AppointmentNotification(models.Model):
+    class Kind(models.TextChoices):
+        REMINDER = "reminder", "Reminder"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    appointment = models.ForeignKey(
+        Appointment, on_delete=models.CASCADE, related_name="notifications"
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    claimed_at = models.DateTimeField(
+        null=True, blank=True, help_text="Time when a worker started sending"
+    )
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["appointment", "kind"], name="unique_appointment_notification"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} of appointment {self.appointment_id}: {self.status}"
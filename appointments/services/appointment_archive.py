@@ -0,0 +1,67 @@
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils.timezone import now
+
+from core.celery import app
+from schedules.services.schedule_clearing import delete_in_batches
+
+from ..models import Appointment, ArchivedAppointment
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_FIELDS = [
+    "id",
+    "doctor_id",
+    "user_id",
+    "date",
+    "time",
+    "notes",
+    "created_at",
+    "modified_at",
+    "is_confirmed",
+]
+
+
+def copy_to_archive(appointments: QuerySet):
+    ArchivedAppointment.objects.bulk_create(
+        [ArchivedAppointment(**row) for row in appointments.values(*ARCHIVED_FIELDS)],
+        ignore_conflicts=True,
+    )
+
+
+def archive_appointments_before(date_back: date, batch_size: int = None) -> int:
+    """
+    Moves appointments older than date_back to the archive table in primary key batches
+    """
+    return delete_in_batches(
+        Appointment.objects.filter(date__lt=date_back),
+        batch_size=batch_size,
+        before_delete=copy_to_archive,
+    )
+
+
+@app.task
+def archive_older_appointments(batch_size: int = None) -> int:
+    """
+    Configured as periodic task, keeps only APPOINTMENT_ARCHIVE_AFTER_DAYS of past appointments in the hot table
+    """
+    date_back = now().date() - timedelta(days=settings.APPOINTMENT_ARCHIVE_AFTER_DAYS)
+    archived_count = archive_appointments_before(date_back, batch_size)
+
+    logger.info(f"Archived {archived_count} appointments older than {date_back}")
+    return archived_count
+
+
+def get_appointment_with_archive(
+    appointments: QuerySet, archived_appointments: QuerySet, **lookup
+) -> Appointment | ArchivedAppointment | None:
+    """
+    Looks the appointment up in the hot table first, the archive is queried only if it is not there
+    """
+    appointment = appointments.filter(**lookup).first()
+    if appointment is None:
+        appointment = archived_appointments.filter(**lookup).first()
+    return appointment
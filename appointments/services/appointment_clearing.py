@@ -0,0 +1,34 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from core.celery import app
+from schedules.services.schedule_clearing import delete_in_batches
+
+from ..models import Appointment, ArchivedAppointment
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def delete_older_appointments(batch_size: int = None) -> int:
+    """
+    Configured as periodic task, does nothing unless APPOINTMENT_RETENTION_DAYS is set,
+    appointments are deleted both from the hot table and from the archive
+    """
+    if settings.APPOINTMENT_RETENTION_DAYS is None:
+        return 0
+
+    date_back = now().date() - timedelta(days=settings.APPOINTMENT_RETENTION_DAYS)
+    deleted_count = delete_in_batches(
+        Appointment.objects.filter(date__lt=date_back), "appointments", batch_size
+    ) + delete_in_batches(
+        ArchivedAppointment.objects.filter(date__lt=date_back),
+        "archived_appointments",
+        batch_size,
+    )
+
+    logger.info(f"Deleted {deleted_count} appointments older than {date_back}")
+    return deleted_count
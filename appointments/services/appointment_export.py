@@ -0,0 +1,110 @@
+import csv
+import heapq
+import json
+from collections import defaultdict
+from datetime import date
+from operator import itemgetter
+from typing import Dict, Iterator, List
+
+from django.db.models import QuerySet
+
+from users.models import Doctor
+
+from ..models import Appointment, ArchivedAppointment
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+EXPORT_FIELDS = {
+    "id": "id",
+    "date": "date",
+    "time": "time",
+    "is_confirmed": "is_confirmed",
+    "doctor_id": "doctor_id",
+    "doctor_title": "doctor__title",
+    "doctor_first_name": "doctor__user__first_name",
+    "doctor_last_name": "doctor__user__last_name",
+    "patient_id": "user_id",
+    "patient_first_name": "user__user__first_name",
+    "patient_last_name": "user__user__last_name",
+    "patient_email": "user__user__email",
+    "created_at": "created_at",
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    Pseudo buffer for csv.writer, which returns written line instead of storing it
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_doctor_specializations(doctor_ids: List[int] | None) -> Dict[int, str]:
+    through = Doctor.specialization.through.objects.order_by("specialization__name")
+    if doctor_ids:
+        through = through.filter(doctor_id__in=doctor_ids)
+
+    specializations = defaultdict(list)
+    for doctor_id, name in through.values_list("doctor_id", "specialization__name"):
+        specializations[doctor_id].append(name)
+    return {doctor_id: ", ".join(names) for doctor_id, names in specializations.items()}
+
+
+def iter_export_rows(
+    appointments: QuerySet,
+    date_from: date | None,
+    date_to: date | None,
+    doctor_ids: List[int] | None,
+) -> Iterator[dict]:
+    if date_from:
+        appointments = appointments.filter(date__gte=date_from)
+    if date_to:
+        appointments = appointments.filter(date__lte=date_to)
+    if doctor_ids:
+        appointments = appointments.filter(doctor_id__in=doctor_ids)
+
+    values = (
+        appointments.order_by("date", "time", "id")
+        .values_list(*EXPORT_FIELDS.values())
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    return (dict(zip(EXPORT_FIELDS.keys(), row)) for row in values)
+
+
+def iter_appointment_rows(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    doctor_ids: List[int] | None = None,
+) -> Iterator[dict]:
+    """
+    Yields appointments from the hot table and from the archive,
+    both are read in date order and merged, so the export stays sorted
+    """
+    specializations = get_doctor_specializations(doctor_ids)
+    rows = heapq.merge(
+        iter_export_rows(
+            ArchivedAppointment.objects.all(), date_from, date_to, doctor_ids
+        ),
+        iter_export_rows(Appointment.objects.all(), date_from, date_to, doctor_ids),
+        key=itemgetter("date", "time", "id"),
+    )
+    for row in rows:
+        row["specializations"] = specializations.get(row["doctor_id"], "")
+        yield row
+
+
+def iter_appointment_export(export_format: str, **filters) -> Iterator[str]:
+    rows = iter_appointment_rows(**filters)
+
+    if export_format == "ndjson":
+        for row in rows:
+            yield json.dumps(row, default=str) + "\n"
+        return
+
+    writer = csv.writer(Echo())
+    yield writer.writerow([*EXPORT_FIELDS.keys(), "specializations"])
+    for row in rows:
+        yield writer.writerow(row.values())
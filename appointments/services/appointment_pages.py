@@ -0,0 +1,137 @@
+from datetime import date, time
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple
+
+from django.db.models import Model, Q, QuerySet
+from django.utils import timezone
+
+CURSOR_SEPARATOR = "_"
+
+
+class KeysetPage(NamedTuple):
+    items: List[Model]
+    next_cursor: str | None
+
+
+def encode_cursor(appointment: Model) -> str:
+    return CURSOR_SEPARATOR.join(
+        [
+            appointment.date.isoformat(),
+            appointment.time.isoformat(),
+            str(appointment.pk),
+        ]
+    )
+
+
+def decode_cursor(cursor: str | None) -> Tuple[date, time, int] | None:
+    """
+    Returns None for missing or malformed cursor, which means the first page
+    """
+    try:
+        cursor_date, cursor_time, cursor_id = cursor.split(CURSOR_SEPARATOR)
+        return (
+            date.fromisoformat(cursor_date),
+            time.fromisoformat(cursor_time),
+            int(cursor_id),
+        )
+    except (AttributeError, ValueError):
+        return None
+
+
+def after_cursor(cursor: str | None, descending: bool = False) -> Q:
+    position = decode_cursor(cursor)
+    if position is None:
+        return Q()
+
+    cursor_date, cursor_time, cursor_id = position
+    lookup = "lt" if descending else "gt"
+    return (
+        Q(**{f"date__{lookup}": cursor_date})
+        | Q(date=cursor_date, **{f"time__{lookup}": cursor_time})
+        | Q(date=cursor_date, time=cursor_time, **{f"id__{lookup}": cursor_id})
+    )
+
+
+def get_keyset_page(
+    queryset: QuerySet, cursor: str | None, per_page: int, descending: bool = False
+) -> KeysetPage:
+    """
+    Page of rows after the cursor ordered by (date, time, id), its cost does not depend
+    on how many pages were read before, unlike OFFSET
+    """
+    ordering = ["-date", "-time", "-id"] if descending else ["date", "time", "id"]
+    items = list(
+        queryset.filter(after_cursor(cursor, descending)).order_by(*ordering)[
+            : per_page + 1
+        ]
+    )
+    if len(items) > per_page:
+        return KeysetPage(items[:per_page], encode_cursor(items[per_page - 1]))
+    return KeysetPage(items, None)
+
+
+def get_past_appointments_page(
+    appointments: QuerySet,
+    archived_appointments: QuerySet,
+    cursor: str | None,
+    per_page: int,
+) -> KeysetPage:
+    """
+    Newest first, archived appointments are all older than the hot ones,
+    so the archive is queried only once the hot table runs out of rows
+    """
+    page = get_keyset_page(appointments, cursor, per_page, descending=True)
+    if page.next_cursor:
+        return page
+
+    remaining = per_page - len(page.items)
+    archive_cursor = encode_cursor(page.items[-1]) if page.items else cursor
+    if remaining == 0:
+        has_archived = archived_appointments.filter(
+            after_cursor(archive_cursor, descending=True)
+        ).exists()
+        return KeysetPage(page.items, archive_cursor if has_archived else None)
+
+    archived_page = get_keyset_page(
+        archived_appointments, archive_cursor, remaining, descending=True
+    )
+    return KeysetPage(page.items + archived_page.items, archived_page.next_cursor)
+
+
+def get_appointment_pages(
+    appointments: QuerySet,
+    archived_appointments: QuerySet,
+    params: Mapping[str, str],
+    per_page: int,
+    fragment: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Pages of upcoming and past appointments after the cursors given in params,
+    only the list named by fragment is read when it is given
+    """
+    today = timezone.now().date()
+    now_time = timezone.now().time()
+    pages = {}
+
+    if fragment in (None, "upcoming"):
+        pages["upcoming"] = get_keyset_page(
+            appointments.filter(Q(date__gt=today) | Q(date=today, time__gte=now_time)),
+            params.get("upcoming_cursor"),
+            per_page,
+        )
+    if fragment in (None, "past"):
+        pages["past"] = get_past_appointments_page(
+            appointments.filter(Q(date__lt=today) | Q(date=today, time__lt=now_time)),
+            archived_appointments,
+            params.get("past_cursor"),
+            per_page,
+        )
+
+    context = {}
+    for name, page in pages.items():
+        context[f"{name}_appointment"] = page.items
+        context[f"{name}_next_cursor"] = page.next_cursor
+    if fragment:
+        context["list_name"] = fragment
+        context["page_appointments"] = pages[fragment].items
+        context["next_cursor"] = pages[fragment].next_cursor
+    return context
@@ -0,0 +1,75 @@
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Tuple
+
+from users.models import Doctor, Specialization
+from users.services.doctor_search import normalize_search_text
+
+from .filter_choices import get_cached_choices
+
+
+class AutocompleteIndex(NamedTuple):
+    # sorted (normalized key, kind, id), a suggestion is found by every prefix of its keys
+    keys: List[Tuple[str, str, int]]
+    labels: Dict[Tuple[str, int], str]
+
+
+def get_doctor_keys(first_name: str, last_name: str) -> List[str]:
+    first_name = normalize_search_text(first_name)
+    last_name = normalize_search_text(last_name)
+    return [
+        f"{first_name} {last_name}",
+        f"{last_name} {first_name}",
+        *last_name.split()[1:],
+    ]
+
+
+def build_autocomplete_index() -> AutocompleteIndex:
+    keys, labels = [], {}
+    for doctor_id, title, first_name, last_name in Doctor.objects.values_list(
+        "id", "title", "user__first_name", "user__last_name"
+    ):
+        labels[("doctor", doctor_id)] = f"{title} {first_name} {last_name}"
+        keys += [
+            (key, "doctor", doctor_id) for key in get_doctor_keys(first_name, last_name)
+        ]
+
+    for specialization_id, name in Specialization.objects.values_list("id", "name"):
+        labels[("specialization", specialization_id)] = name
+        words = normalize_search_text(name).split()
+        keys += [
+            (" ".join(words[index:]), "specialization", specialization_id)
+            for index in range(len(words))
+        ]
+
+    keys.sort()
+    return AutocompleteIndex(keys, labels)
+
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    """
+    Index is built once per worker and rebuilt after a doctor, doctor's user or specialization change
+    """
+    return get_cached_choices("autocomplete", build_autocomplete_index)
+
+
+def autocomplete(text: str, limit: int) -> List[dict]:
+    """
+    Doctors and specializations with a name starting with the text, or a word of the name, in alphabetical order
+    """
+    prefix = " ".join(normalize_search_text(text).split())
+    if not prefix:
+        return []
+
+    index = get_autocomplete_index()
+    suggestions, seen = [], set()
+    position = bisect_left(index.keys, (prefix,))
+    for key, kind, object_id in index.keys[position:]:
+        if not key.startswith(prefix) or len(suggestions) >= limit:
+            break
+        if (kind, object_id) in seen:
+            continue
+        seen.add((kind, object_id))
+        suggestions.append(
+            {"type": kind, "id": object_id, "label": index.labels[(kind, object_id)]}
+        )
+    return suggestions
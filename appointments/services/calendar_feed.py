@@ -0,0 +1,180 @@
+import hashlib
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from typing import Iterator, List
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Count, Max, OuterRef, QuerySet, Subquery
+from django.utils import timezone
+
+from schedules.models import ScheduleDay
+from users.models import User
+
+from ..models import Appointment
+
+CALENDAR_FEED_SALT = "appointments.calendar-feed"
+CALENDAR_PRODID = "-//WszebiPatientPortal//Appointments//EN"
+DEFAULT_APPOINTMENT_DURATION = timedelta(minutes=15)
+
+
+def get_calendar_feed_token(user: User) -> str:
+    """
+    Token changes together with user's password, which revokes old subscriptions
+    """
+    return signing.dumps(
+        {"user": user.pk, "auth": user.get_session_auth_hash()[:16]},
+        salt=CALENDAR_FEED_SALT,
+    )
+
+
+def get_calendar_feed_user(token: str) -> User | None:
+    try:
+        payload = signing.loads(token, salt=CALENDAR_FEED_SALT)
+    except signing.BadSignature:
+        return None
+
+    user = (
+        User.objects.filter(pk=payload.get("user"), is_active=True)
+        .select_related("doctor_profile", "patient_profile")
+        .first()
+    )
+    if user is None or user.get_session_auth_hash()[:16] != payload.get("auth"):
+        return None
+    return user
+
+
+class CalendarFeed:
+    """
+    Appointments of one doctor or patient from CALENDAR_FEED_PAST_DAYS ago onwards,
+    doctor's feed contains also the doctor's schedule days
+    """
+
+    def __init__(self, user: User):
+        self.user = user
+        self.is_doctor = hasattr(user, "doctor_profile")
+        self.start_date = timezone.now().date() - timedelta(
+            days=settings.CALENDAR_FEED_PAST_DAYS
+        )
+
+    def get_appointments(self) -> QuerySet:
+        appointments = Appointment.objects.filter(date__gte=self.start_date)
+        if self.is_doctor:
+            return appointments.filter(doctor=self.user.doctor_profile)
+        return appointments.filter(user=self.user.patient_profile)
+
+    def get_schedule_days(self) -> QuerySet:
+        if not self.is_doctor:
+            return ScheduleDay.objects.none()
+        return ScheduleDay.objects.filter(
+            doctor=self.user.doctor_profile, work_date__gte=self.start_date
+        )
+
+    def get_state(self) -> str:
+        """
+        Returns ETag of the feed, counts are part of it because deleted rows do not move the latest modified_at,
+        for the same reason the feed has no Last-Modified
+        """
+        states = [self.get_appointments().aggregate(Count("id"), Max("modified_at"))]
+        if self.is_doctor:
+            states.append(
+                self.get_schedule_days().aggregate(Count("id"), Max("modified_at"))
+            )
+
+        etag_source = ":".join(
+            [self.user.get_session_auth_hash(), self.start_date.isoformat()]
+            + [f"{state['id__count']}-{state['modified_at__max']}" for state in states]
+        )
+        return hashlib.sha256(etag_source.encode()).hexdigest()
+
+    def iter_events(self) -> Iterator[List[str]]:
+        interval = ScheduleDay.objects.filter(
+            doctor=OuterRef("doctor"),
+            work_date=OuterRef("date"),
+            start_time__lte=OuterRef("time"),
+            end_time__gt=OuterRef("time"),
+        ).values("interval")[:1]
+        appointments = (
+            self.get_appointments()
+            .select_related("doctor__user", "user__user")
+            .annotate(interval=Subquery(interval))
+            .order_by("date", "time")
+        )
+        for appointment in appointments:
+            start = combine(appointment.date, appointment.time)
+            if self.is_doctor:
+                summary = f"Appointment with {appointment.user}"
+            else:
+                summary = f"Appointment with {appointment.doctor}"
+            yield [
+                f"UID:appointment-{appointment.pk}@wszebi-patient-portal",
+                f"DTSTAMP:{format_datetime(appointment.modified_at)}",
+                f"DTSTART:{format_datetime(start)}",
+                "DTEND:"
+                + format_datetime(
+                    start + (appointment.interval or DEFAULT_APPOINTMENT_DURATION)
+                ),
+                f"SUMMARY:{escape_text(summary)}",
+                "STATUS:" + ("CONFIRMED" if appointment.is_confirmed else "TENTATIVE"),
+            ]
+
+        for schedule_day in self.get_schedule_days().order_by("work_date"):
+            yield [
+                f"UID:schedule-day-{schedule_day.pk}@wszebi-patient-portal",
+                f"DTSTAMP:{format_datetime(schedule_day.modified_at)}",
+                "DTSTART:"
+                + format_datetime(
+                    combine(schedule_day.work_date, schedule_day.start_time)
+                ),
+                "DTEND:"
+                + format_datetime(
+                    combine(schedule_day.work_date, schedule_day.end_time)
+                ),
+                "SUMMARY:Office hours",
+                "TRANSP:TRANSPARENT",
+            ]
+
+    def render(self) -> str:
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{CALENDAR_PRODID}",
+            "CALSCALE:GREGORIAN",
+            f"X-WR-CALNAME:{escape_text(f'Appointments - {self.user}')}",
+        ]
+        for event in self.iter_events():
+            lines += ["BEGIN:VEVENT", *event, "END:VEVENT"]
+        lines.append("END:VCALENDAR")
+        return "".join(fold_line(line) + "\r\n" for line in lines)
+
+
+def combine(day: date, day_time: time) -> datetime:
+    return timezone.make_aware(datetime.combine(day, day_time))
+
+
+def format_datetime(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str, limit: int = 75) -> str:
+    """
+    Lines longer than 75 octets are folded as required by RFC 5545
+    """
+    parts: List[str] = []
+    current = ""
+    for char in line:
+        if len((current + char).encode()) > limit:
+            parts.append(current)
+            current = " "
+        current += char
+    parts.append(current)
+    return "\r\n".join(parts)
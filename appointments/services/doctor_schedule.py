@@ -1,12 +1,20 @@
-from datetime import date, datetime, timedelta
-from typing import Dict, List
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
 
 from django.db.models import QuerySet
+from django.utils import timezone
 
 from schedules.models import ScheduleDay
 from users.models import Doctor
 
-from ..models import Appointment
+from ..models import Slot
+from .schedule_cache import (
+    get_cached_weeks,
+    get_schedule_versions,
+    get_schedule_week_key,
+    set_cached_weeks,
+)
 
 
 class DoctorScheduleService:
@@ -17,33 +25,25 @@ class DoctorScheduleService:
         if doctors is None:
             doctors = Doctor.objects.select_related("user").all()
 
-        all_schedule_days = ScheduleDay.objects.filter(
-            doctor__in=doctors, work_date__range=[start_of_week, end_of_week]
-        ).select_related("doctor")
-
-        all_appointments = Appointment.objects.filter(
-            doctor__in=doctors, date__range=[start_of_week, end_of_week]
-        ).values("doctor_id", "date", "time")
-
-        appointment_lookup = set()
-        for apt in all_appointments:
-            appointment_lookup.add((apt["doctor_id"], apt["date"], apt["time"]))
-
-        from collections import defaultdict
-
-        doctor_schedules = defaultdict(list)
-
-        for schedule_day in all_schedule_days:
-            doctor_schedules[schedule_day.doctor].append(schedule_day)
+        doctor_slots = DoctorScheduleService.get_cached_doctor_slots(
+            start_of_week, end_of_week, [doctor.id for doctor in doctors]
+        )
 
+        now = datetime.now()
         doctor_week_schedule = {}
 
         for doctor in doctors:
-            schedule_days = doctor_schedules.get(doctor, [])
-
-            doctor_schedule_day = DoctorScheduleService.get_doctor_schedule_day(
-                schedule_days, appointment_lookup
-            )
+            doctor_schedule_day = {
+                slot_date: [
+                    {
+                        "time": slot_time.strftime("%H:%M"),
+                        "is_taken": is_taken,
+                        "is_past": datetime.combine(slot_date, slot_time) < now,
+                    }
+                    for slot_time, is_taken in slots
+                ]
+                for slot_date, slots in doctor_slots[doctor.id].items()
+            }
             doctor_schedule_day = DoctorScheduleService.fulfill_week_schedule_by_days(
                 doctor_schedule_day, start_of_week
             )
@@ -52,45 +52,142 @@ class DoctorScheduleService:
         return doctor_week_schedule
 
     @staticmethod
-    def get_doctor_schedule_day(
-        schedule_days: QuerySet[ScheduleDay], appointment_lookup
-    ) -> Dict[date, List[Dict[str, str | bool]]]:
-        doctor_schedule_day = {}
-        for schedule_day in schedule_days:
-            available_slots = []
-            current_time = datetime.combine(
-                schedule_day.work_date, schedule_day.start_time
+    def get_cached_doctor_slots(
+        start_of_week: date, end_of_week: date, doctor_ids: List[int]
+    ) -> Dict[int, Dict[date, List[Tuple[time, bool]]]]:
+        versions = get_schedule_versions(doctor_ids)
+        week_keys = {
+            doctor_id: get_schedule_week_key(
+                doctor_id, start_of_week, end_of_week, versions[doctor_id]
             )
-            end_time = datetime.combine(schedule_day.work_date, schedule_day.end_time)
-            while current_time < end_time:
-                slot = DoctorScheduleService.get_slot_status(
-                    current_time, schedule_day, appointment_lookup
-                )
+            for doctor_id in doctor_ids
+        }
+        cached_weeks = get_cached_weeks(week_keys.values())
 
-                available_slots.append(slot)
-                current_time += schedule_day.interval
+        doctor_slots = {
+            doctor_id: cached_weeks[week_key]
+            for doctor_id, week_key in week_keys.items()
+            if week_key in cached_weeks
+        }
+        missing_doctor_ids = [
+            doctor_id for doctor_id in doctor_ids if doctor_id not in doctor_slots
+        ]
+        if missing_doctor_ids:
+            missing_slots = DoctorScheduleService.get_doctor_slots(
+                start_of_week, end_of_week, missing_doctor_ids
+            )
+            set_cached_weeks(
+                {
+                    week_keys[doctor_id]: missing_slots[doctor_id]
+                    for doctor_id in missing_doctor_ids
+                }
+            )
+            doctor_slots.update(missing_slots)
+        return doctor_slots
 
-            doctor_schedule_day[schedule_day.work_date] = available_slots
-        return doctor_schedule_day
+    @staticmethod
+    def get_doctor_slots(
+        start_of_week: date, end_of_week: date, doctor_ids: List[int]
+    ) -> Dict[int, Dict[date, List[Tuple[time, bool]]]]:
+        all_slots = Slot.objects.filter(
+            doctor_id__in=doctor_ids, date__range=[start_of_week, end_of_week]
+        ).values_list("doctor_id", "date", "time", "is_taken")
+
+        doctor_slots = {doctor_id: defaultdict(list) for doctor_id in doctor_ids}
+        for doctor_id, slot_date, slot_time, is_taken in all_slots:
+            doctor_slots[doctor_id][slot_date].append((slot_time, is_taken))
+
+        return {
+            doctor_id: dict(slots_by_date)
+            for doctor_id, slots_by_date in doctor_slots.items()
+        }
 
     @staticmethod
-    def get_slot_status(
-        current_time: datetime, schedule_day: ScheduleDay, appointment_lookup
-    ) -> Dict[str, str | bool]:
-        is_past = current_time < datetime.now()
-
-        appointment_key = (
-            schedule_day.doctor.id,
-            schedule_day.work_date,
-            current_time.time(),
+    def get_doctor_availability(
+        date_from: date, date_to: date, doctor_ids: List[int]
+    ) -> Dict[int, List[Dict[str, str | int]]]:
+        """
+        Every schedule day is encoded as its start, interval in minutes and string of taken flags of its slots
+        """
+        schedule_days = (
+            ScheduleDay.objects.filter(
+                doctor_id__in=doctor_ids, work_date__range=[date_from, date_to]
+            )
+            .order_by("work_date", "start_time")
+            .values_list("id", "doctor_id", "work_date", "start_time", "interval")
+        )
+        slots = (
+            Slot.objects.filter(
+                doctor_id__in=doctor_ids, date__range=[date_from, date_to]
+            )
+            .order_by("time")
+            .values_list("schedule_day_id", "is_taken")
+        )
+
+        taken_by_schedule_day = defaultdict(list)
+        for schedule_day_id, is_taken in slots:
+            taken_by_schedule_day[schedule_day_id].append("1" if is_taken else "0")
+
+        doctor_availability = {doctor_id: [] for doctor_id in doctor_ids}
+        for (
+            schedule_day_id,
+            doctor_id,
+            work_date,
+            start_time,
+            interval,
+        ) in schedule_days:
+            doctor_availability[doctor_id].append(
+                {
+                    "date": work_date.isoformat(),
+                    "start": start_time.strftime("%H:%M"),
+                    "interval": int(interval.total_seconds() // 60),
+                    "taken": "".join(taken_by_schedule_day[schedule_day_id]),
+                }
+            )
+        return doctor_availability
+
+    @staticmethod
+    def get_next_free_slots(
+        doctors: QuerySet, limit: int, date_from: date = None
+    ) -> List[Dict[str, int | date | time]]:
+        return list(
+            DoctorScheduleService.get_next_free_slots_query(doctors, limit, date_from)
+        )
+
+    @staticmethod
+    def get_next_free_slots_query(
+        doctors: QuerySet, limit: int, date_from: date = None
+    ) -> QuerySet:
+        """
+        Earliest free slots of given doctors, every doctor's first slots are range-scanned from the partial index
+        of free slots and only these top slots are merged, so distant openings are found without expanding
+        the weeks in between and without sorting all future slots of the matching doctors
+        """
+        now = timezone.localtime()
+        # a date range instead of OR keeps the index scan ordered, so each doctor's branch stops after limit rows
+        slots = Slot.objects.filter(is_taken=False, date__gte=now.date()).exclude(
+            date=now.date(), time__lte=now.time()
+        )
+        if date_from:
+            slots = slots.filter(date__gte=date_from)
+
+        doctor_slots = [
+            slots.filter(doctor_id=doctor_id)
+            .order_by("date", "time")
+            .values("doctor_id", "date", "time")[:limit]
+            for doctor_id in set(doctors.values_list("pk", flat=True))
+        ]
+        if not doctor_slots:
+            return Slot.objects.none()
+        if len(doctor_slots) == 1:
+            # union of a single branch would repeat its ORDER BY, which PostgreSQL rejects
+            return doctor_slots[0]
+
+        return (
+            doctor_slots[0]
+            .union(*doctor_slots[1:], all=True)
+            .order_by("date", "time", "doctor_id")[:limit]
         )
-        is_taken = appointment_key in appointment_lookup
-        slot = {
-            "time": current_time.strftime("%H:%M"),
-            "is_taken": is_taken,
-            "is_past": is_past,
-        }
-        return slot
 
     @staticmethod
     def fulfill_week_schedule_by_days(
@@ -1,19 +1,50 @@
 import logging
 from datetime import timedelta
+from itertools import islice
+from smtplib import SMTPException
+from time import monotonic
+from typing import Dict, Iterable, Iterator, List
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
+from django.db import transaction
+from django.db.models import F, Q
 from django.utils.timezone import now
 
 from core.celery import app
 
-from ..models import Appointment
+from ..models import Appointment, AppointmentNotification
 
 logger = logging.getLogger(__name__)
 
 
-@app.task
-def send_appointment_created_email(appointment):
+EMAIL_TASK_OPTIONS = {
+    "autoretry_for": (SMTPException, OSError),
+    "retry_backoff": True,
+    "retry_backoff_max": 600,
+    "retry_jitter": True,
+    "retry_kwargs": {"max_retries": 5},
+}
+
+
+def get_appointment_for_email(appointment_id: int) -> Appointment | None:
+    appointment = (
+        Appointment.objects.select_related("user__user", "doctor__user")
+        .filter(pk=appointment_id)
+        .first()
+    )
+    if appointment is None:
+        logger.warning(
+            f"Appointment id ={appointment_id} does not exist anymore, email is not sent"
+        )
+    return appointment
+
+
+@app.task(**EMAIL_TASK_OPTIONS)
+def send_appointment_created_email(appointment_id: int):
+    appointment = get_appointment_for_email(appointment_id)
+    if appointment is None:
+        return
     send_mail(
         subject="Appointment booked",
         message=f"You have successfully booked an appointment on {appointment.date} at {appointment.time} for {appointment.doctor}."
@@ -23,8 +54,11 @@ def send_appointment_created_email(appointment):
     )
 
 
-@app.task
-def send_appointment_confirmed_email(appointment):
+@app.task(**EMAIL_TASK_OPTIONS)
+def send_appointment_confirmed_email(appointment_id: int):
+    appointment = get_appointment_for_email(appointment_id)
+    if appointment is None:
+        return
     send_mail(
         subject="Appointment confirmed",
         message=f"You have successfully confirmed an appointment on {appointment.date} at {appointment.time} for {appointment.doctor}.",
@@ -33,8 +67,11 @@ def send_appointment_confirmed_email(appointment):
     )
 
 
-@app.task
-def send_note_added_email(appointment):
+@app.task(**EMAIL_TASK_OPTIONS)
+def send_note_added_email(appointment_id: int):
+    appointment = get_appointment_for_email(appointment_id)
+    if appointment is None:
+        return
     send_mail(
         subject="New note added to your appointment",
         message=f"A note has been added to your appointment on {appointment.date} at {appointment.time} for {appointment.doctor}.",
@@ -43,41 +80,185 @@ def send_note_added_email(appointment):
     )
 
 
-@app.task
-def send_appointment_deleted_email(appointment):
+@app.task(**EMAIL_TASK_OPTIONS)
+def send_appointment_deleted_email(
+    recipient: str, appointment_date: str, appointment_time: str, doctor: str
+):
+    """
+    Deleted appointment can not be fetched by the worker, so its details are passed directly
+    """
     send_mail(
         subject="Appointment cancelled",
-        message=f"Your appointment on {appointment.date} at {appointment.time} for {appointment.doctor} has been cancelled.",
+        message=f"Your appointment on {appointment_date} at {appointment_time} for {doctor} has been cancelled.",
         from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[appointment.user.user.email],
+        recipient_list=[recipient],
     )
 
 
-def send_appointment_reminder_email(appointment):
+def send_appointment_reminder_email(appointment, connection=None):
     send_mail(
         subject="Upcoming appointment reminder",
         message=f"Reminder: You have an appointment on {appointment.date} at {appointment.time} for {appointment.doctor}.",
         from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[appointment.user.user.email],
+        connection=connection,
     )
 
 
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def claim_reminders(appointment_ids: List[int]) -> List[int]:
+    """
+    Marks reminders of given appointments as being sent and returns ids of appointments claimed by this worker,
+    reminders already sent or being sent by another worker are skipped
+    """
+    with transaction.atomic():
+        # appointments deleted since the batch was queued are left out, ignore_conflicts does not cover FK violations,
+        # the rows are locked so they can not be deleted before the ledger rows are inserted
+        existing_ids = list(
+            Appointment.objects.select_for_update()
+            .filter(pk__in=appointment_ids)
+            .values_list("pk", flat=True)
+        )
+        AppointmentNotification.objects.bulk_create(
+            [
+                AppointmentNotification(
+                    appointment_id=appointment_id,
+                    kind=AppointmentNotification.Kind.REMINDER,
+                )
+                for appointment_id in existing_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+    stale_claimed_at = now() - timedelta(seconds=settings.REMINDER_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        claimed = dict(
+            AppointmentNotification.objects.select_for_update(skip_locked=True)
+            .filter(
+                appointment_id__in=appointment_ids,
+                kind=AppointmentNotification.Kind.REMINDER,
+            )
+            .filter(
+                Q(
+                    status__in=[
+                        AppointmentNotification.Status.PENDING,
+                        AppointmentNotification.Status.FAILED,
+                    ]
+                )
+                | Q(
+                    status=AppointmentNotification.Status.SENDING,
+                    claimed_at__lt=stale_claimed_at,
+                )
+            )
+            .values_list("pk", "appointment_id")
+        )
+        AppointmentNotification.objects.filter(pk__in=claimed.keys()).update(
+            status=AppointmentNotification.Status.SENDING,
+            claimed_at=now(),
+            attempts=F("attempts") + 1,
+        )
+    return list(claimed.values())
+
+
+def mark_reminder(appointment_id: int, status: str, **fields):
+    AppointmentNotification.objects.filter(
+        appointment_id=appointment_id, kind=AppointmentNotification.Kind.REMINDER
+    ).update(status=status, modified_at=now(), **fields)
+
+
 @app.task
-def send_upcoming_appointment_reminders():
+def send_upcoming_appointment_reminders(
+    min_id: int | None = None, max_id: int | None = None
+):
     """
-    Configured as periodic task, is done everyday at 1 am in the night
+    Configured as periodic task, is done everyday at 1 am in the night.
+    Can be run again or split between workers by appointment id range, already sent reminders are skipped
     """
     tomorrow = now().date() + timedelta(days=1)
-    appointments = Appointment.objects.filter(
-        date=tomorrow, is_confirmed=True
-    ).select_related("user__user", "doctor__user")
-    # print(f"Found {appointments.count()} appointments for {tomorrow}")
-
-    for appointment in appointments:
-        try:
-            send_appointment_reminder_email(appointment)
-            # print(f"Sent reminder for appointment id ={appointment.id}")
-        except Exception as e:
-            logger.error(
-                f"Error during sending of reminder for appointment id ={appointment.id}: {e}"
-            )
+    appointments = Appointment.objects.filter(date=tomorrow, is_confirmed=True).exclude(
+        notifications__kind=AppointmentNotification.Kind.REMINDER,
+        notifications__status=AppointmentNotification.Status.SENT,
+    )
+    if min_id is not None:
+        appointments = appointments.filter(pk__gte=min_id)
+    if max_id is not None:
+        appointments = appointments.filter(pk__lte=max_id)
+
+    appointment_ids = (
+        appointments.order_by("pk")
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=settings.REMINDER_BATCH_SIZE)
+    )
+
+    batches_count = 0
+    for batch in chunked(appointment_ids, settings.REMINDER_BATCH_SIZE):
+        send_appointment_reminder_batch.delay(batch)
+        batches_count += 1
+
+    logger.info(f"Queued {batches_count} reminder batches for {tomorrow}")
+    return batches_count
+
+
+@app.task(**EMAIL_TASK_OPTIONS)
+def send_appointment_reminder_batch(
+    appointment_ids: List[int],
+) -> Dict[str, int | float]:
+    """
+    Sends reminders of one batch over a single SMTP connection.
+    The connection is opened before reminders are claimed, so when the SMTP server is down the whole batch
+    is retried with nothing left claimed. Failed reminders are queued again after REMINDER_RETRY_DELAY
+    until they reach REMINDER_MAX_ATTEMPTS, the nightly run targets the next day so it does not pick them up
+    """
+    started_at = monotonic()
+    sent, failed_ids = 0, []
+
+    with get_connection() as connection:
+        claimed_ids = claim_reminders(appointment_ids)
+        appointments = Appointment.objects.filter(pk__in=claimed_ids).select_related(
+            "user__user", "doctor__user"
+        )
+        for appointment in appointments:
+            try:
+                send_appointment_reminder_email(appointment, connection=connection)
+            except Exception as e:
+                failed_ids.append(appointment.id)
+                mark_reminder(
+                    appointment.id,
+                    AppointmentNotification.Status.FAILED,
+                    last_error=str(e),
+                )
+                logger.error(
+                    f"Error during sending of reminder for appointment id ={appointment.id}: {e}"
+                )
+            else:
+                sent += 1
+                mark_reminder(
+                    appointment.id, AppointmentNotification.Status.SENT, sent_at=now()
+                )
+
+    retry_ids = list(
+        AppointmentNotification.objects.filter(
+            appointment_id__in=failed_ids,
+            kind=AppointmentNotification.Kind.REMINDER,
+            status=AppointmentNotification.Status.FAILED,
+            attempts__lt=settings.REMINDER_MAX_ATTEMPTS,
+        ).values_list("appointment_id", flat=True)
+    )
+    if retry_ids:
+        send_appointment_reminder_batch.apply_async(
+            (retry_ids,), countdown=settings.REMINDER_RETRY_DELAY
+        )
+
+    failed = len(failed_ids)
+    skipped = len(appointment_ids) - len(claimed_ids)
+    seconds = monotonic() - started_at
+    logger.info(
+        f"Reminder batch of {len(appointment_ids)}: sent {sent}, failed {failed}, skipped {skipped} "
+        f"in {seconds:.2f}s ({sent / seconds if seconds else 0:.1f} emails/s)"
+    )
+    return {"sent": sent, "failed": failed, "skipped": skipped, "seconds": seconds}
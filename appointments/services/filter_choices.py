@@ -0,0 +1,79 @@
+import time
+from typing import Callable, Dict, List, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from users.models import Department, Doctor, Specialization
+
+FILTER_CHOICES_VERSION_KEY = "doctor-filter-choices-version"
+
+Choices = List[Tuple]
+
+# choices built by this worker, kept together with the version they were built for
+_worker_choices: Dict[str, Tuple[int, Choices]] = {}
+
+
+def get_filter_choices_version() -> int:
+    """
+    Version is shared by all workers through the cache, missing version is started from current time,
+    so choices of an evicted version are never taken as current
+    """
+    version = cache.get(FILTER_CHOICES_VERSION_KEY)
+    if version is None:
+        cache.add(FILTER_CHOICES_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(FILTER_CHOICES_VERSION_KEY)
+    return version
+
+
+def _bump_filter_choices_version():
+    try:
+        cache.incr(FILTER_CHOICES_VERSION_KEY)
+    except ValueError:
+        cache.set(FILTER_CHOICES_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_filter_choices_version():
+    """
+    Bumped right away and once more after commit, so choices read before the commit
+    are not kept under the new version
+    """
+    _bump_filter_choices_version()
+    transaction.on_commit(_bump_filter_choices_version)
+
+
+def get_cached_choices(name: str, build: Callable[[], Choices]) -> Choices:
+    version = get_filter_choices_version()
+    cached = _worker_choices.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    choices = build()
+    _worker_choices[name] = (version, choices)
+    return choices
+
+
+def get_doctor_title_choices() -> Choices:
+    return get_cached_choices(
+        "title",
+        lambda: [
+            (title, title)
+            for title in Doctor.objects.order_by("title")
+            .values_list("title", flat=True)
+            .distinct()
+        ],
+    )
+
+
+def get_specialization_choices() -> Choices:
+    return get_cached_choices(
+        "specialization",
+        lambda: list(Specialization.objects.order_by("name").values_list("id", "name")),
+    )
+
+
+def get_department_choices() -> Choices:
+    return get_cached_choices(
+        "department",
+        lambda: list(Department.objects.order_by("name").values_list("id", "name")),
+    )
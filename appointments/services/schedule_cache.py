@@ -0,0 +1,65 @@
+import time
+from datetime import date
+from functools import partial
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_schedule_version_key(doctor_id: int) -> str:
+    return f"doctor-schedule-version:{doctor_id}"
+
+
+def get_schedule_week_key(
+    doctor_id: int, start_of_week: date, end_of_week: date, version: int
+) -> str:
+    return (
+        f"doctor-schedule-week:{doctor_id}:"
+        f"{start_of_week.isoformat()}:{end_of_week.isoformat()}:{version}"
+    )
+
+
+def get_schedule_versions(doctor_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Returns current schedule version of every doctor, missing versions are started from current time,
+    so a version evicted from cache never points back to an old cached week
+    """
+    version_keys = {
+        get_schedule_version_key(doctor_id): doctor_id for doctor_id in doctor_ids
+    }
+    cached_versions = cache.get_many(version_keys.keys())
+
+    versions = {}
+    for version_key, doctor_id in version_keys.items():
+        if version_key not in cached_versions:
+            cache.add(version_key, time.time_ns(), timeout=None)
+            cached_versions[version_key] = cache.get(version_key)
+        versions[doctor_id] = cached_versions[version_key]
+    return versions
+
+
+def _bump_schedule_version(doctor_id: int):
+    version_key = get_schedule_version_key(doctor_id)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, time.time_ns(), timeout=None)
+
+
+def bump_schedule_version(doctor_id: int):
+    """
+    Bumped right away and once more after commit, so a week read before the commit
+    is not kept under the new version
+    """
+    _bump_schedule_version(doctor_id)
+    transaction.on_commit(partial(_bump_schedule_version, doctor_id))
+
+
+def get_cached_weeks(keys: Iterable[str]) -> Dict[str, dict]:
+    return cache.get_many(keys)
+
+
+def set_cached_weeks(weeks: Dict[str, dict]):
+    cache.set_many(weeks, timeout=settings.DOCTOR_SCHEDULE_CACHE_TIMEOUT)
@@ -0,0 +1,56 @@
+from datetime import date, datetime, time
+from typing import Iterable, List
+
+from schedules.models import ScheduleDay
+
+from ..models import Appointment, Slot
+
+
+def generate_slot_times(schedule_day: ScheduleDay) -> List[time]:
+    slot_times = []
+    current_time = datetime.combine(schedule_day.work_date, schedule_day.start_time)
+    end_time = datetime.combine(schedule_day.work_date, schedule_day.end_time)
+
+    while current_time < end_time:
+        slot_times.append(current_time.time())
+        current_time += schedule_day.interval
+
+    return slot_times
+
+
+def sync_schedule_day_slots(schedule_days: Iterable[ScheduleDay]) -> List[Slot]:
+    """
+    Rebuilds slots of given schedule days, marking as taken the ones which already have an appointment
+    """
+    schedule_days = list(schedule_days)
+    if not schedule_days:
+        return []
+
+    Slot.objects.filter(schedule_day__in=schedule_days).delete()
+
+    taken_lookup = set(
+        Appointment.objects.filter(
+            doctor_id__in={schedule_day.doctor_id for schedule_day in schedule_days},
+            date__in={schedule_day.work_date for schedule_day in schedule_days},
+        ).values_list("doctor_id", "date", "time")
+    )
+
+    slots = [
+        Slot(
+            schedule_day=schedule_day,
+            doctor_id=schedule_day.doctor_id,
+            date=schedule_day.work_date,
+            time=slot_time,
+            is_taken=(schedule_day.doctor_id, schedule_day.work_date, slot_time)
+            in taken_lookup,
+        )
+        for schedule_day in schedule_days
+        for slot_time in generate_slot_times(schedule_day)
+    ]
+    return Slot.objects.bulk_create(slots, batch_size=1000)
+
+
+def set_slot_taken(doctor_id: int, slot_date: date, slot_time: time, is_taken: bool):
+    Slot.objects.filter(doctor_id=doctor_id, date=slot_date, time=slot_time).update(
+        is_taken=is_taken
+    )
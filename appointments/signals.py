@@ -0,0 +1,97 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from schedules.models import ScheduleDay
+from schedules.signals import schedule_days_bulk_created
+from users.models import Department, Doctor, Specialization, User
+
+from .models import Appointment
+from .services.filter_choices import bump_filter_choices_version
+from .services.schedule_cache import bump_schedule_version
+from .services.slots import set_slot_taken, sync_schedule_day_slots
+
+SLOT_FIELDS = {"doctor", "doctor_id", "date", "time"}
+DOCTOR_NAME_FIELDS = {"first_name", "last_name"}
+
+
+def free_slot_if_unused(doctor_id, slot_date, slot_time):
+    still_taken = Appointment.objects.filter(
+        doctor_id=doctor_id, date=slot_date, time=slot_time
+    ).exists()
+    if not still_taken:
+        set_slot_taken(doctor_id, slot_date, slot_time, False)
+
+
+@receiver(post_save, sender=ScheduleDay)
+def schedule_day_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_schedule_day_slots([instance])
+    bump_schedule_version(instance.doctor_id)
+
+
+@receiver(schedule_days_bulk_created, sender=ScheduleDay)
+def schedule_days_bulk_saved(sender, schedule_days, **kwargs):
+    sync_schedule_day_slots(schedule_days)
+    for doctor_id in {schedule_day.doctor_id for schedule_day in schedule_days}:
+        bump_schedule_version(doctor_id)
+
+
+@receiver(post_delete, sender=ScheduleDay)
+def schedule_day_deleted(sender, instance, **kwargs):
+    bump_schedule_version(instance.doctor_id)
+
+
+@receiver(pre_save, sender=Appointment)
+def appointment_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_slot = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not SLOT_FIELDS.intersection(update_fields):
+        return
+    instance._previous_slot = (
+        Appointment.objects.filter(pk=instance.pk)
+        .values_list("doctor_id", "date", "time")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Appointment)
+def appointment_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not SLOT_FIELDS.intersection(update_fields):
+        return
+    current_slot = (instance.doctor_id, instance.date, instance.time)
+    previous_slot = getattr(instance, "_previous_slot", None)
+    if previous_slot and previous_slot != current_slot:
+        free_slot_if_unused(*previous_slot)
+        bump_schedule_version(previous_slot[0])
+    set_slot_taken(*current_slot, True)
+    bump_schedule_version(instance.doctor_id)
+
+
+@receiver(post_delete, sender=Appointment)
+def appointment_deleted(sender, instance, **kwargs):
+    free_slot_if_unused(instance.doctor_id, instance.date, instance.time)
+    bump_schedule_version(instance.doctor_id)
+
+
+@receiver(post_save, sender=Doctor)
+@receiver(post_delete, sender=Doctor)
+@receiver(post_save, sender=Specialization)
+@receiver(post_delete, sender=Specialization)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def filter_choices_changed(sender, **kwargs):
+    bump_filter_choices_version()
+
+
+@receiver(post_save, sender=User)
+def doctor_user_saved(sender, instance, update_fields=None, **kwargs):
+    # doctor names are part of the autocomplete index
+    if instance.role != User.Role.DOCTOR:
+        return
+    if update_fields is not None and not DOCTOR_NAME_FIELDS.intersection(update_fields):
+        return
+    bump_filter_choices_version()
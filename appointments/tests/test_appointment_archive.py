@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import now
+
+from appointments.factories import AppointmentFactory
+from appointments.models import Appointment, ArchivedAppointment
+from appointments.services.appointment_archive import (
+    archive_older_appointments,
+    get_appointment_with_archive,
+)
+
+
+class AppointmentArchiveTests(TestCase):
+    def setUp(self):
+        today = now().date()
+        self.old_appointment = AppointmentFactory(
+            date=today - timedelta(days=400), notes="Old note"
+        )
+        self.patient = self.old_appointment.user
+        self.recent_appointment = AppointmentFactory(
+            user=self.patient, date=today - timedelta(days=10)
+        )
+
+    def test_old_appointments_are_moved_to_archive(self):
+        self.assertEqual(archive_older_appointments(batch_size=1), 1)
+
+        self.assertEqual(list(Appointment.objects.all()), [self.recent_appointment])
+        archived = ArchivedAppointment.objects.get()
+        self.assertEqual(archived.pk, self.old_appointment.pk)
+        self.assertEqual(archived.user, self.patient)
+        self.assertEqual(archived.notes, "Old note")
+        self.assertEqual(archived.created_at, self.old_appointment.created_at)
+
+    def test_lookup_does_not_query_archive_for_hot_appointment(self):
+        archive_older_appointments()
+
+        with self.assertNumQueries(1):
+            appointment = get_appointment_with_archive(
+                Appointment.objects.all(),
+                ArchivedAppointment.objects.all(),
+                pk=self.recent_appointment.pk,
+            )
+        self.assertEqual(appointment, self.recent_appointment)
+
+        with self.assertNumQueries(2):
+            appointment = get_appointment_with_archive(
+                Appointment.objects.all(),
+                ArchivedAppointment.objects.all(),
+                pk=self.old_appointment.pk,
+            )
+        self.assertIsInstance(appointment, ArchivedAppointment)
+
+    def test_past_appointments_continue_into_archive(self):
+        archive_older_appointments()
+        self.client.force_login(self.patient.user)
+
+        response = self.client.get(reverse("appointments:user-appointments"))
+
+        self.assertEqual(
+            [appointment.pk for appointment in response.context["past_appointment"]],
+            [self.recent_appointment.pk, self.old_appointment.pk],
+        )
+        self.assertIsInstance(
+            response.context["past_appointment"][1], ArchivedAppointment
+        )
+        self.assertContains(
+            response,
+            reverse("appointments:appointment-note", args=[self.old_appointment.pk]),
+        )
+
+    def test_note_of_archived_appointment(self):
+        archive_older_appointments()
+        self.client.force_login(self.patient.user)
+
+        response = self.client.get(
+            reverse("appointments:appointment-note", args=[self.old_appointment.pk])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Old note")
+
+    def test_note_of_other_patients_archived_appointment(self):
+        archive_older_appointments()
+        other_appointment = AppointmentFactory()
+        self.client.force_login(other_appointment.user.user)
+
+        response = self.client.get(
+            reverse("appointments:appointment-note", args=[self.old_appointment.pk])
+        )
+
+        self.assertEqual(response.status_code, 404)
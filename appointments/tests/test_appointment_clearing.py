@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from appointments.factories import AppointmentFactory
+from appointments.models import (
+    Appointment,
+    AppointmentNotification,
+    ArchivedAppointment,
+)
+from appointments.services.appointment_archive import archive_appointments_before
+from appointments.services.appointment_clearing import delete_older_appointments
+
+
+class DeleteOlderAppointmentsTest(TestCase):
+    def setUp(self):
+        today = now().date()
+        self.old_appointment = AppointmentFactory(date=today - timedelta(days=400))
+        self.recent_appointment = AppointmentFactory(date=today - timedelta(days=10))
+
+    def test_appointments_are_kept_by_default(self):
+        self.assertEqual(delete_older_appointments(), 0)
+        self.assertEqual(Appointment.objects.count(), 2)
+
+    @override_settings(APPOINTMENT_RETENTION_DAYS=365)
+    def test_delete_old_appointments_only(self):
+        self.assertEqual(delete_older_appointments(), 1)
+        self.assertEqual(list(Appointment.objects.all()), [self.recent_appointment])
+
+    @override_settings(APPOINTMENT_RETENTION_DAYS=365)
+    def test_delete_old_archived_appointments(self):
+        archive_appointments_before(now().date())
+
+        self.assertEqual(delete_older_appointments(), 1)
+        self.assertEqual(
+            list(ArchivedAppointment.objects.values_list("pk", flat=True)),
+            [self.recent_appointment.pk],
+        )
+
+    @override_settings(APPOINTMENT_RETENTION_DAYS=365)
+    def test_notifications_of_deleted_appointments_are_deleted(self):
+        for appointment in [self.old_appointment, self.recent_appointment]:
+            AppointmentNotification.objects.create(
+                appointment=appointment, kind=AppointmentNotification.Kind.REMINDER
+            )
+
+        delete_older_appointments()
+
+        self.assertEqual(
+            list(AppointmentNotification.objects.values_list("appointment", flat=True)),
+            [self.recent_appointment.pk],
+        )
+
+    @override_settings(APPOINTMENT_RETENTION_DAYS=365)
+    def test_query_count_does_not_grow_with_batch(self):
+        AppointmentFactory.create_batch(5, date=now().date() - timedelta(days=400))
+
+        # batch lookup, savepoint, notifications, delete, next lookup and the archive lookup
+        with self.assertNumQueries(7):
+            self.assertEqual(delete_older_appointments(), 6)
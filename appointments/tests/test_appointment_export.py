@@ -0,0 +1,95 @@
+import json
+from datetime import time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from appointments.factories import AppointmentFactory
+from appointments.services.appointment_archive import archive_appointments_before
+from users.factories import DoctorFactory, UserFactory
+from users.models import User
+
+
+class AppointmentExportTests(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.doctor = DoctorFactory()
+        self.appointment = AppointmentFactory(
+            doctor=self.doctor, date=self.today, time=time(9, 0)
+        )
+        self.other_appointment = AppointmentFactory(
+            date=self.today + timedelta(days=10)
+        )
+        self.url = reverse("appointments:appointment-export")
+
+    def get_content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_staff_streams_csv(self):
+        self.client.force_login(UserFactory(role=User.Role.ADMIN))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = self.get_content(response).splitlines()
+        self.assertTrue(lines[0].startswith("id,date,time"))
+        self.assertEqual(len(lines), 3)
+
+    def test_staff_streams_filtered_ndjson(self):
+        self.client.force_login(UserFactory(role=User.Role.ADMIN))
+
+        response = self.client.get(
+            self.url,
+            {"format": "ndjson", "doctor": self.doctor.pk, "date_to": self.today},
+        )
+
+        rows = [json.loads(line) for line in self.get_content(response).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], self.appointment.pk)
+        self.assertEqual(rows[0]["patient_email"], self.appointment.user.user.email)
+        self.assertEqual(
+            rows[0]["specializations"],
+            ", ".join(
+                sorted(self.doctor.specialization.values_list("name", flat=True))
+            ),
+        )
+
+    def test_non_staff_can_not_export(self):
+        self.client.force_login(UserFactory(role=User.Role.PATIENT))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_export_appointments_command(self):
+        out = StringIO()
+
+        call_command(
+            "export_appointments",
+            "--format",
+            "ndjson",
+            "--date-from",
+            str(self.today + timedelta(days=1)),
+            stdout=out,
+        )
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.other_appointment.pk])
+
+    def test_export_includes_archived_appointments(self):
+        archived_appointment = AppointmentFactory(date=self.today - timedelta(days=400))
+        archive_appointments_before(self.today - timedelta(days=1))
+        out = StringIO()
+
+        call_command("export_appointments", "--format", "ndjson", stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [archived_appointment.pk, self.appointment.pk, self.other_appointment.pk],
+        )
+        self.assertEqual(rows[0]["patient_email"], archived_appointment.user.user.email)
@@ -0,0 +1,189 @@
+from datetime import date, time, timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+
+from appointments.factories import AppointmentFactory
+from appointments.models import Appointment, ArchivedAppointment
+from appointments.services.appointment_archive import archive_older_appointments
+from appointments.services.appointment_pages import (
+    decode_cursor,
+    encode_cursor,
+    get_appointment_pages,
+    get_keyset_page,
+    get_past_appointments_page,
+)
+from users.factories import DoctorFactory, PatientFactory
+
+
+class KeysetPageTests(TestCase):
+    def setUp(self):
+        self.patient = PatientFactory()
+        day = date(2025, 3, 10)
+        # two appointments with different doctors share date and time, only id tells them apart
+        self.appointments = [
+            AppointmentFactory(
+                doctor=DoctorFactory(), user=self.patient, date=day, time=t
+            )
+            for t in (time(9, 0), time(9, 0), time(9, 15), time(10, 0), time(11, 0))
+        ]
+        self.queryset = Appointment.objects.filter(user=self.patient)
+
+    def test_cursor_round_trip(self):
+        appointment = self.appointments[0]
+        self.assertEqual(
+            decode_cursor(encode_cursor(appointment)),
+            (appointment.date, appointment.time, appointment.pk),
+        )
+
+    def test_invalid_cursor_means_first_page(self):
+        for cursor in (None, "", "garbage", "2025-03-10_09:00:00_x"):
+            self.assertIsNone(decode_cursor(cursor))
+
+    def test_pages_cover_all_rows_once(self):
+        seen, cursor = [], None
+        while True:
+            with self.assertNumQueries(1):
+                page = get_keyset_page(self.queryset, cursor, per_page=2)
+            seen += page.items
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, self.appointments)
+
+    def test_descending_pages(self):
+        page = get_keyset_page(self.queryset, None, per_page=3, descending=True)
+        next_page = get_keyset_page(
+            self.queryset, page.next_cursor, per_page=3, descending=True
+        )
+
+        self.assertEqual(
+            page.items + next_page.items, list(reversed(self.appointments))
+        )
+        self.assertIsNone(next_page.next_cursor)
+
+
+class PastAppointmentsPageTests(TestCase):
+    def setUp(self):
+        self.patient = PatientFactory()
+        today = now().date()
+        self.hot = [
+            AppointmentFactory(user=self.patient, date=today - timedelta(days=days))
+            for days in (1, 2, 3)
+        ]
+        for days in (400, 401):
+            AppointmentFactory(user=self.patient, date=today - timedelta(days=days))
+        archive_older_appointments()
+        self.archived = list(ArchivedAppointment.objects.order_by("-date"))
+
+    def get_page(self, cursor, per_page):
+        return get_past_appointments_page(
+            Appointment.objects.filter(user=self.patient),
+            ArchivedAppointment.objects.filter(user=self.patient),
+            cursor,
+            per_page,
+        )
+
+    def test_page_within_hot_table_does_not_query_archive(self):
+        with self.assertNumQueries(1):
+            page = self.get_page(None, per_page=2)
+
+        self.assertEqual(page.items, self.hot[:2])
+        self.assertIsNotNone(page.next_cursor)
+
+    def test_page_continues_into_archive(self):
+        first_page = self.get_page(None, per_page=2)
+        with self.assertNumQueries(2):
+            second_page = self.get_page(first_page.next_cursor, per_page=2)
+
+        self.assertEqual(second_page.items[0], self.hot[2])
+        self.assertEqual(second_page.items[1].pk, self.archived[0].pk)
+
+        last_page = self.get_page(second_page.next_cursor, per_page=2)
+        self.assertEqual([a.pk for a in last_page.items], [self.archived[1].pk])
+        self.assertIsNone(last_page.next_cursor)
+
+    def test_full_hot_page_checks_archive_for_next_page(self):
+        page = self.get_page(None, per_page=3)
+
+        self.assertEqual(page.items, self.hot)
+        self.assertIsNotNone(page.next_cursor)
+        archived_page = self.get_page(page.next_cursor, per_page=3)
+        self.assertEqual(
+            [a.pk for a in archived_page.items], [a.pk for a in self.archived]
+        )
+
+
+class AppointmentPagesTests(TestCase):
+    def setUp(self):
+        self.patient = PatientFactory()
+        today = now().date()
+        self.upcoming = AppointmentFactory(
+            user=self.patient, date=today + timedelta(days=1)
+        )
+        self.past = AppointmentFactory(
+            user=self.patient, date=today - timedelta(days=1)
+        )
+
+    def get_pages(self, fragment=None):
+        return get_appointment_pages(
+            Appointment.objects.filter(user=self.patient),
+            ArchivedAppointment.objects.filter(user=self.patient),
+            {},
+            per_page=2,
+            fragment=fragment,
+        )
+
+    def test_pages_of_both_lists(self):
+        pages = self.get_pages()
+
+        self.assertEqual(pages["upcoming_appointment"], [self.upcoming])
+        self.assertEqual(pages["past_appointment"], [self.past])
+        self.assertNotIn("page_appointments", pages)
+
+    def test_fragment_reads_only_its_list(self):
+        with self.assertNumQueries(2):
+            pages = self.get_pages(fragment="past")
+
+        self.assertEqual(pages["list_name"], "past")
+        self.assertEqual(pages["page_appointments"], [self.past])
+        self.assertIsNone(pages["next_cursor"])
+        self.assertNotIn("upcoming_appointment", pages)
+
+
+@override_settings(APPOINTMENTS_PER_PAGE=2)
+class AppointmentPagesViewTests(TestCase):
+    def setUp(self):
+        self.patient = PatientFactory()
+        today = now().date()
+        self.upcoming = [
+            AppointmentFactory(user=self.patient, date=today + timedelta(days=days))
+            for days in (1, 2, 3)
+        ]
+        self.client.force_login(self.patient.user)
+        self.url = reverse("appointments:user-appointments")
+
+    def test_first_page_links_to_next_one(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context["upcoming_appointment"], self.upcoming[:2])
+        self.assertContains(response, "Load more")
+        self.assertEqual(
+            response.context["upcoming_next_cursor"], encode_cursor(self.upcoming[1])
+        )
+
+    def test_fragment_renders_only_next_items(self):
+        cursor = encode_cursor(self.upcoming[1])
+        response = self.client.get(
+            self.url, {"upcoming_cursor": cursor, "fragment": "upcoming"}
+        )
+
+        self.assertTemplateUsed(
+            response, "appointments/includes/user_appointment_items.html"
+        )
+        self.assertTemplateNotUsed(response, "appointments/base.html")
+        self.assertEqual(response.context["page_appointments"], self.upcoming[2:])
+        self.assertNotIn("past_appointment", response.context)
+        self.assertNotContains(response, "Load more")
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from appointments.services.autocomplete import autocomplete
+from users.factories import DoctorFactory, SpecializationFactory, UserFactory
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cardiology = SpecializationFactory(name="Pediatric Cardiology")
+        self.doctor = DoctorFactory(
+            user=UserFactory(first_name="Łucja", last_name="Nowak"),
+            title="Dr",
+            specialization=[self.cardiology],
+        )
+
+    def labels(self, text, limit=10):
+        return [suggestion["label"] for suggestion in autocomplete(text, limit)]
+
+    def test_doctor_is_found_by_first_or_last_name(self):
+        self.assertEqual(self.labels("luc"), ["Dr Łucja Nowak"])
+        self.assertEqual(self.labels("nowak  Ł"), ["Dr Łucja Nowak"])
+        self.assertEqual(self.labels("ucja"), [])
+
+    def test_specialization_is_found_by_any_word(self):
+        self.assertEqual(
+            autocomplete("cardio", 10),
+            [
+                {
+                    "type": "specialization",
+                    "id": self.cardiology.id,
+                    "label": "Pediatric Cardiology",
+                }
+            ],
+        )
+        self.assertEqual(self.labels("pediatric c"), ["Pediatric Cardiology"])
+
+    def test_suggestions_are_limited(self):
+        for first_name in ("Nina", "Nikola", "Nadia"):
+            DoctorFactory(user=UserFactory(first_name=first_name, last_name="Zych"))
+
+        self.assertEqual(len(self.labels("zych", limit=2)), 2)
+        self.assertEqual(len(self.labels("zych")), 3)
+
+    def test_index_is_kept_in_memory(self):
+        autocomplete("nowak", 10)
+
+        with self.assertNumQueries(0):
+            autocomplete("cardio", 10)
+
+    def test_index_is_rebuilt_after_changes(self):
+        autocomplete("nowak", 10)
+
+        self.doctor.user.last_name = "Kowalska"
+        self.doctor.user.save()
+        SpecializationFactory(name="Neurology")
+
+        self.assertEqual(self.labels("kowal"), ["Dr Łucja Kowalska"])
+        self.assertEqual(self.labels("nowak"), [])
+        self.assertEqual(self.labels("neuro"), ["Neurology"])
+
+
+class AutocompleteViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        DoctorFactory(
+            user=UserFactory(first_name="Anna", last_name="Nowak"), title="Dr"
+        )
+        self.url = reverse("appointments:autocomplete")
+
+    def test_returns_suggestions_with_cache_headers(self):
+        response = self.client.get(self.url, {"q": "anna"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["label"], "Dr Anna Nowak")
+        self.assertIn("max-age=30", response["Cache-Control"])
+
+    def test_empty_query_returns_no_suggestions(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json(), {"results": []})
+
+    def test_invalid_limit(self):
+        response = self.client.get(self.url, {"q": "anna", "limit": 1000})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("limit", response.json()["errors"])
@@ -0,0 +1,104 @@
+from datetime import time, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from appointments.factories import AppointmentFactory
+from appointments.services.calendar_feed import (
+    fold_line,
+    get_calendar_feed_token,
+    get_calendar_feed_user,
+)
+from schedules.factories import ScheduleDayFactory
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        self.tomorrow = timezone.now().date() + timedelta(days=1)
+        self.schedule_day = ScheduleDayFactory(
+            work_date=self.tomorrow,
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+            interval=timedelta(minutes=30),
+        )
+        self.doctor = self.schedule_day.doctor
+        self.appointment = AppointmentFactory(
+            doctor=self.doctor, date=self.tomorrow, time=time(9, 30)
+        )
+        self.patient = self.appointment.user
+
+    def get_url(self, user):
+        return reverse(
+            "appointments:calendar-feed",
+            kwargs={"token": get_calendar_feed_token(user)},
+        )
+
+    def test_patient_feed(self):
+        response = self.client.get(self.get_url(self.patient.user))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        content = response.content.decode()
+        self.assertTrue(content.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertIn(f"UID:appointment-{self.appointment.pk}@", content)
+        self.assertIn(f"DTSTART:{self.tomorrow:%Y%m%d}T093000Z", content)
+        self.assertIn(f"DTEND:{self.tomorrow:%Y%m%d}T100000Z", content)
+        self.assertNotIn("Office hours", content)
+
+    def test_doctor_feed_contains_schedule_days(self):
+        response = self.client.get(self.get_url(self.doctor.user))
+
+        content = response.content.decode()
+        self.assertIn(f"UID:appointment-{self.appointment.pk}@", content)
+        self.assertIn(f"UID:schedule-day-{self.schedule_day.pk}@", content)
+
+    def test_not_modified_feed(self):
+        url = self.get_url(self.patient.user)
+        response = self.client.get(url)
+
+        with self.assertNumQueries(2):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_etag_changes_when_appointment_is_deleted(self):
+        AppointmentFactory(user=self.patient, date=self.tomorrow)
+        url = self.get_url(self.patient.user)
+        etag = self.client.get(url)["ETag"]
+
+        self.appointment.delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(
+            f"UID:appointment-{self.appointment.pk}@", response.content.decode()
+        )
+
+    def test_token_is_revoked_by_password_change(self):
+        user = self.patient.user
+        token = get_calendar_feed_token(user)
+
+        user.set_password("new-password")
+        user.save()
+
+        self.assertIsNone(get_calendar_feed_user(token))
+        response = self.client.get(
+            reverse("appointments:calendar-feed", kwargs={"token": token})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_token(self):
+        response = self.client.get(
+            reverse("appointments:calendar-feed", kwargs={"token": "invalid"})
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_long_lines_are_folded(self):
+        folded = fold_line("SUMMARY:" + "x" * 100)
+
+        lines = folded.split("\r\n")
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(len(lines[0]), 75)
+        self.assertTrue(lines[1].startswith(" "))
@@ -1,4 +1,4 @@
-from datetime import date, datetime
+from datetime import date
 from datetime import time as time_obj
 from datetime import timedelta
 
@@ -7,7 +7,8 @@ from django.test import TestCase
 from appointments.factories import AppointmentFactory
 from appointments.services.doctor_schedule import DoctorScheduleService
 from schedules.factories import ScheduleDayFactory
-from users.factories import DoctorFactory
+from users.factories import DepartmentFactory, DoctorFactory, SpecializationFactory
+from users.models import Doctor
 
 
 class DoctorScheduleServiceTests(TestCase):
@@ -28,24 +29,23 @@ class DoctorScheduleServiceTests(TestCase):
             time=time_obj(9, 0),
         )
 
-    def test_get_slot_status_returns_correct_flags(self):
-        appointment_lookup = {(self.doctor.id, self.start_of_week, time_obj(9, 0))}
-        current_time = datetime.combine(self.start_of_week, time_obj(9, 0))
-        slot = DoctorScheduleService.get_slot_status(
-            current_time, self.schedule_day, appointment_lookup
+    def test_get_doctor_schedule_week_reads_slots_of_schedule_day(self):
+        schedule = DoctorScheduleService.get_doctor_schedule_week(
+            self.start_of_week, self.end_of_week, [self.doctor]
         )
-        self.assertTrue(slot["is_taken"])
-        self.assertIn("is_past", slot)
-        self.assertEqual(slot["time"], "09:00")
+        slots = schedule[self.doctor][self.start_of_week]
+        self.assertEqual([slot["time"] for slot in slots], ["09:00", "09:30"])
+        self.assertTrue(slots[0]["is_taken"])
+        self.assertFalse(slots[1]["is_taken"])
+        self.assertIn("is_past", slots[0])
 
-    def test_get_doctor_schedule_day_generates_slots(self):
-        appointments = {(self.doctor.id, self.start_of_week, time_obj(9, 0))}
-        result = DoctorScheduleService.get_doctor_schedule_day(
-            [self.schedule_day], appointments
+    def test_get_doctor_schedule_week_returns_empty_days_without_schedule(self):
+        schedule = DoctorScheduleService.get_doctor_schedule_week(
+            self.start_of_week, self.end_of_week, [self.doctor]
+        )
+        self.assertEqual(
+            schedule[self.doctor][self.start_of_week + timedelta(days=1)], []
         )
-        self.assertIn(self.start_of_week, result)
-        self.assertEqual(len(result[self.start_of_week]), 2)
-        self.assertTrue(result[self.start_of_week][0]["is_taken"])
 
     def test_fulfill_week_schedule_by_days_fills_all_days(self):
         partial_schedule = {
@@ -74,3 +74,82 @@ class DoctorScheduleServiceTests(TestCase):
         self.assertIn(self.doctor, schedule)
         self.assertEqual(len(schedule[self.doctor]), 7)
         self.assertIn(self.start_of_week, schedule[self.doctor])
+
+    def test_get_next_free_slots_skips_taken_and_past_slots(self):
+        next_month = self.start_of_week + timedelta(days=60)
+        ScheduleDayFactory(
+            doctor=self.doctor,
+            work_date=next_month,
+            start_time=time_obj(9, 0),
+            end_time=time_obj(10, 0),
+            interval=timedelta(minutes=30),
+        )
+        AppointmentFactory(doctor=self.doctor, date=next_month, time=time_obj(9, 0))
+
+        slots = DoctorScheduleService.get_next_free_slots(
+            Doctor.objects.filter(pk=self.doctor.pk),
+            limit=5,
+            date_from=self.start_of_week + timedelta(days=1),
+        )
+
+        self.assertEqual(
+            slots,
+            [
+                {
+                    "doctor_id": self.doctor.pk,
+                    "date": next_month,
+                    "time": time_obj(9, 30),
+                }
+            ],
+        )
+
+    def test_get_next_free_slots_orders_slots_of_many_doctors(self):
+        tomorrow = self.start_of_week + timedelta(days=1)
+        other_doctor = DoctorFactory()
+        for doctor, start_time in ((self.doctor, 11), (other_doctor, 10)):
+            ScheduleDayFactory(
+                doctor=doctor,
+                work_date=tomorrow,
+                start_time=time_obj(start_time, 0),
+                end_time=time_obj(start_time + 1, 0),
+                interval=timedelta(minutes=30),
+            )
+
+        slots = DoctorScheduleService.get_next_free_slots(
+            Doctor.objects.all(), limit=3, date_from=tomorrow
+        )
+
+        self.assertEqual(
+            [(slot["doctor_id"], slot["time"]) for slot in slots],
+            [
+                (other_doctor.pk, time_obj(10, 0)),
+                (other_doctor.pk, time_obj(10, 30)),
+                (self.doctor.pk, time_obj(11, 0)),
+            ],
+        )
+
+    def test_get_next_free_slots_of_department_are_not_repeated(self):
+        tomorrow = self.start_of_week + timedelta(days=1)
+        department = DepartmentFactory()
+        doctor = DoctorFactory(
+            specialization=SpecializationFactory.create_batch(2, department=department)
+        )
+        ScheduleDayFactory(
+            doctor=doctor,
+            work_date=tomorrow,
+            start_time=time_obj(9, 0),
+            end_time=time_obj(10, 0),
+            interval=timedelta(minutes=30),
+        )
+
+        slots = DoctorScheduleService.get_next_free_slots(
+            Doctor.objects.filter(specialization__department=department), limit=5
+        )
+
+        self.assertEqual(
+            [slot["time"] for slot in slots], [time_obj(9, 0), time_obj(9, 30)]
+        )
+        self.assertEqual(
+            DoctorScheduleService.get_next_free_slots(Doctor.objects.none(), limit=5),
+            [],
+        )
@@ -1,9 +1,15 @@
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.timezone import now, timedelta
 
 from appointments.factories import AppointmentFactory
+from appointments.models import AppointmentNotification
+from appointments.services.email_utils import (
+    claim_reminders,
+    send_appointment_reminder_batch,
+    send_upcoming_appointment_reminders,
+)
 
 
 class EmailUtilsTestCase(TestCase):
@@ -16,7 +22,7 @@ class EmailUtilsTestCase(TestCase):
     def test_send_appointment_created_email(self, mock_send_mail):
         from appointments.services.email_utils import send_appointment_created_email
 
-        send_appointment_created_email(self.appointment)
+        send_appointment_created_email(self.appointment.pk)
         mock_send_mail.assert_called_once()
         self.assertIn("Appointment booked", mock_send_mail.call_args[1]["subject"])
 
@@ -24,7 +30,7 @@ class EmailUtilsTestCase(TestCase):
     def test_send_appointment_confirmed_email(self, mock_send_mail):
         from appointments.services.email_utils import send_appointment_confirmed_email
 
-        send_appointment_confirmed_email(self.appointment)
+        send_appointment_confirmed_email(self.appointment.pk)
         mock_send_mail.assert_called_once()
         self.assertIn("Appointment confirmed", mock_send_mail.call_args[1]["subject"])
 
@@ -32,7 +38,7 @@ class EmailUtilsTestCase(TestCase):
     def test_send_note_added_email(self, mock_send_mail):
         from appointments.services.email_utils import send_note_added_email
 
-        send_note_added_email(self.appointment)
+        send_note_added_email(self.appointment.pk)
         mock_send_mail.assert_called_once()
         self.assertIn("note added", mock_send_mail.call_args[1]["subject"])
 
@@ -40,9 +46,28 @@ class EmailUtilsTestCase(TestCase):
     def test_send_appointment_deleted_email(self, mock_send_mail):
         from appointments.services.email_utils import send_appointment_deleted_email
 
-        send_appointment_deleted_email(self.appointment)
+        send_appointment_deleted_email(
+            self.appointment.user.user.email,
+            str(self.appointment.date),
+            str(self.appointment.time),
+            str(self.appointment.doctor),
+        )
         mock_send_mail.assert_called_once()
         self.assertIn("cancelled", mock_send_mail.call_args[1]["subject"])
+        self.assertEqual(
+            mock_send_mail.call_args[1]["recipient_list"],
+            [self.appointment.user.user.email],
+        )
+
+    @patch("appointments.services.email_utils.send_mail")
+    def test_email_is_skipped_for_deleted_appointment(self, mock_send_mail):
+        from appointments.services.email_utils import send_appointment_created_email
+
+        appointment_id = self.appointment.pk
+        self.appointment.delete()
+
+        send_appointment_created_email(appointment_id)
+        mock_send_mail.assert_not_called()
 
     @patch("appointments.services.email_utils.send_mail")
     def test_send_appointment_reminder_email(self, mock_send_mail):
@@ -52,27 +77,58 @@ class EmailUtilsTestCase(TestCase):
         mock_send_mail.assert_called_once()
         self.assertIn("reminder", mock_send_mail.call_args[1]["subject"])
 
-    @patch("appointments.services.email_utils.send_appointment_reminder_email")
-    def test_send_upcoming_appointment_reminders(self, mock_reminder_func):
+    @patch("appointments.services.email_utils.send_appointment_reminder_batch")
+    def test_send_upcoming_appointment_reminders(self, mock_batch_task):
         from appointments.services.email_utils import (
             send_upcoming_appointment_reminders,
         )
 
-        send_upcoming_appointment_reminders()
-        mock_reminder_func.assert_called_once_with(self.appointment)
+        batches_count = send_upcoming_appointment_reminders()
 
-    @patch("appointments.services.email_utils.logger")
-    @patch("appointments.services.email_utils.send_appointment_reminder_email")
-    def test_send_upcoming_appointment_reminders_handles_exception(
-        self, mock_send_email, mock_logger
-    ):
+        self.assertEqual(batches_count, 1)
+        mock_batch_task.delay.assert_called_once_with([self.appointment.id])
+
+    @override_settings(REMINDER_BATCH_SIZE=2)
+    @patch("appointments.services.email_utils.send_appointment_reminder_batch")
+    def test_send_upcoming_appointment_reminders_splits_batches(self, mock_batch_task):
         from appointments.services.email_utils import (
             send_upcoming_appointment_reminders,
         )
 
+        AppointmentFactory.create_batch(
+            2, is_confirmed=True, date=now().date() + timedelta(days=1)
+        )
+
+        batches_count = send_upcoming_appointment_reminders()
+
+        self.assertEqual(batches_count, 2)
+        self.assertEqual(
+            [len(call.args[0]) for call in mock_batch_task.delay.call_args_list],
+            [2, 1],
+        )
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_email")
+    def test_send_appointment_reminder_batch(self, mock_reminder_func):
+        from appointments.services.email_utils import send_appointment_reminder_batch
+
+        result = send_appointment_reminder_batch([self.appointment.id])
+
+        mock_reminder_func.assert_called_once()
+        self.assertEqual(mock_reminder_func.call_args[0][0], self.appointment)
+        self.assertIsNotNone(mock_reminder_func.call_args[1]["connection"])
+        self.assertEqual(result["sent"], 1)
+        self.assertEqual(result["failed"], 0)
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_batch")
+    @patch("appointments.services.email_utils.logger")
+    @patch("appointments.services.email_utils.send_appointment_reminder_email")
+    def test_send_appointment_reminder_batch_handles_exception(
+        self, mock_send_email, mock_logger, mock_batch_task
+    ):
         mock_send_email.side_effect = Exception("Test exception")
-        send_upcoming_appointment_reminders()
+        result = send_appointment_reminder_batch([self.appointment.id])
 
+        self.assertEqual(result["failed"], 1)
         mock_logger.error.assert_called_once()
         args, kwargs = mock_logger.error.call_args
         self.assertIn(
@@ -80,3 +136,118 @@ class EmailUtilsTestCase(TestCase):
             args[0],
         )
         self.assertIn("Test exception", args[0])
+
+
+class ReminderLedgerTestCase(TestCase):
+    def setUp(self):
+        self.appointment = AppointmentFactory(
+            is_confirmed=True, date=now().date() + timedelta(days=1)
+        )
+
+    def get_notification(self):
+        return AppointmentNotification.objects.get(
+            appointment=self.appointment, kind=AppointmentNotification.Kind.REMINDER
+        )
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_email")
+    def test_reminder_is_sent_only_once(self, mock_reminder_func):
+        send_appointment_reminder_batch([self.appointment.id])
+        result = send_appointment_reminder_batch([self.appointment.id])
+
+        mock_reminder_func.assert_called_once()
+        self.assertEqual(result["skipped"], 1)
+        notification = self.get_notification()
+        self.assertEqual(notification.status, AppointmentNotification.Status.SENT)
+        self.assertIsNotNone(notification.sent_at)
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_batch")
+    @patch("appointments.services.email_utils.send_appointment_reminder_email")
+    def test_failed_reminder_is_retried(self, mock_reminder_func, mock_batch_task):
+        mock_reminder_func.side_effect = [Exception("Test exception"), None]
+
+        send_appointment_reminder_batch([self.appointment.id])
+        self.assertEqual(
+            self.get_notification().status, AppointmentNotification.Status.FAILED
+        )
+        mock_batch_task.apply_async.assert_called_once_with(
+            ([self.appointment.id],), countdown=600
+        )
+
+        send_appointment_reminder_batch([self.appointment.id])
+        notification = self.get_notification()
+        self.assertEqual(notification.status, AppointmentNotification.Status.SENT)
+        self.assertEqual(notification.attempts, 2)
+
+    @override_settings(REMINDER_MAX_ATTEMPTS=1)
+    @patch("appointments.services.email_utils.send_appointment_reminder_batch")
+    @patch("appointments.services.email_utils.send_appointment_reminder_email")
+    def test_failed_reminder_is_not_retried_after_max_attempts(
+        self, mock_reminder_func, mock_batch_task
+    ):
+        mock_reminder_func.side_effect = Exception("Test exception")
+
+        send_appointment_reminder_batch([self.appointment.id])
+
+        mock_batch_task.apply_async.assert_not_called()
+
+    @patch("appointments.services.email_utils.get_connection")
+    def test_nothing_is_claimed_when_smtp_server_is_down(self, mock_get_connection):
+        mock_get_connection.return_value.__enter__.side_effect = ConnectionRefusedError
+
+        with self.assertRaises(ConnectionRefusedError):
+            send_appointment_reminder_batch([self.appointment.id])
+
+        self.assertFalse(
+            AppointmentNotification.objects.exclude(
+                status=AppointmentNotification.Status.PENDING
+            ).exists()
+        )
+        self.assertEqual(claim_reminders([self.appointment.id]), [self.appointment.id])
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_email")
+    def test_reminder_of_deleted_appointment_is_skipped(self, mock_reminder_func):
+        deleted_id = self.appointment.id
+        self.appointment.delete()
+        other = AppointmentFactory(
+            is_confirmed=True, date=now().date() + timedelta(days=1)
+        )
+
+        result = send_appointment_reminder_batch([deleted_id, other.id])
+
+        mock_reminder_func.assert_called_once()
+        self.assertEqual(result["sent"], 1)
+        self.assertEqual(result["skipped"], 1)
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_email")
+    def test_reminder_claimed_by_other_worker_is_skipped(self, mock_reminder_func):
+        AppointmentNotification.objects.create(
+            appointment=self.appointment,
+            kind=AppointmentNotification.Kind.REMINDER,
+            status=AppointmentNotification.Status.SENDING,
+            claimed_at=now(),
+        )
+
+        self.assertEqual(claim_reminders([self.appointment.id]), [])
+        send_appointment_reminder_batch([self.appointment.id])
+        mock_reminder_func.assert_not_called()
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_batch")
+    def test_sent_reminders_are_not_queued_again(self, mock_batch_task):
+        AppointmentNotification.objects.create(
+            appointment=self.appointment,
+            kind=AppointmentNotification.Kind.REMINDER,
+            status=AppointmentNotification.Status.SENT,
+        )
+
+        self.assertEqual(send_upcoming_appointment_reminders(), 0)
+        mock_batch_task.delay.assert_not_called()
+
+    @patch("appointments.services.email_utils.send_appointment_reminder_batch")
+    def test_reminders_are_sharded_by_id_range(self, mock_batch_task):
+        other = AppointmentFactory(
+            is_confirmed=True, date=now().date() + timedelta(days=1)
+        )
+
+        send_upcoming_appointment_reminders(min_id=other.id, max_id=other.id)
+
+        mock_batch_task.delay.assert_called_once_with([other.id])
@@ -1,7 +1,12 @@
 from django.test import TestCase
 
 from appointments.filters import DoctorFilter
-from users.factories import DoctorFactory, SpecializationFactory, UserFactory
+from users.factories import (
+    DepartmentFactory,
+    DoctorFactory,
+    SpecializationFactory,
+    UserFactory,
+)
 from users.models import Doctor
 
 
@@ -54,3 +59,46 @@ class DoctorFilterTests(TestCase):
         choices = get_doctor_title_choices()
         self.assertIn(("Dr", "Dr"), choices)
         self.assertIn(("Prof", "Prof"), choices)
+
+    def test_filter_by_department(self):
+        self.derma.department = DepartmentFactory(name="Skin Department")
+        self.derma.save()
+        self.doc1.specialization.set([self.cardio])
+        self.doc2.specialization.set([self.derma])
+
+        f = DoctorFilter(
+            data={"department": [self.cardio.department_id]},
+            queryset=Doctor.objects.all(),
+        )
+        self.assertIn(self.doc1, f.qs)
+        self.assertNotIn(self.doc2, f.qs)
+
+    def test_form_is_rendered_from_cached_choices(self):
+        DoctorFilter(queryset=Doctor.objects.all()).form.as_p()
+
+        with self.assertNumQueries(0):
+            form = DoctorFilter(queryset=Doctor.objects.all()).form
+            form.as_p()
+        self.assertIn(
+            (self.cardio.id, self.cardio.name), form.fields["specialization"].choices
+        )
+        self.assertIn(
+            (self.cardio.department_id, self.cardio.department.name),
+            form.fields["department"].choices,
+        )
+
+    def test_cached_choices_are_invalidated_on_change(self):
+        DoctorFilter(queryset=Doctor.objects.all()).form.as_p()
+
+        neuro = SpecializationFactory(name="Neurology")
+        department = DepartmentFactory(name="Neurology Department")
+        DoctorFactory(title="Ass. Prof")
+        form_html = DoctorFilter(queryset=Doctor.objects.all()).form.as_p()
+
+        self.assertIn(neuro.name, form_html)
+        self.assertIn(department.name, form_html)
+        self.assertIn("Ass. Prof", form_html)
+
+        neuro.delete()
+        form_html = DoctorFilter(queryset=Doctor.objects.all()).form.as_p()
+        self.assertNotIn(">Neurology<", form_html)
@@ -1,5 +1,6 @@
 from datetime import date, time, timedelta
 
+from django.db import IntegrityError
 from django.test import TestCase
 
 from appointments.forms import AppointmentForm
@@ -93,3 +94,18 @@ class AppointmentFormTests(TestCase):
         form = AppointmentForm(data=self.get_valid_kwargs(), instance=appointment)
         form.instance.user = self.patient
         self.assertTrue(form.is_valid())
+
+    def test_database_rejects_double_booking(self):
+        Appointment.objects.create(
+            doctor=self.doctor,
+            user=self.patient,
+            date=self.work_date,
+            time=time(10, 20),
+        )
+        with self.assertRaises(IntegrityError):
+            Appointment.objects.create(
+                doctor=self.doctor,
+                user=PatientFactory(),
+                date=self.work_date,
+                time=time(10, 20),
+            )
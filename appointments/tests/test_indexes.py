@@ -0,0 +1,150 @@
+from datetime import time, timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from appointments.factories import AppointmentFactory
+from appointments.models import Appointment, Slot
+from appointments.services.doctor_schedule import DoctorScheduleService
+from schedules.factories import ScheduleDayFactory
+from schedules.models import ScheduleDay
+from users.factories import DoctorFactory, SpecializationFactory
+from users.models import Doctor
+
+
+class QueryIndexesTests(TestCase):
+    """
+    Sequential scans are disabled, so a query falls back to one only if no index can serve it
+    """
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.now_time = timezone.now().time()
+        self.appointment = AppointmentFactory(date=self.today + timedelta(days=1))
+        self.doctor = self.appointment.doctor
+        self.patient = self.appointment.user
+        ScheduleDayFactory(doctor=self.doctor, work_date=self.today)
+        # with a single row every index costs the same, rows of another doctor and patient
+        # make the planner pick the selective one
+        other = AppointmentFactory(date=self.today)
+        Appointment.objects.bulk_create(
+            Appointment(
+                doctor=other.doctor,
+                user=other.user,
+                date=self.today + timedelta(days=days),
+                time=time(10, 0),
+            )
+            for days in range(2, 202)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE appointments_appointment")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertNotIn(f"Seq Scan on {queryset.model._meta.db_table}", plan)
+        self.assertIn(index_name, plan)
+
+    def test_user_appointments_query(self):
+        queryset = Appointment.objects.filter(user=self.patient).filter(
+            Q(date__gt=self.today) | Q(date=self.today, time__gte=self.now_time)
+        )
+        self.assertUsesIndex(
+            queryset.order_by("date", "time"), "appointment_user_date_idx"
+        )
+
+    def test_doctor_appointments_query(self):
+        queryset = Appointment.objects.filter(doctor=self.doctor).filter(
+            Q(date__lt=self.today) | Q(date=self.today, time__lt=self.now_time)
+        )
+        self.assertUsesIndex(
+            queryset.order_by("date", "time"), "unique_doctor_appointment_slot"
+        )
+
+    def test_booked_slot_query(self):
+        queryset = Appointment.objects.filter(
+            doctor=self.doctor, date=self.today, time=time(10, 0)
+        )
+        self.assertUsesIndex(queryset, "unique_doctor_appointment_slot")
+
+    def test_reminder_query(self):
+        queryset = Appointment.objects.filter(
+            date=self.today + timedelta(days=1), is_confirmed=True
+        )
+        self.assertUsesIndex(queryset.order_by("pk"), "appointment_confirmed_date_idx")
+
+    def test_doctor_available_query(self):
+        queryset = ScheduleDay.objects.filter(
+            doctor=self.doctor,
+            work_date=self.today,
+            start_time__lte=time(10, 0),
+            end_time__gt=time(10, 0),
+        )
+        self.assertUsesIndex(queryset, "scheduleday_doctor_date_idx")
+
+    def test_schedule_overlap_query(self):
+        queryset = ScheduleDay.objects.filter(
+            doctor=self.doctor,
+            work_date=self.today,
+            start_time__lte=time(12, 0),
+            end_time__gte=time(10, 0),
+        )
+        self.assertUsesIndex(queryset, "scheduleday_doctor_date_idx")
+
+    def test_last_modified_schedule_query(self):
+        queryset = ScheduleDay.objects.filter(doctor=self.doctor).order_by(
+            "-modified_at"
+        )[:1]
+        self.assertUsesIndex(queryset, "scheduleday_doctor_mod_idx")
+
+    def test_older_schedules_query(self):
+        queryset = ScheduleDay.objects.filter(
+            work_date__lt=self.today - timedelta(days=30)
+        )
+        self.assertUsesIndex(queryset, "scheduleday_work_date_idx")
+
+    def test_availability_schedule_days_query(self):
+        queryset = ScheduleDay.objects.filter(
+            doctor_id__in=[self.doctor.id],
+            work_date__range=[self.today, self.today + timedelta(days=6)],
+        )
+        self.assertUsesIndex(queryset, "scheduleday_doctor_date_idx")
+
+    def test_week_slots_query(self):
+        queryset = Slot.objects.filter(
+            doctor_id__in=[self.doctor.id],
+            date__range=[self.today, self.today + timedelta(days=6)],
+        )
+        self.assertUsesIndex(queryset, "appointment_doctor__710073_idx")
+
+    def test_next_free_slots_query(self):
+        queryset = Slot.objects.filter(
+            doctor_id__in=[self.doctor.id], is_taken=False, date__gt=self.today
+        ).order_by("date", "time")[:10]
+        self.assertUsesIndex(queryset, "slot_free_doctor_date_idx")
+
+    def test_next_free_slots_of_specialization_query(self):
+        specialization = SpecializationFactory()
+        doctors = DoctorFactory.create_batch(2, specialization=[specialization])
+        for doctor in doctors:
+            for days in range(-20, 2):
+                ScheduleDayFactory(
+                    doctor=doctor, work_date=self.today + timedelta(days=days)
+                )
+        # most slots are taken, as in a running clinic, so the partial index of free slots is the selective one
+        Slot.objects.filter(date__lt=self.today).update(is_taken=True)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE appointments_slot")
+
+        queryset = DoctorScheduleService.get_next_free_slots_query(
+            Doctor.objects.filter(specialization=specialization), limit=10
+        )
+
+        # every doctor's slots are read in order from the index, no sort over all slots of the specialization
+        plan = queryset.explain()
+        self.assertNotIn("Seq Scan on appointments_slot", plan)
+        self.assertNotIn("Bitmap", plan)
+        self.assertEqual(plan.count("slot_free_doctor_date_idx"), 2)
@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from appointments.management.commands.populate_db import bulk_generate_clinic
+from appointments.models import Appointment, Slot
+from appointments.services.filter_choices import get_doctor_title_choices
+from schedules.models import ScheduleDay
+from users.models import Doctor, Patient, User
+from users.services.doctor_search import search_doctors
+from users.services.permissions_in_groups import create_permission_groups
+
+
+class BulkGenerateClinicTests(TestCase):
+    def setUp(self):
+        create_permission_groups()
+
+    def test_bulk_generate_clinic(self):
+        counts = bulk_generate_clinic(
+            doctors_count=2, patients_count=3, days=2, fill_percent=0.5, batch_size=10
+        )
+
+        self.assertEqual(counts["schedule_days"], 4)
+        self.assertEqual(counts["appointments"], 4 * 16)
+        self.assertEqual(Doctor.objects.count(), 2)
+        self.assertEqual(Patient.objects.count(), 3)
+        self.assertEqual(ScheduleDay.objects.count(), 4)
+        self.assertEqual(Appointment.objects.count(), 64)
+        self.assertEqual(Slot.objects.count(), 4 * 32)
+        self.assertEqual(Slot.objects.filter(is_taken=True).count(), 64)
+        self.assertFalse(Doctor.objects.filter(specialization=None).exists())
+        self.assertFalse(User.objects.filter(groups=None).exists())
+
+    def test_bulk_generate_clinic_can_run_again(self):
+        bulk_generate_clinic(doctors_count=1, patients_count=1, days=1)
+        bulk_generate_clinic(doctors_count=1, patients_count=1, days=1)
+
+        self.assertEqual(Doctor.objects.count(), 2)
+        self.assertEqual(User.objects.count(), 4)
+
+    def test_bulk_created_doctors_are_searchable_and_in_filter_choices(self):
+        self.assertEqual(list(get_doctor_title_choices()), [])
+
+        bulk_generate_clinic(doctors_count=2, patients_count=1, days=1)
+
+        for doctor in Doctor.objects.select_related("user"):
+            self.assertIn(
+                doctor, search_doctors(Doctor.objects.all(), doctor.user.last_name)
+            )
+            self.assertIn((doctor.title, doctor.title), get_doctor_title_choices())
@@ -0,0 +1,50 @@
+from django.core.management.base import CommandError
+from django.http import HttpResponse, HttpResponseRedirect
+from django.test import TestCase
+
+from appointments.management.commands.run_benchmarks import (
+    measure,
+    run_benchmarks,
+    seed_clinic,
+)
+from appointments.models import Appointment
+from schedules.models import ScheduleDay
+
+
+class RunBenchmarksTests(TestCase):
+    def test_seed_clinic_creates_schedule_and_appointments(self):
+        seed_clinic(doctors_count=1, patients_count=2, days=2, fill=0.5)
+
+        self.assertEqual(ScheduleDay.objects.count(), 2)
+        self.assertEqual(Appointment.objects.count(), 32)
+
+    def test_measure_reports_time_queries_and_memory(self):
+        result = measure(lambda: list(Appointment.objects.all()), repeat=2)
+
+        self.assertEqual(result["queries"], 1)
+        self.assertEqual(result["repeat"], 2)
+        self.assertGreaterEqual(result["max_ms"], result["min_ms"])
+        self.assertGreater(result["peak_memory_kb"], 0)
+
+    def test_measure_rejects_unexpected_status(self):
+        measure(lambda: HttpResponse(), repeat=1)
+
+        with self.assertRaises(CommandError):
+            measure(lambda: HttpResponseRedirect("/"), repeat=1)
+
+    def test_run_benchmarks_measures_hot_paths(self):
+        seed_clinic(doctors_count=1, patients_count=1, days=2, fill=0.5)
+
+        results = run_benchmarks(repeat=1)
+
+        self.assertEqual(
+            set(results),
+            {
+                "schedule_week_cold",
+                "schedule_week_warm",
+                "appointments_list",
+                "user_appointments",
+                "doctor_appointments",
+                "booking_post",
+            },
+        )
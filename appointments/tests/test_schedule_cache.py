@@ -0,0 +1,65 @@
+from datetime import time, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from appointments.factories import AppointmentFactory
+from appointments.services.doctor_schedule import DoctorScheduleService
+from appointments.services.schedule_cache import (
+    bump_schedule_version,
+    get_schedule_versions,
+)
+from schedules.factories import ScheduleDayFactory
+from users.factories import DoctorFactory
+
+
+class DoctorScheduleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.doctor = DoctorFactory()
+        self.start_of_week = timezone.now().date() + timedelta(days=1)
+        self.end_of_week = self.start_of_week + timedelta(days=6)
+        self.schedule_day = ScheduleDayFactory(
+            doctor=self.doctor,
+            work_date=self.start_of_week,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            interval=timedelta(minutes=30),
+        )
+
+    def get_slots(self):
+        schedule = DoctorScheduleService.get_doctor_schedule_week(
+            self.start_of_week, self.end_of_week, [self.doctor]
+        )
+        return schedule[self.doctor][self.start_of_week]
+
+    def test_cached_week_is_served_without_queries(self):
+        self.get_slots()
+
+        with self.assertNumQueries(0):
+            slots = self.get_slots()
+        self.assertEqual(len(slots), 2)
+
+    def test_version_is_bumped(self):
+        version = get_schedule_versions([self.doctor.id])[self.doctor.id]
+
+        bump_schedule_version(self.doctor.id)
+
+        self.assertGreater(
+            get_schedule_versions([self.doctor.id])[self.doctor.id], version
+        )
+
+    def test_new_appointment_invalidates_cached_week(self):
+        self.assertFalse(self.get_slots()[0]["is_taken"])
+
+        AppointmentFactory(doctor=self.doctor, date=self.start_of_week, time=time(9, 0))
+
+        self.assertTrue(self.get_slots()[0]["is_taken"])
+
+    def test_deleted_schedule_day_invalidates_cached_week(self):
+        self.assertEqual(len(self.get_slots()), 2)
+
+        self.schedule_day.delete()
+
+        self.assertEqual(self.get_slots(), [])
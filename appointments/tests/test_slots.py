@@ -0,0 +1,70 @@
+from datetime import time, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from appointments.factories import AppointmentFactory
+from appointments.models import Slot
+from appointments.services.slots import generate_slot_times
+from schedules.factories import ScheduleDayFactory
+from users.factories import DoctorFactory
+
+
+class SlotSyncTests(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+        self.work_date = timezone.now().date() + timedelta(days=1)
+        self.schedule_day = ScheduleDayFactory(
+            doctor=self.doctor,
+            work_date=self.work_date,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            interval=timedelta(minutes=15),
+        )
+
+    def get_slot(self, slot_time):
+        return Slot.objects.get(doctor=self.doctor, date=self.work_date, time=slot_time)
+
+    def test_generate_slot_times(self):
+        self.assertEqual(
+            generate_slot_times(self.schedule_day),
+            [time(9, 0), time(9, 15), time(9, 30), time(9, 45)],
+        )
+
+    def test_slots_created_with_schedule_day(self):
+        self.assertEqual(self.schedule_day.slots.count(), 4)
+        self.assertFalse(self.schedule_day.slots.filter(is_taken=True).exists())
+
+    def test_slots_rebuilt_when_schedule_day_updated(self):
+        AppointmentFactory(doctor=self.doctor, date=self.work_date, time=time(10, 0))
+
+        self.schedule_day.end_time = time(10, 30)
+        self.schedule_day.save()
+
+        self.assertEqual(self.schedule_day.slots.count(), 6)
+        self.assertTrue(self.get_slot(time(10, 0)).is_taken)
+
+    def test_slots_removed_with_schedule_day(self):
+        self.schedule_day.delete()
+
+        self.assertFalse(Slot.objects.filter(doctor=self.doctor).exists())
+
+    def test_slot_marked_taken_and_freed_by_appointment(self):
+        appointment = AppointmentFactory(
+            doctor=self.doctor, date=self.work_date, time=time(9, 15)
+        )
+        self.assertTrue(self.get_slot(time(9, 15)).is_taken)
+
+        appointment.delete()
+        self.assertFalse(self.get_slot(time(9, 15)).is_taken)
+
+    def test_slot_freed_when_appointment_moved(self):
+        appointment = AppointmentFactory(
+            doctor=self.doctor, date=self.work_date, time=time(9, 15)
+        )
+
+        appointment.time = time(9, 30)
+        appointment.save()
+
+        self.assertFalse(self.get_slot(time(9, 15)).is_taken)
+        self.assertTrue(self.get_slot(time(9, 30)).is_taken)
@@ -1,12 +1,12 @@
 from datetime import date, time, timedelta
 from unittest.mock import patch
 
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
 from appointments.factories import AppointmentFactory
-from appointments.forms import AppointmentForm, AppointmentNoteForm
+from appointments.forms import SLOT_TAKEN_MESSAGE, AppointmentForm, AppointmentNoteForm
 from appointments.models import Appointment
 from appointments.views import AppointmentListView
 from schedules.factories import ScheduleDayFactory
@@ -48,6 +48,27 @@ class AppointmentListViewTests(TestCase):
         self.assertEqual(previous_week, expected_prev)
         self.assertEqual(next_week, expected_next)
 
+    @override_settings(APPOINTMENT_LIST_DOCTORS_PER_PAGE=1)
+    def test_doctors_are_paginated(self):
+        DoctorFactory.create_batch(2)
+
+        response = self.client.get(reverse("appointments:appointments-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["is_paginated"])
+        self.assertEqual(response.context["paginator"].num_pages, 2)
+        self.assertEqual(len(response.context["doctor_week_schedule"]), 1)
+
+    @override_settings(APPOINTMENT_LIST_DOCTORS_PER_PAGE=1)
+    def test_page_links_keep_week_param(self):
+        DoctorFactory.create_batch(2)
+
+        response = self.client.get(
+            reverse("appointments:appointments-list"), {"week": "2025-07-14"}
+        )
+
+        self.assertContains(response, "?week=2025-07-14&page=2")
+
 
 class UserAppointmentsViewTest(TestCase):
     def setUp(self):
@@ -78,8 +99,8 @@ class UserAppointmentsViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("upcoming_appointment", response.context)
         self.assertIn("past_appointment", response.context)
-        self.assertEqual(response.context["upcoming_appointment"].count(), 1)
-        self.assertEqual(response.context["past_appointment"].count(), 1)
+        self.assertEqual(len(response.context["upcoming_appointment"]), 1)
+        self.assertEqual(len(response.context["past_appointment"]), 1)
 
 
 class DoctorAppointmentsViewTest(TestCase):
@@ -111,8 +132,121 @@ class DoctorAppointmentsViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("upcoming_appointment", response.context)
         self.assertIn("past_appointment", response.context)
-        self.assertEqual(response.context["upcoming_appointment"].count(), 1)
-        self.assertEqual(response.context["past_appointment"].count(), 1)
+        self.assertEqual(len(response.context["upcoming_appointment"]), 1)
+        self.assertEqual(len(response.context["past_appointment"]), 1)
+
+
+class AvailabilityViewTest(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+        self.work_date = timezone.now().date() + timedelta(days=1)
+        ScheduleDayFactory.create(
+            doctor=self.doctor,
+            work_date=self.work_date,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            interval=timedelta(minutes=15),
+        )
+        AppointmentFactory.create(
+            doctor=self.doctor, date=self.work_date, time=time(9, 15)
+        )
+        self.url = reverse("appointments:availability")
+
+    def test_returns_compact_availability(self):
+        response = self.client.get(
+            self.url,
+            {
+                "doctor": self.doctor.pk,
+                "date_from": self.work_date,
+                "date_to": self.work_date + timedelta(days=6),
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("max-age", response["Cache-Control"])
+        doctor_data = response.json()["doctors"][0]
+        self.assertEqual(doctor_data["id"], self.doctor.pk)
+        self.assertEqual(
+            doctor_data["days"],
+            [
+                {
+                    "date": self.work_date.isoformat(),
+                    "start": "09:00",
+                    "interval": 15,
+                    "taken": "0100",
+                }
+            ],
+        )
+
+    def test_rejects_too_long_date_range(self):
+        response = self.client.get(
+            self.url,
+            {
+                "doctor": self.doctor.pk,
+                "date_from": self.work_date,
+                "date_to": self.work_date + timedelta(days=365),
+            },
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
+
+    def test_requires_doctor(self):
+        response = self.client.get(
+            self.url, {"date_from": self.work_date, "date_to": self.work_date}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("doctor", response.json()["errors"])
+
+
+class NextFreeSlotsViewTest(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+        self.specialization = self.doctor.specialization.first()
+        self.work_date = timezone.now().date() + timedelta(days=90)
+        ScheduleDayFactory.create(
+            doctor=self.doctor,
+            work_date=self.work_date,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            interval=timedelta(minutes=15),
+        )
+        AppointmentFactory.create(
+            doctor=self.doctor, date=self.work_date, time=time(9, 0)
+        )
+        self.url = reverse("appointments:next-free-slots")
+
+    def test_returns_earliest_free_slots_of_specialization(self):
+        response = self.client.get(
+            self.url, {"specialization": self.specialization.pk, "limit": 2}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["slots"],
+            [
+                {
+                    "doctor": {"id": self.doctor.pk, "name": str(self.doctor)},
+                    "date": self.work_date.isoformat(),
+                    "time": slot_time,
+                }
+                for slot_time in ("09:15", "09:30")
+            ],
+        )
+
+    def test_returns_free_slots_of_department(self):
+        response = self.client.get(
+            self.url, {"department": self.specialization.department.pk}
+        )
+
+        self.assertEqual(len(response.json()["slots"]), 3)
+
+    def test_requires_doctor_specialization_or_department(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
 
 
 class AppointmentCreateViewTest(TestCase):
@@ -148,6 +282,35 @@ class AppointmentCreateViewTest(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Appointment.objects.count(), 1)
 
+    @patch("appointments.views.AppointmentForm.validate_unique")
+    def test_post_concurrently_booked_slot_is_rejected(self, mock_validate_unique):
+        AppointmentFactory.create(
+            doctor=self.doctor, date=self.work_date, time=time(10, 0)
+        )
+        data = {
+            "doctor": self.doctor.pk,
+            "date": self.work_date,
+            "time": time(10, 0),
+        }
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Appointment.objects.count(), 1)
+        self.assertIn(SLOT_TAKEN_MESSAGE, str(response.context["form"].errors))
+
+    @patch("appointments.views.send_appointment_created_email")
+    def test_post_valid_appointment_queues_email_after_commit(self, mock_task):
+        data = {
+            "doctor": self.doctor.pk,
+            "date": self.work_date,
+            "time": time(10, 0),
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, data)
+
+        appointment = Appointment.objects.get()
+        mock_task.delay_on_commit.assert_called_once_with(appointment.pk)
+
     @patch("appointments.views.logger")
     def test_post_invalid_form_appointment_log_error(self, mock_logger):
         data = {}
@@ -240,6 +403,31 @@ class AppointmentDeleteViewTest(TestCase):
 
         self.assertRedirects(response, reverse("appointments:appointments-list"))
 
+    @patch("appointments.views.send_appointment_deleted_email")
+    def test_delete_appointment_queues_email_after_delete(self, mock_task):
+        self.client.force_login(self.patient.user)
+        url = reverse("appointments:appointment-delete", args=[self.appointment.pk])
+
+        self.client.post(url)
+
+        mock_task.delay_on_commit.assert_called_once_with(
+            self.patient.user.email,
+            str(self.appointment.date),
+            str(self.appointment.time),
+            str(self.doctor),
+        )
+
+    @patch("appointments.views.send_appointment_deleted_email")
+    def test_failed_delete_does_not_queue_email(self, mock_task):
+        self.client.force_login(self.patient.user)
+        url = reverse("appointments:appointment-delete", args=[self.appointment.pk])
+
+        with patch.object(Appointment, "delete", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(url)
+
+        mock_task.delay_on_commit.assert_not_called()
+
 
 class AppointmentNoteViewTest(TestCase):
     def setUp(self):
@@ -21,6 +21,31 @@ urlpatterns = [
         views.AppointmentListView.as_view(),
         name="appointments-list",
     ),
+    path(
+        "api/availability/",
+        views.AvailabilityView.as_view(),
+        name="availability",
+    ),
+    path(
+        "api/next-free-slots/",
+        views.NextFreeSlotsView.as_view(),
+        name="next-free-slots",
+    ),
+    path(
+        "api/autocomplete/",
+        views.AutocompleteView.as_view(),
+        name="autocomplete",
+    ),
+    path(
+        "appointments/export/",
+        views.AppointmentExportView.as_view(),
+        name="appointment-export",
+    ),
+    path(
+        "calendar/<str:token>.ics",
+        views.CalendarFeedView.as_view(),
+        name="calendar-feed",
+    ),
     path(
         "create_appointment/",
         views.AppointmentCreateView.as_view(),
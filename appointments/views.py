@@ -2,12 +2,25 @@ import logging
 from datetime import date, datetime, timedelta
 from typing import Tuple
 
+from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.db.models import Q
+from django.contrib.auth.mixins import (
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    UserPassesTestMixin,
+)
+from django.db import IntegrityError, transaction
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse_lazy
-from django.utils import timezone
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -22,8 +35,25 @@ from django_filters.views import FilterView
 from users.models import Department, Doctor
 
 from .filters import DoctorFilter
-from .forms import AppointmentForm, AppointmentNoteForm
-from .models import Appointment
+from .forms import (
+    SLOT_TAKEN_MESSAGE,
+    AppointmentExportForm,
+    AppointmentForm,
+    AppointmentNoteForm,
+    AutocompleteQueryForm,
+    AvailabilityQueryForm,
+    NextFreeSlotsQueryForm,
+)
+from .models import Appointment, ArchivedAppointment
+from .services.appointment_archive import get_appointment_with_archive
+from .services.appointment_export import iter_appointment_export
+from .services.appointment_pages import get_appointment_pages
+from .services.autocomplete import autocomplete
+from .services.calendar_feed import (
+    CalendarFeed,
+    get_calendar_feed_token,
+    get_calendar_feed_user,
+)
 from .services.doctor_schedule import DoctorScheduleService
 from .services.email_utils import (
     send_appointment_confirmed_email,
@@ -34,6 +64,20 @@ from .services.email_utils import (
 
 logger = logging.getLogger(__name__)
 
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def get_calendar_feed_url(request) -> str:
+    return request.build_absolute_uri(
+        reverse(
+            "appointments:calendar-feed",
+            kwargs={"token": get_calendar_feed_token(request.user)},
+        )
+    )
+
 
 class MainView(TemplateView):
     template_name = "appointments/main.html"
@@ -50,63 +94,77 @@ class MainView(TemplateView):
         return context
 
 
-class UserAppointmentsView(LoginRequiredMixin, ListView):
+class AppointmentPagesMixin:
+    """
+    Upcoming and past appointments are read page by page with keyset cursors,
+    ?fragment=upcoming or ?fragment=past renders only the next page of one list for "load more"
+    """
+
+    items_template_name = None
+    fragments = ("upcoming", "past")
+
+    def get_fragment(self):
+        fragment = self.request.GET.get("fragment")
+        return fragment if fragment in self.fragments else None
+
+    def get_template_names(self):
+        if self.get_fragment():
+            return [self.items_template_name]
+        return super().get_template_names()
+
+    def get_pages_context(self, appointments, archived_appointments):
+        fragment = self.get_fragment()
+        context = get_appointment_pages(
+            appointments,
+            archived_appointments,
+            self.request.GET,
+            settings.APPOINTMENTS_PER_PAGE,
+            fragment,
+        )
+        if not fragment:
+            context["calendar_feed_url"] = get_calendar_feed_url(self.request)
+        return context
+
+
+class UserAppointmentsView(LoginRequiredMixin, AppointmentPagesMixin, ListView):
     template_name = "appointments/user_appointments.html"
+    items_template_name = "appointments/includes/user_appointment_items.html"
     model = Appointment
     context_object_name = "appointments"
     permission_required = "appointments.view_appointment"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        today = timezone.now().date()
-        now_time = timezone.now().time()
-        user = self.request.user
-
-        common_qs = Appointment.objects.select_related("doctor__user").filter(
-            user=user.patient_profile,
-        )
-
-        upcoming_appointment = common_qs.filter(
-            Q(date__gt=today) | Q(date=today, time__gte=now_time)
-        ).order_by("date", "time")
-
-        past_appointment = common_qs.filter(
-            Q(date__lt=today) | Q(date=today, time__lt=now_time)
-        ).order_by("date", "time")
-
-        context["upcoming_appointment"], context["past_appointment"] = (
-            upcoming_appointment,
-            past_appointment,
+        patient = self.request.user.patient_profile
+        context.update(
+            self.get_pages_context(
+                Appointment.objects.select_related("doctor__user").filter(user=patient),
+                ArchivedAppointment.objects.select_related("doctor__user").filter(
+                    user=patient
+                ),
+            )
         )
         return context
 
 
-class DoctorAppointmentsView(PermissionRequiredMixin, ListView):
+class DoctorAppointmentsView(PermissionRequiredMixin, AppointmentPagesMixin, ListView):
     template_name = "appointments/doctor_appointments.html"
+    items_template_name = "appointments/includes/doctor_appointment_items.html"
     model = Appointment
     context_object_name = "appointments"
     permission_required = "appointments.view_appointment"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        today = timezone.now().date()
-        now_time = timezone.now().time()
-        user = self.request.user
-
-        common_qs = Appointment.objects.select_related("user__user").filter(
-            doctor=user.doctor_profile,
-        )
-        upcoming_appointment = common_qs.filter(
-            Q(date__gt=today) | Q(date=today, time__gte=now_time),
-        )
-
-        past_appointment = common_qs.filter(
-            Q(date__lt=today) | Q(date=today, time__lt=now_time),
+        doctor = self.request.user.doctor_profile
+        context.update(
+            self.get_pages_context(
+                Appointment.objects.select_related("user__user").filter(doctor=doctor),
+                ArchivedAppointment.objects.select_related("user__user").filter(
+                    doctor=doctor
+                ),
+            )
         )
-
-        context["upcoming_appointment"] = upcoming_appointment.order_by("date", "time")
-        context["past_appointment"] = past_appointment.order_by("date", "time")
-
         return context
 
 
@@ -117,10 +175,18 @@ class AppointmentListView(ListView, FilterView):
     filterset_class = DoctorFilter
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = (
+            super()
+            .get_queryset()
+            .select_related("user")
+            .order_by("user__last_name", "user__first_name", "id")
+        )
         self.filterset = self.filterset_class(self.request.GET, queryset=queryset)
         return self.filterset.qs
 
+    def get_paginate_by(self, queryset):
+        return settings.APPOINTMENT_LIST_DOCTORS_PER_PAGE
+
     def get_week_param(self) -> Tuple[date, date, str, str]:
         week_param = self.request.GET.get("week")
 
@@ -141,12 +207,16 @@ class AppointmentListView(ListView, FilterView):
 
         start_of_week, end_of_week, previous_week, next_week = self.get_week_param()
 
-        all_doctors = self.get_queryset().select_related("user")
+        page_doctors = context["object_list"]
 
         doctor_week_schedule = DoctorScheduleService.get_doctor_schedule_week(
-            start_of_week, end_of_week, all_doctors
+            start_of_week, end_of_week, page_doctors
         )
 
+        query_params = self.request.GET.copy()
+        query_params.pop(self.page_kwarg, None)
+        context["query_params"] = query_params.urlencode()
+
         context["previous_week"] = previous_week
         context["next_week"] = next_week
         context["start_of_week"] = start_of_week
@@ -157,6 +227,100 @@ class AppointmentListView(ListView, FilterView):
         return context
 
 
+class AvailabilityView(View):
+    def get(self, request, *args, **kwargs):
+        form = AvailabilityQueryForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        doctors = form.cleaned_data["doctor"]
+        date_from = form.cleaned_data["date_from"]
+        date_to = form.cleaned_data["date_to"]
+
+        doctor_availability = DoctorScheduleService.get_doctor_availability(
+            date_from, date_to, [doctor.id for doctor in doctors]
+        )
+
+        response = JsonResponse(
+            {
+                "date_from": date_from.isoformat(),
+                "date_to": date_to.isoformat(),
+                "doctors": [
+                    {
+                        "id": doctor.id,
+                        "name": str(doctor),
+                        "days": doctor_availability[doctor.id],
+                    }
+                    for doctor in doctors
+                ],
+            }
+        )
+        patch_cache_control(
+            response, public=True, max_age=settings.AVAILABILITY_CACHE_MAX_AGE
+        )
+        return response
+
+
+class NextFreeSlotsView(View):
+    def get(self, request, *args, **kwargs):
+        form = NextFreeSlotsQueryForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        slots = DoctorScheduleService.get_next_free_slots(
+            form.get_doctors(),
+            form.cleaned_data["limit"] or 10,
+            form.cleaned_data["date_from"],
+        )
+        doctors = Doctor.objects.select_related("user").in_bulk(
+            {slot["doctor_id"] for slot in slots}
+        )
+
+        response = JsonResponse(
+            {
+                "slots": [
+                    {
+                        "doctor": {
+                            "id": slot["doctor_id"],
+                            "name": str(doctors[slot["doctor_id"]]),
+                        },
+                        "date": slot["date"].isoformat(),
+                        "time": slot["time"].strftime("%H:%M"),
+                    }
+                    for slot in slots
+                ]
+            }
+        )
+        patch_cache_control(
+            response, public=True, max_age=settings.AVAILABILITY_CACHE_MAX_AGE
+        )
+        return response
+
+
+class AutocompleteView(View):
+    """
+    Suggestions for the doctor filter, answered from the in-memory index without touching the schedule
+    """
+
+    def get(self, request, *args, **kwargs):
+        form = AutocompleteQueryForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        response = JsonResponse(
+            {
+                "results": autocomplete(
+                    form.cleaned_data["q"],
+                    form.cleaned_data["limit"] or settings.AUTOCOMPLETE_DEFAULT_LIMIT,
+                )
+            }
+        )
+        patch_cache_control(
+            response, public=True, max_age=settings.AUTOCOMPLETE_CACHE_MAX_AGE
+        )
+        return response
+
+
 class AppointmentCreateView(PermissionRequiredMixin, CreateView):
     model = Appointment
     form_class = AppointmentForm
@@ -166,9 +330,14 @@ class AppointmentCreateView(PermissionRequiredMixin, CreateView):
     def form_valid(self, form):
         appointment = form.save(commit=False)
         appointment.user = self.request.user.patient_profile
-        appointment.save()
+        try:
+            with transaction.atomic():
+                appointment.save()
+        except IntegrityError:
+            form.add_error(None, SLOT_TAKEN_MESSAGE)
+            return self.form_invalid(form)
         self.object = appointment
-        send_appointment_created_email(appointment)
+        send_appointment_created_email.delay_on_commit(appointment.pk)
         return redirect(self.get_success_url())
 
     def get_success_url(self):
@@ -198,9 +367,9 @@ class AppointmentConfirmationView(PermissionRequiredMixin, View):
     def post(self, request, pk, *args, **kwargs):
         appointment = self.get_appointment(pk, request)
         appointment.is_confirmed = True
-        appointment.save()
+        appointment.save(update_fields=["is_confirmed", "modified_at"])
         messages.success(request, "Appointment confirmed.")
-        send_appointment_confirmed_email(appointment)
+        send_appointment_confirmed_email.delay_on_commit(appointment.pk)
         return redirect("appointments:appointments-list")
 
 
@@ -210,9 +379,19 @@ class AppointmentDeleteView(PermissionRequiredMixin, DeleteView):
     # success_url = reverse_lazy("appointments:appointments-list")
     permission_required = "appointments.delete_appointment"
 
+    def get_queryset(self):
+        return super().get_queryset().select_related("user__user", "doctor__user")
+
     def form_valid(self, form):
-        send_appointment_deleted_email(self.object)
-        return super().form_valid(form)
+        # email is queued only once the appointment is deleted, its fields are kept in memory
+        response = super().form_valid(form)
+        send_appointment_deleted_email.delay_on_commit(
+            self.object.user.user.email,
+            str(self.object.date),
+            str(self.object.time),
+            str(self.object.doctor),
+        )
+        return response
 
     def get_success_url(self):
         user = self.request.user
@@ -230,7 +409,9 @@ class AppointmentNoteView(PermissionRequiredMixin, DetailView):
     permission_required = "appointments.view_appointment"
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        return self.filter_by_user(super().get_queryset())
+
+    def filter_by_user(self, queryset):
         user = self.request.user
         if hasattr(user, "patient_profile"):
             return queryset.filter(user=user.patient_profile)
@@ -239,6 +420,16 @@ class AppointmentNoteView(PermissionRequiredMixin, DetailView):
 
         return queryset.none()
 
+    def get_object(self, queryset=None):
+        appointment = get_appointment_with_archive(
+            self.get_queryset(),
+            self.filter_by_user(ArchivedAppointment.objects.all()),
+            pk=self.kwargs["pk"],
+        )
+        if appointment is None:
+            raise Http404("No appointment found matching the query")
+        return appointment
+
 
 class AppointmentNoteUpdateView(PermissionRequiredMixin, UpdateView):
     model = Appointment
@@ -246,6 +437,57 @@ class AppointmentNoteUpdateView(PermissionRequiredMixin, UpdateView):
     template_name = "appointments/appointment_note_form.html"
     permission_required = "appointments.change_appointment"
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        send_note_added_email.delay_on_commit(self.object.pk)
+        return response
+
     def get_success_url(self):
-        send_note_added_email(self.object)
         return reverse_lazy("appointments:doctor-appointments")
+
+
+class AppointmentExportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        form = AppointmentExportForm(request.GET)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
+
+        export_format = form.cleaned_data["format"] or "csv"
+        response = StreamingHttpResponse(
+            iter_appointment_export(export_format, **form.get_filters()),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="appointments.{export_format}"'
+        return response
+
+
+class CalendarFeedView(View):
+    """
+    iCalendar subscription feed, calendar clients polling with If-None-Match
+    get 304 from the aggregate queries only
+    """
+
+    def get(self, request, token, *args, **kwargs):
+        user = get_calendar_feed_user(token)
+        if user is None or not (
+            hasattr(user, "doctor_profile") or hasattr(user, "patient_profile")
+        ):
+            raise Http404
+
+        feed = CalendarFeed(user)
+        etag = quote_etag(feed.get_state())
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                feed.render(), content_type="text/calendar; charset=utf-8"
+            )
+            response["Content-Disposition"] = 'inline; filename="appointments.ics"'
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
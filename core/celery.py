@@ -30,5 +30,13 @@ app.conf.beat_schedule = {
         "task": "schedules.services.schedule_clearing.delete_older_schedules",
         "schedule": crontab(hour="2", minute="00", day_of_week="1"),
     },
+    "archive_old_appointments": {
+        "task": "appointments.services.appointment_archive.archive_older_appointments",
+        "schedule": crontab(hour="2", minute="30"),
+    },
+    "delete_old_appointments": {
+        "task": "appointments.services.appointment_clearing.delete_older_appointments",
+        "schedule": crontab(hour="3", minute="00", day_of_week="1"),
+    },
 }
 app.conf.timezone = "CET"
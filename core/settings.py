@@ -110,6 +110,34 @@ else:
     }
 
 
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+# permissions and schedules are invalidated in the cache, so every worker has to share it,
+# read here because the test runner switches DEBUG off later
+SHARED_CACHE_REQUIRED = env.bool("SHARED_CACHE_REQUIRED", default=not DEBUG)
+
+DOCTOR_SCHEDULE_CACHE_TIMEOUT = 60 * 60
+
+APPOINTMENT_LIST_DOCTORS_PER_PAGE = env.int(
+    "APPOINTMENT_LIST_DOCTORS_PER_PAGE", default=10
+)
+
+APPOINTMENTS_PER_PAGE = env.int("APPOINTMENTS_PER_PAGE", default=20)
+
+AVAILABILITY_MAX_DAYS = 31
+AVAILABILITY_MAX_DOCTORS = 50
+AVAILABILITY_CACHE_MAX_AGE = 60
+NEXT_FREE_SLOTS_MAX_LIMIT = 50
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+AUTOCOMPLETE_CACHE_MAX_AGE = 30
+
+SCHEDULE_TEMPLATE_MAX_DAYS = 366
+
+CALENDAR_FEED_PAST_DAYS = 30
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -164,6 +192,14 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
 
+# ModelBackend still resolves sessions created before the permission cache was deployed
+AUTHENTICATION_BACKENDS = [
+    "users.backends.CachedPermissionsBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+DOCTOR_PROFILE_CACHE_TIMEOUT = 60 * 60
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
 
 CRISPY_TEMPLATE_PACK = "bootstrap4"
@@ -185,6 +221,28 @@ DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL")
 
 CELERY_BROKER_URL = env("CELERY_BROKER")
 CELERY_RESULT_BACKEND = env("CELERY_BACKEND")
+# modules with tasks run by beat, they are not named tasks.py so autodiscovery misses them
+CELERY_IMPORTS = (
+    "appointments.services.appointment_archive",
+    "appointments.services.appointment_clearing",
+    "appointments.services.email_utils",
+    "schedules.services.schedule_clearing",
+)
+
+REMINDER_BATCH_SIZE = 200
+REMINDER_CLAIM_TIMEOUT = 60 * 15
+# failed reminders are sent again by a delayed batch until they reach the attempts limit
+REMINDER_MAX_ATTEMPTS = 3
+REMINDER_RETRY_DELAY = 60 * 10
+
+SCHEDULE_RETENTION_DAYS = 30
+# older past appointments are moved from the hot table to the archive table
+APPOINTMENT_ARCHIVE_AFTER_DAYS = env.int("APPOINTMENT_ARCHIVE_AFTER_DAYS", default=365)
+# past appointments are kept forever unless set
+APPOINTMENT_RETENTION_DAYS = env.int("APPOINTMENT_RETENTION_DAYS", default=None)
+RETENTION_BATCH_SIZE = 1000
+# deleted rows are archived as gzipped NDJSON files in this directory when set
+RETENTION_ARCHIVE_DIR = env("RETENTION_ARCHIVE_DIR", default=None)
 
 INTERNAL_IPS = [
     "127.0.0.1",
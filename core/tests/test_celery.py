@@ -5,7 +5,7 @@ from django.test import TestCase, override_settings
 from django.utils.timezone import now
 
 from appointments.factories import AppointmentFactory
-from appointments.services.email_utils import send_upcoming_appointment_reminders
+from appointments.services.email_utils import send_appointment_reminder_batch
 
 
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
@@ -16,10 +16,10 @@ class SendAppointmentReminderTaskTest(TestCase):
             is_confirmed=True,
         )
 
-    def test_send_upcoming_appointment_reminders_sends_email(self):
+    def test_send_appointment_reminder_batch_sends_email(self):
         self.assertEqual(len(mail.outbox), 0)
 
-        send_upcoming_appointment_reminders()
+        send_appointment_reminder_batch([self.appointment.id])
 
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("Upcoming appointment reminder", mail.outbox[0].subject)
@@ -1,20 +1,30 @@
-from datetime import date, datetime, time, timedelta
+from datetime import date, time, timedelta
 
 from bootstrap_datepicker_plus.widgets import DatePickerInput
 from django import forms
+from django.conf import settings
 
-from .models import ScheduleDay
+from users.models import Doctor
 
+from .models import ScheduleDay
+from .services.schedule_import import IMPORT_FORMATS
+from .services.schedule_templates import create_schedule_days, expand_schedule_template
+from .services.schedule_validation import (
+    ProposedScheduleDay,
+    find_overlaps,
+    validate_interval,
+    validate_time_range,
+)
 
-def validate_interval(interval):
-    if interval % 5 != 0:
-        raise forms.ValidationError(
-            "The appointment duration must be a multiple of 5 minutes."
-        )
-    if interval < 5 or interval > 60:
-        raise forms.ValidationError(
-            "The appointment duration must be between 5 and 60 minutes."
-        )
+WEEKDAY_CHOICES = [
+    (0, "Monday"),
+    (1, "Tuesday"),
+    (2, "Wednesday"),
+    (3, "Thursday"),
+    (4, "Friday"),
+    (5, "Saturday"),
+    (6, "Sunday"),
+]
 
 
 class ScheduleDayForm(forms.ModelForm):
@@ -92,44 +102,166 @@ class ScheduleDayForm(forms.ModelForm):
                 raise forms.ValidationError(f"The field '{field}' must be filled out.")
 
     def _validate_time_range(self, cleaned_data):
-        work_date = cleaned_data.get("work_date")
-        start_time = cleaned_data.get("start_time")
-        end_time = cleaned_data.get("end_time")
-        interval = cleaned_data.get("interval")
+        validate_time_range(
+            cleaned_data.get("start_time"),
+            cleaned_data.get("end_time"),
+            cleaned_data.get("interval"),
+        )
+
+    def _validate_no_overlap(self, cleaned_data):
+        row = ProposedScheduleDay(
+            self.doctor.pk if self.doctor else self.instance.doctor_id,
+            cleaned_data.get("work_date"),
+            cleaned_data.get("start_time"),
+            cleaned_data.get("end_time"),
+            cleaned_data.get("interval"),
+        )
+        exclude_ids = [self.instance.pk] if self.instance.pk else []
 
-        start_datetime = datetime.combine(work_date, start_time)
-        end_datetime = datetime.combine(work_date, end_time)
+        errors = find_overlaps([row], exclude_ids=exclude_ids)
+        if errors:
+            raise forms.ValidationError(errors[0])
+
+
+class ScheduleTemplateForm(forms.Form):
+    date_from = forms.DateField(
+        label="From",
+        widget=DatePickerInput(options={"format": "YYYY/MM/DD"}),
+    )
+    date_to = forms.DateField(
+        label="Until",
+        widget=DatePickerInput(options={"format": "YYYY/MM/DD"}),
+    )
+    weekdays = forms.TypedMultipleChoiceField(
+        label="Weekdays",
+        choices=WEEKDAY_CHOICES,
+        coerce=int,
+        widget=forms.CheckboxSelectMultiple,
+        initial=[0, 1, 2, 3, 4],
+    )
+    start_time = forms.TimeField(
+        label="Start Time",
+        widget=forms.TimeInput(attrs={"type": "time", "step": "300"}),
+        initial=time(8, 0),
+    )
+    end_time = forms.TimeField(
+        label="End Time",
+        widget=forms.TimeInput(attrs={"type": "time", "step": "300"}),
+        initial=time(14, 0),
+    )
+    interval = forms.IntegerField(
+        label="Appointment Duration (minutes)",
+        widget=forms.NumberInput(attrs={"step": 5, "min": 5, "max": 60}),
+        validators=[validate_interval],
+        initial=15,
+    )
+    skip_overlapping = forms.BooleanField(
+        label="Skip days overlapping an existing schedule",
+        required=False,
+    )
 
-        if start_datetime > end_datetime:
-            raise forms.ValidationError("End time is before start time.")
+    def __init__(self, *args, **kwargs):
+        self.doctor = kwargs.pop("doctor", None)
+        super().__init__(*args, **kwargs)
+        self.schedule_days = []
 
-        duration = end_datetime - start_datetime
-        if interval > duration:
+    def clean_interval(self):
+        interval = self.cleaned_data["interval"]
+        return timedelta(minutes=interval)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if self.errors:
+            return cleaned_data
+
+        date_from = cleaned_data["date_from"]
+        date_to = cleaned_data["date_to"]
+        if date_from > date_to:
+            raise forms.ValidationError("End date is before start date.")
+        if (date_to - date_from).days >= settings.SCHEDULE_TEMPLATE_MAX_DAYS:
             raise forms.ValidationError(
-                "The interval is longer than the specified time range."
+                f"Template can not span more than {settings.SCHEDULE_TEMPLATE_MAX_DAYS} days."
             )
+        validate_time_range(
+            cleaned_data["start_time"],
+            cleaned_data["end_time"],
+            cleaned_data["interval"],
+        )
 
-        if duration % interval != timedelta(0):
-            suggested_end_time = (
-                start_datetime + (duration // interval) * interval
-            ).time()
+        schedule_days = expand_schedule_template(
+            self.doctor,
+            date_from,
+            date_to,
+            cleaned_data["weekdays"],
+            cleaned_data["start_time"],
+            cleaned_data["end_time"],
+            cleaned_data["interval"],
+        )
+        rows = [
+            ProposedScheduleDay.from_schedule_day(schedule_day)
+            for schedule_day in schedule_days
+        ]
+        overlapping_dates = {rows[index].work_date for index in find_overlaps(rows)}
+        if overlapping_dates and not cleaned_data["skip_overlapping"]:
             raise forms.ValidationError(
-                f"The interval does not fit within the specified time range. Suggested end time: {suggested_end_time}."
+                "The template overlaps with existing schedule on: "
+                + ", ".join(str(day) for day in sorted(overlapping_dates))
             )
 
-    def _validate_no_overlap(self, cleaned_data):
-        work_date = cleaned_data.get("work_date")
-        start_time = cleaned_data.get("start_time")
-        end_time = cleaned_data.get("end_time")
-
-        overlapping_schedules = ScheduleDay.objects.filter(
-            doctor=self.doctor,
-            work_date=work_date,
-            start_time__lte=end_time,
-            end_time__gte=start_time,
+        self.schedule_days = [
+            schedule_day
+            for schedule_day in schedule_days
+            if schedule_day.work_date not in overlapping_dates
+        ]
+        if not self.schedule_days:
+            raise forms.ValidationError("The template does not create any work day.")
+        return cleaned_data
+
+    def save(self):
+        return create_schedule_days(self.schedule_days)
+
+
+class ScheduleImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV with columns doctor, work_date, start_time, end_time, interval or ICS file"
+    )
+    format = forms.ChoiceField(
+        choices=[("", "Detect from file extension")]
+        + [(import_format, import_format.upper()) for import_format in IMPORT_FORMATS],
+        required=False,
+    )
+    doctor = forms.ModelChoiceField(
+        queryset=Doctor.objects.select_related("user"),
+        required=False,
+        help_text="Required for ICS files, overrides doctor column of CSV files",
+    )
+    interval = forms.IntegerField(
+        label="Appointment Duration (minutes)",
+        initial=15,
+        validators=[validate_interval],
+        help_text="Used for rows and events without their own interval",
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.doctor = kwargs.pop("doctor", None)
+        super().__init__(*args, **kwargs)
+        if self.doctor:
+            del self.fields["doctor"]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        uploaded_file = cleaned_data.get("file")
+        if not uploaded_file:
+            return cleaned_data
+
+        import_format = (
+            cleaned_data.get("format") or uploaded_file.name.rsplit(".", 1)[-1].lower()
         )
+        if import_format not in IMPORT_FORMATS:
+            raise forms.ValidationError("Upload a CSV or ICS file.")
+        cleaned_data["format"] = import_format
 
-        if overlapping_schedules.exists():
-            raise forms.ValidationError(
-                "The specified schedule overlaps with an existing one. Please adjust the hours."
-            )
+        cleaned_data["doctor"] = self.doctor or cleaned_data.get("doctor")
+        if import_format == "ics" and not cleaned_data["doctor"]:
+            raise forms.ValidationError("Choose a doctor for ICS file.")
+        return cleaned_data
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from schedules.services.schedule_import import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    import_schedule_days,
+    parse_csv_lines,
+    parse_ics_lines,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports doctors' working days from CSV or ICS file, validating and inserting "
+        "them in batches and reporting errors of every rejected line."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="Taken from file extension by default",
+        )
+        parser.add_argument(
+            "--doctor", type=int, help="Doctor id, required for ICS files"
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=15,
+            help="Appointment duration in minutes, used when a row does not give one",
+        )
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        import_format = options["format"] or path.suffix.lstrip(".").lower()
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError(
+                f"Unknown format, use one of: {', '.join(IMPORT_FORMATS)}"
+            )
+        if import_format == "ics" and not options["doctor"]:
+            raise CommandError("--doctor is required for ICS files")
+
+        with path.open(newline="", encoding="utf-8") as lines:
+            if import_format == "csv":
+                parsed_lines = parse_csv_lines(
+                    lines, options["doctor"], options["interval"]
+                )
+            else:
+                parsed_lines = parse_ics_lines(
+                    lines, options["doctor"], options["interval"]
+                )
+            created_count, errors = import_schedule_days(
+                parsed_lines, options["batch_size"]
+            )
+
+        for line_number, messages in errors:
+            self.stdout.write(
+                self.style.ERROR(f"Line {line_number}: {' '.join(messages)}")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created_count} work days, rejected {len(errors)} lines."
+            )
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.3 on 2026-10-18 08:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("schedules", "0002_initial"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="scheduleday",
+            index=models.Index(
+                fields=["doctor", "work_date", "start_time", "end_time"],
+                name="scheduleday_doctor_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scheduleday",
+            index=models.Index(
+                fields=["doctor", "modified_at"], name="scheduleday_doctor_mod_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scheduleday",
+            index=models.Index(fields=["work_date"], name="scheduleday_work_date_idx"),
+        ),
+        migrations.AlterField(
+            model_name="scheduleday",
+            name="doctor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="schedule",
+                to="users.doctor",
+            ),
+        ),
+    ]
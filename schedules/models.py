@@ -2,8 +2,12 @@ from django.db import models
 
 
 class ScheduleDay(models.Model):
+    # doctor lookups are served by scheduleday_doctor_date_idx
     doctor = models.ForeignKey(
-        "users.Doctor", on_delete=models.CASCADE, related_name="schedule"
+        "users.Doctor",
+        on_delete=models.CASCADE,
+        related_name="schedule",
+        db_index=False,
     )
     work_date = models.DateField(help_text="Specific date when the doctor is available")
     start_time = models.TimeField(help_text="Start time for this schedule")
@@ -16,6 +20,16 @@ class ScheduleDay(models.Model):
 
     class Meta:
         ordering = ["doctor", "work_date", "start_time"]
+        indexes = [
+            models.Index(
+                fields=["doctor", "work_date", "start_time", "end_time"],
+                name="scheduleday_doctor_date_idx",
+            ),
+            models.Index(
+                fields=["doctor", "modified_at"], name="scheduleday_doctor_mod_idx"
+            ),
+            models.Index(fields=["work_date"], name="scheduleday_work_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.work_date} {self.start_time}-{self.end_time}"
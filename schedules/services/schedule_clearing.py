@@ -1,14 +1,115 @@
+import gzip
+import json
+import logging
+import os
+from contextlib import contextmanager
 from datetime import timedelta
+from typing import IO, Callable, Iterator
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import CASCADE, DO_NOTHING, QuerySet
 from django.utils.timezone import now
 
+from appointments.services.schedule_cache import bump_schedule_version
+from core.celery import app
+
 from ..models import ScheduleDay
 
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def open_archive(name: str | None) -> Iterator[IO[str] | None]:
+    """
+    Opens new gzipped NDJSON file in RETENTION_ARCHIVE_DIR, yields None when archiving is turned off
+    """
+    if not name or not settings.RETENTION_ARCHIVE_DIR:
+        yield None
+        return
+
+    os.makedirs(settings.RETENTION_ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(
+        settings.RETENTION_ARCHIVE_DIR,
+        f"{name}-{now().strftime('%Y%m%dT%H%M%S')}.ndjson.gz",
+    )
+    with gzip.open(path, "at", encoding="utf-8") as archive:
+        yield archive
+
+
+def delete_without_signals(queryset: QuerySet) -> int:
+    """
+    Deletes rows and the rows cascading from them with one query per table, skipping Django's
+    deletion collector, so no delete signals are sent and nothing is loaded into memory
+    """
+    for relation in queryset.model._meta.related_objects:
+        if relation.on_delete is DO_NOTHING:
+            continue
+        if relation.on_delete is not CASCADE:
+            raise ValueError(f"{relation} is not deleted in cascade")
+        delete_without_signals(
+            relation.related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": queryset.values("pk")}
+            )
+        )
+    return queryset._raw_delete(queryset.db)
+
 
-def delete_older_schedules():
+def delete_in_batches(
+    queryset: QuerySet,
+    archive_name: str | None = None,
+    batch_size: int = None,
+    before_delete: Callable[[QuerySet], None] = None,
+) -> int:
     """
-    Configured as periodic task, is done everyday at 1 am in the night
+    Deletes rows in primary key batches, each one in its own short transaction,
+    rows are written to the archive and passed to before_delete before they are deleted,
+    delete signals are not sent, so before_delete has to do whatever their receivers would
     """
-    date_back = now().date() - timedelta(days=30)
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    model = queryset.model
+    deleted_count, last_pk = 0, 0
+
+    with open_archive(archive_name) as archive:
+        while True:
+            batch_ids = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch_ids:
+                break
+
+            with transaction.atomic():
+                batch = model.objects.filter(pk__in=batch_ids)
+                if archive:
+                    for row in batch.values().iterator():
+                        archive.write(json.dumps(row, default=str) + "\n")
+                    archive.flush()
+                if before_delete:
+                    before_delete(batch)
+                delete_without_signals(batch)
+
+            deleted_count += len(batch_ids)
+            last_pk = batch_ids[-1]
+    return deleted_count
+
+
+def bump_schedule_versions(schedule_days: QuerySet):
+    for doctor_id in schedule_days.values_list("doctor_id", flat=True).distinct():
+        bump_schedule_version(doctor_id)
+
+
+@app.task
+def delete_older_schedules(batch_size: int = None) -> int:
+    """
+    Configured as periodic task, is done every monday at 2 am in the night
+    """
+    date_back = now().date() - timedelta(days=settings.SCHEDULE_RETENTION_DAYS)
     old_schedules = ScheduleDay.objects.filter(work_date__lt=date_back)
-    old_schedules.delete()
+    deleted_count = delete_in_batches(
+        old_schedules, "schedule_days", batch_size, bump_schedule_versions
+    )
+
+    logger.info(f"Deleted {deleted_count} schedule days older than {date_back}")
+    return deleted_count
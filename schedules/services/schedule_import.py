@@ -0,0 +1,145 @@
+import csv
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from django.utils import timezone
+
+from users.models import Doctor
+
+from ..models import ScheduleDay
+from .schedule_templates import create_schedule_days
+from .schedule_validation import ProposedScheduleDay, validate_schedule_days
+
+IMPORT_FORMATS = ("csv", "ics")
+IMPORT_BATCH_SIZE = 500
+CSV_COLUMNS = ("doctor", "work_date", "start_time", "end_time", "interval")
+
+# every parsed line is either a proposed schedule day or an error message
+ParsedLine = Tuple[int, ProposedScheduleDay | str]
+
+
+def parse_csv_lines(
+    lines: Iterable[str], doctor_id: int | None = None, interval: int | None = None
+) -> Iterator[ParsedLine]:
+    """
+    Columns: doctor (id), work_date (YYYY-MM-DD), start_time and end_time (HH:MM), interval (minutes),
+    doctor and interval columns can be left out when given as arguments
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        try:
+            yield reader.line_num, ProposedScheduleDay(
+                doctor_id or int(row["doctor"]),
+                date.fromisoformat(row["work_date"].strip()),
+                time.fromisoformat(row["start_time"].strip()),
+                time.fromisoformat(row["end_time"].strip()),
+                timedelta(minutes=int(row.get("interval") or interval)),
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            yield reader.line_num, (
+                f"Invalid row, expected columns: {', '.join(CSV_COLUMNS)}."
+            )
+
+
+def iter_unfolded_lines(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    Joins folded iCalendar lines, yielding number of the line where each one starts
+    """
+    current, current_number = None, 0
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current_number, current
+        current, current_number = line, number
+    if current is not None:
+        yield current_number, current
+
+
+def parse_ics_datetime(value: str) -> datetime:
+    parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return timezone.localtime(parsed.replace(tzinfo=dt_timezone.utc))
+    return parsed
+
+
+def parse_ics_lines(
+    lines: Iterable[str], doctor_id: int, interval: int
+) -> Iterator[ParsedLine]:
+    """
+    Every VEVENT is one working day, interval is taken from X-APPOINTMENT-INTERVAL property if present.
+    UTC times are converted to local time, times with TZID are taken as local
+    """
+    event = None
+    for number, line in iter_unfolded_lines(lines):
+        name, _, value = line.partition(":")
+        name = name.split(";")[0].upper()
+        if name == "BEGIN" and value == "VEVENT":
+            event = {"line": number}
+        elif name == "END" and value == "VEVENT" and event is not None:
+            yield event["line"], parse_ics_event(event, doctor_id, interval)
+            event = None
+        elif event is not None:
+            event[name] = value
+
+
+def parse_ics_event(
+    event: Dict[str, str], doctor_id: int, interval: int
+) -> ProposedScheduleDay | str:
+    try:
+        start = parse_ics_datetime(event["DTSTART"])
+        end = parse_ics_datetime(event["DTEND"])
+        event_interval = int(event.get("X-APPOINTMENT-INTERVAL") or interval)
+    except (KeyError, TypeError, ValueError):
+        return "Event needs DTSTART and DTEND with date and time."
+    if start.date() != end.date():
+        return "Event has to start and end on the same day."
+    return ProposedScheduleDay(
+        doctor_id,
+        start.date(),
+        start.time(),
+        end.time(),
+        timedelta(minutes=event_interval),
+    )
+
+
+def import_schedule_days(
+    parsed_lines: Iterable[ParsedLine], batch_size: int = IMPORT_BATCH_SIZE
+) -> Tuple[int, List[Tuple[int, List[str]]]]:
+    """
+    Validates and inserts parsed lines batch by batch, so a file is never loaded whole,
+    rows of later batches are checked against already inserted ones.
+    Returns number of created schedule days and errors of every rejected line
+    """
+    created_count, errors = 0, []
+    parsed_lines = iter(parsed_lines)
+    while batch := list(islice(parsed_lines, batch_size)):
+        rows, line_numbers = [], []
+        for line_number, parsed in batch:
+            if isinstance(parsed, str):
+                errors.append((line_number, [parsed]))
+            else:
+                rows.append(parsed)
+                line_numbers.append(line_number)
+
+        existing_doctor_ids = set(
+            Doctor.objects.filter(pk__in={row.doctor_id for row in rows}).values_list(
+                "pk", flat=True
+            )
+        )
+        row_errors = validate_schedule_days(rows)
+        schedule_days = []
+        for index, row in enumerate(rows):
+            if row.doctor_id not in existing_doctor_ids:
+                row_errors.setdefault(index, []).insert(0, "Doctor does not exist.")
+            if index in row_errors:
+                errors.append((line_numbers[index], row_errors[index]))
+            else:
+                schedule_days.append(ScheduleDay(**row._asdict()))
+
+        created_count += len(create_schedule_days(schedule_days))
+    return created_count, sorted(errors)
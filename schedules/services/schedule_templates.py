@@ -0,0 +1,45 @@
+from datetime import date, time, timedelta
+from typing import Iterable, List
+
+from django.db import transaction
+
+from users.models import Doctor
+
+from ..models import ScheduleDay
+from ..signals import schedule_days_bulk_created
+
+
+def expand_schedule_template(
+    doctor: Doctor,
+    date_from: date,
+    date_to: date,
+    weekdays: Iterable[int],
+    start_time: time,
+    end_time: time,
+    interval: timedelta,
+) -> List[ScheduleDay]:
+    """
+    Returns unsaved schedule days for every date between date_from and date_to falling on given weekdays
+    """
+    weekdays = set(weekdays)
+    return [
+        ScheduleDay(
+            doctor=doctor,
+            work_date=work_date,
+            start_time=start_time,
+            end_time=end_time,
+            interval=interval,
+        )
+        for work_date in (
+            date_from + timedelta(days=day)
+            for day in range((date_to - date_from).days + 1)
+        )
+        if work_date.weekday() in weekdays
+    ]
+
+
+def create_schedule_days(schedule_days: List[ScheduleDay]) -> List[ScheduleDay]:
+    with transaction.atomic():
+        created = ScheduleDay.objects.bulk_create(schedule_days, batch_size=500)
+        schedule_days_bulk_created.send(sender=ScheduleDay, schedule_days=created)
+    return created
@@ -0,0 +1,132 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+from django.core.exceptions import ValidationError
+
+from ..models import ScheduleDay
+
+OVERLAP_EXISTING_MESSAGE = (
+    "The specified schedule overlaps with an existing one. Please adjust the hours."
+)
+
+
+class ProposedScheduleDay(NamedTuple):
+    doctor_id: int | None
+    work_date: date
+    start_time: time
+    end_time: time
+    interval: timedelta
+
+    @classmethod
+    def from_schedule_day(cls, schedule_day: ScheduleDay) -> "ProposedScheduleDay":
+        return cls(
+            schedule_day.doctor_id,
+            schedule_day.work_date,
+            schedule_day.start_time,
+            schedule_day.end_time,
+            schedule_day.interval,
+        )
+
+
+def validate_interval(interval):
+    if interval % 5 != 0:
+        raise ValidationError(
+            "The appointment duration must be a multiple of 5 minutes."
+        )
+    if interval < 5 or interval > 60:
+        raise ValidationError(
+            "The appointment duration must be between 5 and 60 minutes."
+        )
+
+
+def validate_time_range(start_time, end_time, interval):
+    start_datetime = datetime.combine(date.today(), start_time)
+    end_datetime = datetime.combine(date.today(), end_time)
+
+    if start_datetime > end_datetime:
+        raise ValidationError("End time is before start time.")
+
+    duration = end_datetime - start_datetime
+    if interval > duration:
+        raise ValidationError("The interval is longer than the specified time range.")
+
+    if duration % interval != timedelta(0):
+        suggested_end_time = (start_datetime + (duration // interval) * interval).time()
+        raise ValidationError(
+            f"The interval does not fit within the specified time range. Suggested end time: {suggested_end_time}."
+        )
+
+
+def overlaps(first_start, first_end, second_start, second_end) -> bool:
+    # touching schedules count as overlapping, as they always did in ScheduleDayForm
+    return first_start <= second_end and first_end >= second_start
+
+
+def find_overlaps(
+    rows: Sequence[ProposedScheduleDay], exclude_ids: Iterable[int] = ()
+) -> Dict[int, List[str]]:
+    """
+    Returns errors of rows overlapping existing schedule days or an earlier row of the batch,
+    existing schedule days of all rows are read with one query
+    """
+    if not rows:
+        return {}
+
+    existing_days = (
+        ScheduleDay.objects.filter(
+            doctor_id__in={row.doctor_id for row in rows},
+            work_date__in={row.work_date for row in rows},
+        )
+        .exclude(pk__in=list(exclude_ids))
+        .values_list("doctor_id", "work_date", "start_time", "end_time")
+    )
+    existing_by_day = defaultdict(list)
+    for doctor_id, work_date, start_time, end_time in existing_days:
+        existing_by_day[(doctor_id, work_date)].append((start_time, end_time))
+
+    errors = defaultdict(list)
+    rows_by_day = defaultdict(list)
+    for index, row in enumerate(rows):
+        day_key = (row.doctor_id, row.work_date)
+        if any(
+            overlaps(row.start_time, row.end_time, start_time, end_time)
+            for start_time, end_time in existing_by_day[day_key]
+        ):
+            errors[index].append(OVERLAP_EXISTING_MESSAGE)
+
+        for other_index in rows_by_day[day_key]:
+            other = rows[other_index]
+            if overlaps(row.start_time, row.end_time, other.start_time, other.end_time):
+                errors[index].append(
+                    f"The specified schedule overlaps with row {other_index + 1}."
+                )
+                break
+        rows_by_day[day_key].append(index)
+    return dict(errors)
+
+
+def validate_schedule_days(
+    rows: Sequence[ProposedScheduleDay], exclude_ids: Iterable[int] = ()
+) -> Dict[int, List[str]]:
+    """
+    Returns errors of every invalid row, keyed by its index in the batch,
+    in constant number of queries regardless of the batch size
+    """
+    errors = defaultdict(list)
+    valid_indexes = []
+    for index, row in enumerate(rows):
+        try:
+            validate_interval(row.interval // timedelta(minutes=1))
+            validate_time_range(row.start_time, row.end_time, row.interval)
+        except ValidationError as error:
+            errors[index].extend(error.messages)
+        else:
+            valid_indexes.append(index)
+
+    overlap_errors = find_overlaps(
+        [rows[index] for index in valid_indexes], exclude_ids
+    )
+    for batch_index, messages in overlap_errors.items():
+        errors[valid_indexes[batch_index]].extend(messages)
+    return dict(errors)
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# bulk_create does not send post_save, so bulk writers of ScheduleDay send this instead
+# with the created rows as "schedule_days"
+schedule_days_bulk_created = Signal()
@@ -112,6 +112,19 @@ class ScheduleDayFormTests(TestCase):
         self.assertFalse(form.is_valid())
         self.assertIn("overlaps", form.errors["__all__"][0])
 
+    def test_updated_schedule_does_not_overlap_itself(self):
+        schedule = ScheduleDay.objects.create(
+            doctor=self.doctor,
+            work_date=date.today(),
+            start_time=time(9, 0),
+            end_time=time(11, 0),
+            interval=timedelta(minutes=15),
+        )
+
+        data = self.get_valid_data(start_time=time(10, 0), end_time=time(12, 0))
+        form = ScheduleDayForm(data=data, instance=schedule)
+        self.assertTrue(form.is_valid())
+
     def test_defaults_set_from_last_schedule(self):
         ScheduleDay.objects.create(
             doctor=self.doctor,
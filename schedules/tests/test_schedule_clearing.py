@@ -1,8 +1,14 @@
+import gzip
+import json
+import os
 from datetime import timedelta
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.timezone import now
 
+from appointments.models import Slot
 from schedules.factories import ScheduleDayFactory
 from schedules.models import ScheduleDay
 from schedules.services.schedule_clearing import delete_older_schedules
@@ -22,3 +28,47 @@ class DeleteOlderSchedulesTest(TestCase):
         schedules = ScheduleDay.objects.all()
         self.assertEqual(schedules.count(), 1)
         self.assertEqual(schedules.first().id, self.recent_schedule.id)
+
+    def test_delete_old_schedules_in_batches(self):
+        ScheduleDayFactory.create_batch(4, work_date=now().date() - timedelta(days=60))
+
+        deleted_count = delete_older_schedules(batch_size=2)
+
+        self.assertEqual(deleted_count, 5)
+        self.assertEqual(list(ScheduleDay.objects.all()), [self.recent_schedule])
+        self.assertFalse(
+            Slot.objects.exclude(schedule_day=self.recent_schedule).exists()
+        )
+
+    def test_delete_old_schedules_is_celery_task(self):
+        self.assertEqual(
+            delete_older_schedules.name,
+            "schedules.services.schedule_clearing.delete_older_schedules",
+        )
+        self.assertEqual(delete_older_schedules.apply().get(), 1)
+
+    def test_delete_does_not_send_signals_per_row(self):
+        ScheduleDayFactory.create_batch(
+            3, doctor=self.old_schedule.doctor, work_date=self.old_schedule.work_date
+        )
+
+        with patch(
+            "schedules.services.schedule_clearing.bump_schedule_version"
+        ) as bump, patch("appointments.signals.bump_schedule_version") as signal_bump:
+            self.assertEqual(delete_older_schedules(), 4)
+
+        bump.assert_called_once_with(self.old_schedule.doctor_id)
+        signal_bump.assert_not_called()
+
+    def test_old_schedules_are_archived(self):
+        with TemporaryDirectory() as archive_dir:
+            with override_settings(RETENTION_ARCHIVE_DIR=archive_dir):
+                delete_older_schedules()
+
+            (archive_name,) = os.listdir(archive_dir)
+            with gzip.open(os.path.join(archive_dir, archive_name), "rt") as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertTrue(archive_name.startswith("schedule_days-"))
+        self.assertEqual([row["id"] for row in rows], [self.old_schedule.id])
+        self.assertEqual(rows[0]["work_date"], str(self.old_schedule.work_date))
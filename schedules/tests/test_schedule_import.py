@@ -0,0 +1,172 @@
+from datetime import date, time, timedelta
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from appointments.models import Slot
+from schedules.models import ScheduleDay
+from schedules.services.schedule_import import (
+    import_schedule_days,
+    parse_csv_lines,
+    parse_ics_lines,
+)
+from schedules.services.schedule_validation import ProposedScheduleDay
+from users.factories import DoctorFactory
+
+CSV_FILE = """doctor,work_date,start_time,end_time,interval
+{doctor},2030-01-07,08:00,10:00,15
+{doctor},2030-01-08,08:00,10:00,15
+{doctor},2030-01-07,09:00,11:00,15
+{doctor},2030-01-09,08:00,10:10,15
+{doctor},not a date,08:00,10:00,15
+0,2030-01-10,08:00,10:00,15
+"""
+
+ICS_FILE = (
+    "BEGIN:VCALENDAR\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART:20300107T080000Z\r\n"
+    "DTEND:20300107T100000Z\r\n"
+    "SUMMARY:Office\r\n"
+    "  hours\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART;TZID=Europe/Warsaw:20300108T120000\r\n"
+    "DTEND;TZID=Europe/Warsaw:20300108T130000\r\n"
+    "X-APPOINTMENT-INTERVAL:20\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "DTSTART:20300109T230000\r\n"
+    "DTEND:20300110T010000\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+class ScheduleImportServiceTests(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+
+    def test_parse_csv_lines(self):
+        parsed_lines = list(
+            parse_csv_lines(StringIO(CSV_FILE.format(doctor=self.doctor.pk)))
+        )
+
+        self.assertEqual(
+            parsed_lines[0],
+            (
+                2,
+                ProposedScheduleDay(
+                    self.doctor.pk,
+                    date(2030, 1, 7),
+                    time(8, 0),
+                    time(10, 0),
+                    timedelta(minutes=15),
+                ),
+            ),
+        )
+        self.assertIsInstance(parsed_lines[4][1], str)
+
+    def test_parse_ics_lines(self):
+        parsed_lines = list(parse_ics_lines(StringIO(ICS_FILE), self.doctor.pk, 15))
+
+        self.assertEqual([line_number for line_number, _ in parsed_lines], [2, 8, 13])
+        self.assertEqual(
+            parsed_lines[1][1],
+            ProposedScheduleDay(
+                self.doctor.pk,
+                date(2030, 1, 8),
+                time(12, 0),
+                time(13, 0),
+                timedelta(minutes=20),
+            ),
+        )
+        self.assertEqual(
+            parsed_lines[2][1], "Event has to start and end on the same day."
+        )
+
+    def test_import_schedule_days_reports_errors_per_line(self):
+        parsed_lines = parse_csv_lines(StringIO(CSV_FILE.format(doctor=self.doctor.pk)))
+
+        created_count, errors = import_schedule_days(parsed_lines, batch_size=2)
+
+        self.assertEqual(created_count, 2)
+        self.assertEqual([line_number for line_number, _ in errors], [4, 5, 6, 7])
+        self.assertIn("overlaps with an existing one", errors[0][1][0])
+        self.assertIn("Suggested end time", errors[1][1][0])
+        self.assertEqual(errors[3][1], ["Doctor does not exist."])
+        self.assertEqual(Slot.objects.filter(doctor=self.doctor).count(), 16)
+
+
+class ImportSchedulesCommandTests(TestCase):
+    def test_import_ics_file(self):
+        doctor = DoctorFactory()
+        out = StringIO()
+
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "roster.ics"
+            path.write_text(ICS_FILE)
+            call_command(
+                "import_schedules", str(path), "--doctor", doctor.pk, stdout=out
+            )
+
+        self.assertEqual(ScheduleDay.objects.filter(doctor=doctor).count(), 2)
+        self.assertIn("Line 13:", out.getvalue())
+        self.assertIn("Imported 2 work days, rejected 1 lines.", out.getvalue())
+
+
+class ScheduleImportViewTests(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+        self.client.force_login(self.doctor.user)
+        self.url = reverse("schedules:schedule-import")
+
+    def test_doctor_imports_own_schedule(self):
+        other_doctor = DoctorFactory()
+        upload = SimpleUploadedFile(
+            "roster.csv", CSV_FILE.format(doctor=other_doctor.pk).encode()
+        )
+
+        response = self.client.post(self.url, {"file": upload, "interval": 15})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ScheduleDay.objects.filter(doctor=self.doctor).count(), 3)
+        self.assertFalse(ScheduleDay.objects.filter(doctor=other_doctor).exists())
+        self.assertEqual(
+            [line_number for line_number, _ in response.context["import_errors"]],
+            [4, 5, 6],
+        )
+
+    @patch(
+        "schedules.views.import_schedule_days",
+        lambda parsed_lines: import_schedule_days(parsed_lines, batch_size=1),
+    )
+    def test_file_with_invalid_encoding_is_not_imported_partially(self):
+        # the invalid byte is past the first decoded chunk, so earlier batches are inserted before it is read
+        content = CSV_FILE.format(doctor=self.doctor.pk) + "x,not a date\n" * 1000
+        upload = SimpleUploadedFile("roster.csv", content.encode() + b"\xff\n")
+
+        response = self.client.post(self.url, {"file": upload, "interval": 15})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "File has to be encoded in UTF-8.", response.context["form"].errors["file"]
+        )
+        self.assertFalse(ScheduleDay.objects.exists())
+
+    def test_unknown_format_is_rejected(self):
+        upload = SimpleUploadedFile("roster.xlsx", b"data")
+
+        response = self.client.post(self.url, {"file": upload, "interval": 15})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "Upload a CSV or ICS file.", response.context["form"].non_field_errors()
+        )
+        self.assertFalse(ScheduleDay.objects.exists())
@@ -0,0 +1,104 @@
+from datetime import date, time, timedelta
+
+from django.test import TestCase
+
+from appointments.models import Slot
+from schedules.factories import ScheduleDayFactory
+from schedules.forms import ScheduleTemplateForm
+from schedules.models import ScheduleDay
+from schedules.services.schedule_templates import (
+    create_schedule_days,
+    expand_schedule_template,
+)
+from users.factories import DoctorFactory
+
+MONDAY = date(2030, 1, 7)
+
+
+class ScheduleTemplateServiceTests(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+
+    def expand(self, date_to=MONDAY + timedelta(days=13), weekdays=(0, 1, 2, 3, 4)):
+        return expand_schedule_template(
+            self.doctor,
+            MONDAY,
+            date_to,
+            weekdays,
+            time(8, 0),
+            time(14, 0),
+            timedelta(minutes=15),
+        )
+
+    def test_expand_schedule_template_uses_given_weekdays(self):
+        schedule_days = self.expand(weekdays=(0, 2))
+
+        self.assertEqual(
+            [schedule_day.work_date for schedule_day in schedule_days],
+            [
+                MONDAY,
+                MONDAY + timedelta(days=2),
+                MONDAY + timedelta(days=7),
+                MONDAY + timedelta(days=9),
+            ],
+        )
+
+    def test_create_schedule_days_creates_slots(self):
+        schedule_days = create_schedule_days(self.expand())
+
+        self.assertEqual(len(schedule_days), 10)
+        self.assertEqual(ScheduleDay.objects.filter(doctor=self.doctor).count(), 10)
+        self.assertEqual(Slot.objects.filter(doctor=self.doctor).count(), 10 * 24)
+
+
+class ScheduleTemplateFormTests(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+        ScheduleDayFactory(
+            doctor=self.doctor,
+            work_date=MONDAY,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+        )
+
+    def get_data(self, **overrides):
+        data = {
+            "date_from": MONDAY,
+            "date_to": MONDAY + timedelta(days=6),
+            "weekdays": [0, 1, 2, 3, 4],
+            "start_time": time(8, 0),
+            "end_time": time(14, 0),
+            "interval": 15,
+        }
+        data.update(overrides)
+        return data
+
+    def test_overlapping_template_is_rejected(self):
+        form = ScheduleTemplateForm(data=self.get_data(), doctor=self.doctor)
+
+        self.assertFalse(form.is_valid())
+        self.assertIn(str(MONDAY), form.non_field_errors()[0])
+
+    def test_overlapping_days_are_skipped(self):
+        form = ScheduleTemplateForm(
+            data=self.get_data(skip_overlapping=True), doctor=self.doctor
+        )
+
+        self.assertTrue(form.is_valid())
+        self.assertEqual(len(form.save()), 4)
+
+    def test_interval_must_fit_time_range(self):
+        form = ScheduleTemplateForm(
+            data=self.get_data(end_time=time(14, 10)), doctor=self.doctor
+        )
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("Suggested end time", form.non_field_errors()[0])
+
+    def test_too_long_template_is_rejected(self):
+        form = ScheduleTemplateForm(
+            data=self.get_data(date_to=MONDAY + timedelta(days=1000)),
+            doctor=self.doctor,
+        )
+
+        self.assertFalse(form.is_valid())
@@ -0,0 +1,93 @@
+from datetime import date, time, timedelta
+
+from django.test import TestCase
+
+from schedules.factories import ScheduleDayFactory
+from schedules.services.schedule_validation import (
+    OVERLAP_EXISTING_MESSAGE,
+    ProposedScheduleDay,
+    validate_schedule_days,
+)
+from users.factories import DoctorFactory
+
+WORK_DATE = date(2030, 1, 7)
+
+
+class ScheduleValidationTests(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+        self.existing = ScheduleDayFactory(
+            doctor=self.doctor,
+            work_date=WORK_DATE,
+            start_time=time(8, 0),
+            end_time=time(10, 0),
+        )
+
+    def row(self, start_time, end_time, work_date=WORK_DATE, interval=15, doctor=None):
+        return ProposedScheduleDay(
+            (doctor or self.doctor).pk,
+            work_date,
+            start_time,
+            end_time,
+            timedelta(minutes=interval),
+        )
+
+    def test_valid_rows(self):
+        errors = validate_schedule_days(
+            [
+                self.row(time(11, 0), time(12, 0)),
+                self.row(time(8, 0), time(10, 0), work_date=WORK_DATE + timedelta(1)),
+            ]
+        )
+
+        self.assertEqual(errors, {})
+
+    def test_errors_are_reported_per_row(self):
+        errors = validate_schedule_days(
+            [
+                self.row(time(11, 0), time(12, 0)),
+                self.row(time(9, 0), time(10, 0)),
+                self.row(time(12, 0), time(11, 0)),
+                self.row(time(13, 0), time(14, 10)),
+                self.row(time(13, 0), time(14, 0), interval=7),
+            ]
+        )
+
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertEqual(errors[1], [OVERLAP_EXISTING_MESSAGE])
+        self.assertEqual(errors[2], ["End time is before start time."])
+        self.assertIn("Suggested end time: 14:00:00", errors[3][0])
+        self.assertIn("multiple of 5 minutes", errors[4][0])
+
+    def test_rows_overlapping_within_batch(self):
+        errors = validate_schedule_days(
+            [
+                self.row(time(11, 0), time(13, 0)),
+                self.row(time(12, 0), time(14, 0)),
+                self.row(time(12, 0), time(14, 0), doctor=DoctorFactory()),
+            ]
+        )
+
+        self.assertEqual(errors, {1: ["The specified schedule overlaps with row 1."]})
+
+    def test_excluded_schedule_day_is_not_an_overlap(self):
+        errors = validate_schedule_days(
+            [self.row(time(9, 0), time(11, 0))], exclude_ids=[self.existing.pk]
+        )
+
+        self.assertEqual(errors, {})
+
+    def test_number_of_queries_does_not_depend_on_batch_size(self):
+        other_doctor = DoctorFactory()
+        rows = [
+            self.row(
+                time(8, 0), time(10, 0), WORK_DATE + timedelta(days), doctor=doctor
+            )
+            for days in range(100)
+            for doctor in (self.doctor, other_doctor)
+        ]
+
+        with self.assertNumQueries(1):
+            errors = validate_schedule_days(rows)
+
+        self.assertEqual(list(errors), [0])
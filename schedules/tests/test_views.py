@@ -195,3 +195,42 @@ class ScheduleDayViewTests(TestCase):
         response = self.client.post(url, follow=True)
         self.assertRedirects(response, reverse("schedules:schedule-calendar"))
         self.assertFalse(ScheduleDay.objects.filter(pk=schedule.pk).exists())
+
+
+class ScheduleTemplateCreateViewTests(TestCase):
+    def setUp(self):
+        self.doctor = DoctorFactory()
+        self.client.force_login(self.doctor.user)
+        self.url = reverse("schedules:schedule-template-create")
+
+    def test_get(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "schedules/schedule_template_form.html")
+
+    def test_post_creates_work_days(self):
+        date_from = date.today() + timedelta(days=1)
+        response = self.client.post(
+            self.url,
+            {
+                "date_from": date_from,
+                "date_to": date_from + timedelta(days=27),
+                "weekdays": [0, 1, 2, 3, 4],
+                "start_time": "08:00",
+                "end_time": "14:00",
+                "interval": 15,
+            },
+        )
+
+        self.assertRedirects(response, reverse("schedules:schedule-calendar"))
+        self.assertEqual(ScheduleDay.objects.filter(doctor=self.doctor).count(), 20)
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertIn("20 work days added.", messages)
+
+    def test_patient_can_not_create_work_days(self):
+        self.client.force_login(UserFactory(role=User.Role.PATIENT))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
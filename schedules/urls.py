@@ -15,6 +15,16 @@ urlpatterns = [
         views.ScheduleDayCreateView.as_view(),
         name="schedule-day-create",
     ),
+    path(
+        "create_schedule_template/",
+        views.ScheduleTemplateCreateView.as_view(),
+        name="schedule-template-create",
+    ),
+    path(
+        "import_schedule/",
+        views.ScheduleImportView.as_view(),
+        name="schedule-import",
+    ),
     path(
         "scheduleday/<int:pk>/update/",
         views.ScheduleDayUpdateView.as_view(),
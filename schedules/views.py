@@ -1,13 +1,26 @@
+import io
 import logging
 
 from django.contrib import messages
 from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.db import transaction
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DeleteView, TemplateView, UpdateView
-
-from .forms import ScheduleDayForm
+from django.views.generic import (
+    CreateView,
+    DeleteView,
+    FormView,
+    TemplateView,
+    UpdateView,
+)
+
+from .forms import ScheduleDayForm, ScheduleImportForm, ScheduleTemplateForm
 from .models import ScheduleDay
+from .services.schedule_import import (
+    import_schedule_days,
+    parse_csv_lines,
+    parse_ics_lines,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +79,63 @@ class ScheduleDayCreateView(CreateView):
         return super().form_invalid(form)
 
 
+class ScheduleTemplateCreateView(PermissionRequiredMixin, FormView):
+    template_name = "schedules/schedule_template_form.html"
+    form_class = ScheduleTemplateForm
+    permission_required = "schedules.add_scheduleday"
+    success_url = reverse_lazy("schedules:schedule-calendar")
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["doctor"] = self.request.user.doctor_profile
+        return kwargs
+
+    def form_valid(self, form):
+        schedule_days = form.save()
+        messages.success(self.request, f"{len(schedule_days)} work days added.")
+        return super().form_valid(form)
+
+
+class ScheduleImportView(PermissionRequiredMixin, FormView):
+    template_name = "schedules/schedule_import.html"
+    form_class = ScheduleImportForm
+    permission_required = "schedules.add_scheduleday"
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["doctor"] = getattr(self.request.user, "doctor_profile", None)
+        return kwargs
+
+    def form_valid(self, form):
+        doctor = form.cleaned_data["doctor"]
+        doctor_id = doctor.pk if doctor else None
+        interval = form.cleaned_data["interval"]
+        # uploaded file is read line by line, never as a whole
+        lines = io.TextIOWrapper(
+            form.cleaned_data["file"].file, encoding="utf-8", newline=""
+        )
+        if form.cleaned_data["format"] == "csv":
+            parsed_lines = parse_csv_lines(lines, doctor_id, interval)
+        else:
+            parsed_lines = parse_ics_lines(lines, doctor_id, interval)
+
+        # batches are committed together, so a decoding error in a later batch does not leave earlier ones imported
+        try:
+            with transaction.atomic():
+                created_count, errors = import_schedule_days(parsed_lines)
+        except UnicodeDecodeError:
+            form.add_error("file", "File has to be encoded in UTF-8.")
+            return self.form_invalid(form)
+
+        messages.success(
+            self.request,
+            f"Imported {created_count} work days, rejected {len(errors)} lines.",
+        )
+        return self.render_to_response(
+            self.get_context_data(form=form, import_errors=errors)
+        )
+
+
 class ScheduleDayUpdateView(UpdateView):
     template_name = "schedules/schedule_form.html"
     form_class = ScheduleDayForm
@@ -0,0 +1,29 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+
+from .services.permission_cache import get_cached_permissions, set_cached_permissions
+
+
+class CachedPermissionsBackend(ModelBackend):
+    """
+    ModelBackend keeping the resolved permissions of a user in the shared cache,
+    so permission checks make no queries until the user's groups or group permissions change
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username, password, **kwargs)
+        if user is None and password is not None:
+            # ModelBackend listed after this backend would check the same credentials again
+            raise PermissionDenied
+        return user
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            permissions = get_cached_permissions(user_obj.pk)
+            if permissions is None:
+                permissions = super().get_all_permissions(user_obj)
+                set_cached_permissions(user_obj.pk, permissions)
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+LOCAL_CACHE_BACKENDS = {"django.core.cache.backends.locmem.LocMemCache"}
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cached permissions and doctor profile flags are invalidated only in the cache of the worker
+    which handled the change, other workers would keep serving stale values
+    """
+    if not settings.SHARED_CACHE_REQUIRED:
+        return []
+    if settings.CACHES["default"]["BACKEND"] not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Error(
+            "Default cache is local to every worker process.",
+            hint="Set CACHE_URL to a shared cache, e.g. redis://redis:6379/1.",
+            id="users.E001",
+        )
+    ]
@@ -1,24 +1,31 @@
+from django.conf import settings
 from django.shortcuts import redirect
 from django.urls import reverse
 
 from .models import User
+from .services.doctor_profile import has_doctor_profile
 
 
 class CompleteDoctorProfileMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
-
-    def __call__(self, request):
-        excluded_paths = [
+        self.excluded_paths = {
             reverse("users:logout"),
             reverse("users:complete-doctor-data"),
-        ]
-        if request.user.is_authenticated:
-            if request.path not in excluded_paths:
-                if request.user.role == User.Role.DOCTOR and not hasattr(
-                    request.user, "doctor_profile"
-                ):
-                    return redirect("users:complete-doctor-data")
+        }
+        self.skipped_prefixes = tuple(
+            prefix for prefix in (settings.STATIC_URL, settings.MEDIA_URL) if prefix
+        )
+
+    def __call__(self, request):
+        if (
+            not request.path.startswith(self.skipped_prefixes)
+            and request.path not in self.excluded_paths
+            and request.user.is_authenticated
+            and request.user.role == User.Role.DOCTOR
+            and not has_doctor_profile(request.user)
+        ):
+            return redirect("users:complete-doctor-data")
 
         response = self.get_response(request)
 
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.3 on 2026-10-18 09:38
+
+import unicodedata
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+# copied from users.services.doctor_search, so later changes there do not alter this migration
+SEARCH_TRANSLATION = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O"})
+
+
+def normalize_search_text(text):
+    decomposed = unicodedata.normalize("NFKD", text.translate(SEARCH_TRANSLATION))
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).lower()
+
+
+def backfill_doctor_search(apps, schema_editor):
+    Doctor = apps.get_model("users", "Doctor")
+
+    doctors = []
+    for doctor in (
+        Doctor.objects.select_related("user")
+        .prefetch_related("specialization")
+        .iterator(chunk_size=1000)
+    ):
+        doctor.search_name = normalize_search_text(
+            f"{doctor.title} {doctor.user.first_name} {doctor.user.last_name}"
+        )
+        doctor.search_text = normalize_search_text(
+            " ".join(
+                [spec.name for spec in doctor.specialization.all()]
+                + [doctor.description]
+            )
+        )
+        doctors.append(doctor)
+
+    Doctor.objects.bulk_update(doctors, ["search_name", "search_text"], batch_size=1000)
+    Doctor.objects.update(
+        search_vector=SearchVector("search_name", weight="A", config="simple")
+        + SearchVector("search_text", weight="B", config="simple")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="doctor",
+            name="search_name",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Title and name without accents, kept up to date by signals.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="doctor",
+            name="search_text",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Specializations and description without accents, kept up to date by signals.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="doctor",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="doctor",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="doctor_search_vector_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_doctor_search, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
@@ -102,6 +104,22 @@ class Doctor(models.Model):
     confirmed = models.BooleanField(
         default=False, help_text="Whether the doctor is confirmed."
     )
+    search_name = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Title and name without accents, kept up to date by signals.",
+    )
+    search_text = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Specializations and description without accents, kept up to date by signals.",
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="doctor_search_vector_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} {self.user.first_name} {self.user.last_name}"
@@ -0,0 +1,33 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models import Doctor, User
+
+
+def get_doctor_profile_key(user_id: int) -> str:
+    return f"doctor-profile-complete:{user_id}"
+
+
+def has_doctor_profile(user: User) -> bool:
+    """
+    Cached per user until the user's doctor profile is created or deleted, at most for
+    DOCTOR_PROFILE_CACHE_TIMEOUT in case an invalidation is lost
+    """
+    key = get_doctor_profile_key(user.pk)
+    complete = cache.get(key)
+    if complete is None:
+        complete = Doctor.objects.filter(user_id=user.pk).exists()
+        cache.set(key, complete, timeout=settings.DOCTOR_PROFILE_CACHE_TIMEOUT)
+    return complete
+
+
+def forget_doctor_profile(user_id: int):
+    """
+    Deleted right away and once more after commit, so a flag read before the commit is not kept
+    """
+    key = get_doctor_profile_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(partial(cache.delete, key))
@@ -0,0 +1,87 @@
+import re
+import unicodedata
+from typing import Iterable
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, QuerySet
+
+from ..models import Doctor
+
+SEARCH_CONFIG = "simple"
+
+# letters which do not decompose into a base letter and an accent
+SEARCH_TRANSLATION = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O"})
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Lowercase text without accents, so "Łukasz Żółć" is found by "lukasz zolc"
+    """
+    decomposed = unicodedata.normalize("NFKD", text.translate(SEARCH_TRANSLATION))
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).lower()
+
+
+def get_search_vector() -> SearchVector:
+    return SearchVector("search_name", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "search_text", weight="B", config=SEARCH_CONFIG
+    )
+
+
+def update_doctor_search(doctor_ids: Iterable[int]):
+    """
+    Refreshes normalized search columns of the doctors, search vector is then computed by the database
+    in one update
+    """
+    doctors = list(
+        Doctor.objects.filter(pk__in=list(doctor_ids))
+        .select_related("user")
+        .prefetch_related("specialization")
+    )
+    if not doctors:
+        return
+
+    for doctor in doctors:
+        doctor.search_name = normalize_search_text(
+            f"{doctor.title} {doctor.user.first_name} {doctor.user.last_name}"
+        )
+        doctor.search_text = normalize_search_text(
+            " ".join(
+                [spec.name for spec in doctor.specialization.all()]
+                + [doctor.description]
+            )
+        )
+    Doctor.objects.bulk_update(doctors, ["search_name", "search_text"])
+    Doctor.objects.filter(pk__in=[doctor.pk for doctor in doctors]).update(
+        search_vector=get_search_vector()
+    )
+
+
+def get_search_query(text: str) -> SearchQuery | None:
+    """
+    Every word has to match the beginning of a word of the doctor's document,
+    returns None when the text has no words
+    """
+    words = re.findall(r"\w+", normalize_search_text(text))
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+
+
+def search_doctors(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Doctors matching the text ordered by rank, name matches rank above specialization and description ones
+    """
+    search_query = get_search_query(text)
+    if search_query is None:
+        return queryset
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(search_rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-search_rank", "user__last_name", "user__first_name", "id")
+    )
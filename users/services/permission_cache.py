@@ -0,0 +1,64 @@
+import time
+from functools import partial
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+PERMISSION_GROUPS_VERSION_KEY = "permission-groups-version"
+
+
+def get_permission_groups_version() -> int:
+    """
+    Missing version is started from current time, so permissions cached under an evicted version
+    are never taken as current
+    """
+    version = cache.get(PERMISSION_GROUPS_VERSION_KEY)
+    if version is None:
+        cache.add(PERMISSION_GROUPS_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(PERMISSION_GROUPS_VERSION_KEY)
+    return version
+
+
+def get_user_permissions_key(user_id: int, version: int) -> str:
+    return f"user-permissions:{user_id}:{version}"
+
+
+def get_cached_permissions(user_id: int) -> set[str] | None:
+    key = get_user_permissions_key(user_id, get_permission_groups_version())
+    return cache.get(key)
+
+
+def set_cached_permissions(user_id: int, permissions: set[str]):
+    key = get_user_permissions_key(user_id, get_permission_groups_version())
+    cache.set(key, permissions, timeout=settings.PERMISSION_CACHE_TIMEOUT)
+
+
+def _bump_permission_groups_version():
+    try:
+        cache.incr(PERMISSION_GROUPS_VERSION_KEY)
+    except ValueError:
+        cache.set(PERMISSION_GROUPS_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_permission_groups_version():
+    """
+    Invalidates permissions of all users, bumped right away and once more after commit,
+    so permissions read before the commit are not kept under the new version
+    """
+    _bump_permission_groups_version()
+    transaction.on_commit(_bump_permission_groups_version)
+
+
+def _forget_permissions(user_ids: Iterable[int]):
+    version = get_permission_groups_version()
+    cache.delete_many(
+        [get_user_permissions_key(user_id, version) for user_id in user_ids]
+    )
+
+
+def forget_permissions(user_ids: Iterable[int]):
+    user_ids = list(user_ids)
+    _forget_permissions(user_ids)
+    transaction.on_commit(partial(_forget_permissions, user_ids))
@@ -0,0 +1,99 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Doctor, Specialization, User
+from .services.doctor_profile import forget_doctor_profile
+from .services.doctor_search import update_doctor_search
+from .services.permission_cache import (
+    bump_permission_groups_version,
+    forget_permissions,
+)
+
+SEARCH_USER_FIELDS = {"first_name", "last_name"}
+
+
+@receiver(post_save, sender=Doctor)
+def doctor_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    update_doctor_search([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not SEARCH_USER_FIELDS.intersection(update_fields):
+        return
+    update_doctor_search(
+        Doctor.objects.filter(user=instance).values_list("pk", flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Doctor.specialization.through)
+def doctor_specializations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # doctors of a cleared specialization are not known after the clear
+        instance._search_doctor_ids = list(
+            instance.doctors.values_list("pk", flat=True)
+        )
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        update_doctor_search([instance.pk])
+    elif action == "post_clear":
+        update_doctor_search(getattr(instance, "_search_doctor_ids", []))
+    else:
+        update_doctor_search(pk_set)
+
+
+@receiver(post_save, sender=Specialization)
+def specialization_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    update_doctor_search(instance.doctors.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Specialization)
+def specialization_deleting(sender, instance, **kwargs):
+    instance._search_doctor_ids = list(instance.doctors.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Specialization)
+def specialization_deleted(sender, instance, **kwargs):
+    update_doctor_search(getattr(instance, "_search_doctor_ids", []))
+
+
+@receiver(post_save, sender=Doctor)
+def doctor_profile_saved(sender, instance, created, **kwargs):
+    if created:
+        forget_doctor_profile(instance.user_id)
+
+
+@receiver(post_delete, sender=Doctor)
+def doctor_profile_deleted(sender, instance, **kwargs):
+    forget_doctor_profile(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # members of a group or holders of a permission changed, the affected users are not known after a clear
+        bump_permission_groups_version()
+    else:
+        forget_permissions([instance.pk])
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_permission_groups_version()
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, **kwargs):
+    bump_permission_groups_version()
@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase, override_settings
+
+from users.checks import check_shared_cache
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://redis:6379/1",
+    }
+}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(SHARED_CACHE_REQUIRED=True, CACHES=LOCMEM_CACHES)
+    def test_local_cache_is_error_when_shared_cache_is_required(self):
+        (error,) = check_shared_cache(None)
+
+        self.assertEqual(error.id, "users.E001")
+
+    @override_settings(SHARED_CACHE_REQUIRED=True, CACHES=REDIS_CACHES)
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(SHARED_CACHE_REQUIRED=False, CACHES=LOCMEM_CACHES)
+    def test_local_cache_is_allowed_in_development(self):
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test import TestCase
+
+from users.factories import DoctorFactory, SpecializationFactory, UserFactory
+from users.models import Doctor
+from users.services.doctor_search import (
+    get_search_query,
+    normalize_search_text,
+    search_doctors,
+)
+
+
+class DoctorSearchTests(TestCase):
+    def setUp(self):
+        self.cardiology = SpecializationFactory(name="Kardiologia")
+        self.dermatology = SpecializationFactory(name="Dermatologia")
+        self.doctor = DoctorFactory(
+            user=UserFactory(first_name="Łukasz", last_name="Żółkiewski"),
+            title="Dr",
+            description="Leczy choroby serca.",
+            specialization=[self.cardiology],
+        )
+        self.other_doctor = DoctorFactory(
+            user=UserFactory(first_name="Anna", last_name="Nowak"),
+            title="Prof.",
+            description="Konsultacje dla pacjentów pana Żółkiewskiego.",
+            specialization=[self.dermatology],
+        )
+
+    def search(self, text):
+        return list(search_doctors(Doctor.objects.all(), text))
+
+    def test_normalize_search_text(self):
+        self.assertEqual(normalize_search_text("Łukasz ŻÓŁĆ"), "lukasz zolc")
+
+    def test_search_is_accent_insensitive(self):
+        self.assertEqual(self.search("lukasz zolkiewski")[0], self.doctor)
+        self.assertEqual(self.search("Łukasz")[0], self.doctor)
+
+    def test_search_matches_word_prefixes(self):
+        self.assertEqual(self.search("zolk luk"), [self.doctor])
+
+    def test_search_by_specialization(self):
+        self.assertEqual(self.search("kardio"), [self.doctor])
+
+    def test_name_match_ranks_above_description_match(self):
+        self.assertEqual(self.search("zolkiewski"), [self.doctor, self.other_doctor])
+
+    def test_empty_search_returns_queryset(self):
+        self.assertEqual(len(self.search(" !? ")), 2)
+
+    def test_search_follows_changes(self):
+        self.doctor.user.last_name = "Wiśniewski"
+        self.doctor.user.save()
+        self.assertEqual(self.search("wisniewski"), [self.doctor])
+
+        self.doctor.specialization.add(self.dermatology)
+        self.assertIn(self.doctor, self.search("dermatologia"))
+
+        self.dermatology.name = "Dermatologia estetyczna"
+        self.dermatology.save()
+        self.assertEqual(len(self.search("estetyczna")), 2)
+
+        self.dermatology.delete()
+        self.assertEqual(self.search("estetyczna"), [])
+
+    def test_search_uses_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = Doctor.objects.filter(search_vector=get_search_query("lukasz")).explain()
+
+        self.assertIn("doctor_search_vector_idx", plan)
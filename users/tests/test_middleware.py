@@ -1,5 +1,8 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
 from django.http import HttpResponse
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 
 from users.factories import DoctorFactory, UserFactory
@@ -12,6 +15,7 @@ class TestCompleteDoctorProfileMiddleware(TestCase):
         self.factory = RequestFactory()
         self.get_response = lambda request: HttpResponse("OK")
         self.middleware = CompleteDoctorProfileMiddleware(self.get_response)
+        cache.clear()
 
     def test_redirects_doctor_without_profile(self):
         user = UserFactory(role=User.Role.DOCTOR)
@@ -63,6 +67,62 @@ class TestCompleteDoctorProfileMiddleware(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content, b"OK")
 
+    def test_profile_state_is_cached_per_user(self):
+        user = UserFactory(role=User.Role.DOCTOR)
+        DoctorFactory(user=user)
+        request = self.factory.get("schedules:schedule-calendar")
+        request.user = user
+        self.middleware(request)
+
+        with self.assertNumQueries(0):
+            response = self.middleware(request)
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DOCTOR_PROFILE_CACHE_TIMEOUT=0)
+    def test_profile_state_expires(self):
+        user = UserFactory(role=User.Role.DOCTOR)
+        request = self.factory.get("schedules:schedule-calendar")
+        request.user = user
+        self.assertEqual(self.middleware(request).status_code, 302)
+
+        # invalidation lost, e.g. cache server unreachable while the profile was created
+        with patch("users.signals.forget_doctor_profile"):
+            DoctorFactory(user=user)
+
+        self.assertEqual(self.middleware(request).status_code, 200)
+
+    def test_created_profile_invalidates_cached_state(self):
+        user = UserFactory(role=User.Role.DOCTOR)
+        request = self.factory.get("schedules:schedule-calendar")
+        request.user = user
+        self.assertEqual(self.middleware(request).status_code, 302)
+
+        DoctorFactory(user=user)
+
+        self.assertEqual(self.middleware(request).status_code, 200)
+
+    def test_deleted_profile_invalidates_cached_state(self):
+        user = UserFactory(role=User.Role.DOCTOR)
+        doctor = DoctorFactory(user=user)
+        request = self.factory.get("schedules:schedule-calendar")
+        request.user = user
+        self.assertEqual(self.middleware(request).status_code, 200)
+
+        doctor.delete()
+
+        self.assertEqual(self.middleware(request).status_code, 302)
+
+    def test_skips_static_and_media_paths(self):
+        for path in ("/static/assets/css/main.css", "/media/avatar_of_user/a.png"):
+            request = self.factory.get(path)
+            # the user is not even loaded for static and media files
+            request.user = None
+
+            response = self.middleware(request)
+
+            self.assertEqual(response.content, b"OK")
+
     def _get_unauthenticated_user(self):
         class DummyUser:
             is_authenticated = False
@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+from django.contrib.auth import authenticate, get_user
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.test import TestCase
+
+from users.factories import UserFactory
+from users.models import User
+from users.services.perm_assign import assign_user_to_permission_group
+from users.services.permissions_in_groups import (
+    ROLE_GROUP_PERMISSIONS,
+    create_or_update_group_with_permissions,
+    create_permission_groups,
+)
+
+
+class CachedPermissionsBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        create_permission_groups()
+        self.user = UserFactory(role=User.Role.PATIENT)
+        assign_user_to_permission_group(self.user)
+
+    def fresh_user(self):
+        # every request loads its own user object
+        return User.objects.get(pk=self.user.pk)
+
+    def test_permissions_are_read_from_cache(self):
+        self.assertTrue(self.fresh_user().has_perm("appointments.add_appointment"))
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("appointments.add_appointment"))
+            self.assertFalse(user.has_perm("schedules.add_scheduleday"))
+
+    def test_assigning_group_invalidates_cached_permissions(self):
+        self.user.role = User.Role.DOCTOR
+        self.user.save()
+        self.assertFalse(self.fresh_user().has_perm("schedules.add_scheduleday"))
+
+        assign_user_to_permission_group(self.user)
+
+        self.assertTrue(self.fresh_user().has_perm("schedules.add_scheduleday"))
+
+    def test_group_permission_change_invalidates_cached_permissions(self):
+        self.assertTrue(self.fresh_user().has_perm("appointments.delete_appointment"))
+
+        patient_permissions = [
+            codename
+            for codename in ROLE_GROUP_PERMISSIONS[User.Role.PATIENT]
+            if codename != "delete_appointment"
+        ]
+        with patch.dict(
+            ROLE_GROUP_PERMISSIONS, {User.Role.PATIENT: patient_permissions}
+        ):
+            create_or_update_group_with_permissions(User.Role.PATIENT)
+
+        self.assertFalse(self.fresh_user().has_perm("appointments.delete_appointment"))
+
+    def test_removing_user_from_group_by_group_side(self):
+        self.assertTrue(self.fresh_user().has_perm("appointments.add_appointment"))
+
+        Group.objects.get(name="patient_group").user_set.remove(self.user)
+
+        self.assertFalse(self.fresh_user().has_perm("appointments.add_appointment"))
+
+    def test_direct_user_permission(self):
+        self.assertFalse(self.fresh_user().has_perm("users.view_user"))
+
+        self.user.user_permissions.add(Permission.objects.get(codename="view_user"))
+
+        self.assertTrue(self.fresh_user().has_perm("users.view_user"))
+
+    def test_inactive_user_has_no_permissions(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertFalse(self.fresh_user().has_perm("appointments.add_appointment"))
+
+    def test_session_of_model_backend_is_still_valid(self):
+        self.client.force_login(
+            self.user, backend="django.contrib.auth.backends.ModelBackend"
+        )
+        request = HttpRequest()
+        request.session = self.client.session
+
+        user = get_user(request)
+
+        self.assertEqual(user, self.user)
+        self.assertTrue(user.has_perm("appointments.add_appointment"))
+
+    def test_wrong_password_is_checked_once(self):
+        with patch.object(
+            User, "check_password", autospec=True, return_value=False
+        ) as mock_check_password:
+            user = authenticate(username=self.user.username, password="wrong")
+
+        self.assertIsNone(user)
+        mock_check_password.assert_called_once()